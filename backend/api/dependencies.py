@@ -0,0 +1,28 @@
+from fastapi import Depends, Request
+from ..services.container import ServiceContainer
+from ..services.database import Database
+from ..services.scout_jobs import ScoutJobQueue
+from ..services.talent_service import TalentService
+from ..services.twitter_oauth_service import TwitterOAuthService
+
+
+def get_services(request: Request) -> ServiceContainer:
+    """The service container created in main.py's lifespan"""
+    return request.app.state.services
+
+
+def get_database(services: ServiceContainer = Depends(get_services)) -> Database:
+    return services.database
+
+
+def get_talent_service(services: ServiceContainer = Depends(get_services)) -> TalentService:
+    """Shared TalentService; its queries each lease a pool slot only while they run"""
+    return services.talent_service
+
+
+def get_scout_jobs(services: ServiceContainer = Depends(get_services)) -> ScoutJobQueue:
+    return services.scout_jobs
+
+
+def get_oauth_service(services: ServiceContainer = Depends(get_services)) -> TwitterOAuthService:
+    return services.oauth_service
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import RedirectResponse, Response
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, RedirectResponse, Response, StreamingResponse
+from typing import List, Optional
 import json
 from ..models.schemas import (
     ScoutRequest, CandidateResponse, DetailedCandidateResponse,
@@ -8,11 +9,15 @@ from ..models.schemas import (
     SendMessageRequest, MessageResponse, CreateEventRequest, EventResponse,
     CreateFeedbackRequest, FeedbackResponse, CandidateWithFeedback,
     CreateAssessmentRequest, AssessmentResponse, ForwardAssessmentRequest,
-    SubmitFeedbackMessageRequest
+    SubmitFeedbackMessageRequest, ScoutJobResponse, CandidateSearchResult
 )
 from ..services.talent_service import TalentService
+from ..services.database import Database
+from ..services.container import ServiceContainer
+from ..services.scout_jobs import ScoutJobQueue
 from ..services.twitter_oauth_service import TwitterOAuthService
 from ..config.settings import settings
+from .dependencies import get_database, get_services, get_talent_service, get_oauth_service, get_scout_jobs
 
 router = APIRouter()
 
@@ -24,34 +29,130 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
-@router.get("/candidates", response_model=List[CandidateResponse])
-async def get_all_candidates():
-    """Get all candidates from the database"""
+@router.get("/admin/db/pool")
+async def database_pool_stats(database: Database = Depends(get_database)):
+    """Connection pool saturation stats"""
+    return database.stats()
+
+@router.get("/admin/http/connections")
+async def http_connection_stats(services: ServiceContainer = Depends(get_services)):
+    """Connection reuse per upstream (requests vs. new TCP/TLS handshakes)"""
+    return services.http_clients.stats()
+
+@router.get("/admin/rate-limits")
+async def rate_limit_budgets(services: ServiceContainer = Depends(get_services)):
+    """Current Twitter rate-limit budget per endpoint"""
+    return services.rate_limiter.snapshot()
+
+@router.get("/admin/circuit-breakers")
+async def circuit_breaker_states(services: ServiceContainer = Depends(get_services)):
+    """Circuit breaker state per upstream"""
+    return {name: breaker.snapshot() for name, breaker in services.breakers.items()}
+
+@router.get("/admin/concurrency")
+async def adaptive_concurrency_stats(services: ServiceContainer = Depends(get_services)):
+    """Current adaptive concurrency limit for Grok scoring"""
+    return {"grok_scoring": services.grok_service.limiter.snapshot()}
+
+@router.get("/admin/pre-ranker")
+async def pre_ranker_agreement(talent_service: TalentService = Depends(get_talent_service)):
+    """Rank correlation between local pre-rank scores and Grok scores"""
     try:
-        talent_service = TalentService()
-        await talent_service.prisma.connect()
-
-        candidates = await talent_service.get_all_candidates()
+        return await talent_service.pre_rank_agreement()
+    except Exception as e:
+        print(f"Pre-ranker agreement error: {e}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
-        await talent_service.prisma.disconnect()
+@router.get("/admin/cache/scoring")
+async def scoring_cache_stats(services: ServiceContainer = Depends(get_services)):
+    """Grok scoring cache hit/miss counters and estimated savings"""
+    if not services.scoring_cache:
+        return {"enabled": False}
+    return {"enabled": True, **services.scoring_cache.stats()}
 
+@router.get("/candidates", response_model=List[CandidateResponse])
+async def get_all_candidates(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=settings.CANDIDATE_PAGE_MAX),
+    cursor: Optional[str] = None,
+    stage: Optional[str] = None,
+    min_score: Optional[int] = Query(None, ge=0, le=100),
+    skill: Optional[str] = None,
+    job_title: Optional[str] = None,
+    fields: Optional[str] = None,
+    talent_service: TalentService = Depends(get_talent_service)
+):
+    """Scored candidates, best match first.
+
+    Filters (stage, min_score, skill, job_title) run in the database. With
+    `limit`, results are paged: pass the `X-Next-Cursor` response header back
+    as `cursor` for the next page (absent on the last page). `fields` is a
+    comma-separated list of CandidateResponse fields to return.
+    """
+    try:
+        projection = None
+        if fields:
+            projection = {field.strip() for field in fields.split(",") if field.strip()}
+            unknown = projection - set(CandidateResponse.model_fields)
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+
+        try:
+            candidates, next_cursor = await talent_service.list_candidates(
+                limit=limit,
+                cursor=cursor,
+                stage=stage,
+                min_score=min_score,
+                skill=skill,
+                job_title=job_title,
+                with_tags=projection is None or "tags" in projection
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        if projection is not None:
+            return JSONResponse(
+                content=[candidate.model_dump(include=projection) for candidate in candidates],
+                headers=headers
+            )
+        response.headers.update(headers)
         return candidates
 
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Get candidates endpoint error: {e}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+@router.get("/candidates/search", response_model=List[CandidateSearchResult])
+async def search_candidates(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=settings.CANDIDATE_SEARCH_MAX),
+    talent_service: TalentService = Depends(get_talent_service)
+):
+    """Full-text search of stored candidates (bio, tweets, Grok reasoning), best match first.
+
+    Words are prefix-matched and all must appear; each result carries up to
+    three snippets with the matched terms in **bold**. No Twitter or Grok calls.
+    """
+    try:
+        if not settings.CANDIDATE_SEARCH_ENABLED:
+            raise HTTPException(status_code=404, detail="Candidate search is disabled")
+        return await talent_service.search_candidates(q, limit=limit)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Search candidates endpoint error: {e}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
 @router.get("/candidates/{candidate_id}", response_model=DetailedCandidateResponse)
-async def get_candidate_profile(candidate_id: int):
+async def get_candidate_profile(candidate_id: int, talent_service: TalentService = Depends(get_talent_service)):
     """Get detailed candidate profile with AI insights and recent posts"""
     try:
-        talent_service = TalentService()
-        await talent_service.prisma.connect()
-
         profile = await talent_service.get_candidate_profile(candidate_id)
 
-        await talent_service.prisma.disconnect()
-
         if not profile:
             raise HTTPException(status_code=404, detail="Candidate not found")
 
@@ -64,15 +165,10 @@ async def get_candidate_profile(candidate_id: int):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.post("/scout", response_model=List[CandidateResponse])
-async def scout_talent(request: ScoutRequest):
+async def scout_talent(request: ScoutRequest, talent_service: TalentService = Depends(get_talent_service)):
     try:
-        talent_service = TalentService()
-        await talent_service.prisma.connect()
-
         results = await talent_service.scout_talent(request)
 
-        await talent_service.prisma.disconnect()
-
         if not results:
             raise HTTPException(status_code=404, detail="No candidates found")
 
@@ -82,17 +178,70 @@ async def scout_talent(request: ScoutRequest):
         print(f"Scout endpoint error: {e}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+@router.post("/scout/stream")
+async def scout_talent_stream(request: ScoutRequest, services: ServiceContainer = Depends(get_services)):
+    """Scout as an NDJSON stream: progress events, each candidate once saved, then the ranked top 10"""
+    async def events():
+        try:
+            async for event in services.talent_service.iter_scout_events(request):
+                yield json.dumps(jsonable_encoder(event)) + "\n"
+        except Exception as e:
+            print(f"Scout stream error: {e}")
+            yield json.dumps({"type": "error", "detail": f"Internal server error: {str(e)}"}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+@router.post("/scout/jobs", response_model=ScoutJobResponse, status_code=202)
+async def submit_scout_job(request: ScoutRequest, scout_jobs: ScoutJobQueue = Depends(get_scout_jobs)):
+    """Queue a scout to run in the background; poll GET /scout/jobs/{job_id} for progress and results"""
+    try:
+        return await scout_jobs.submit(request)
+    except Exception as e:
+        print(f"Submit scout job error: {e}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@router.get("/scout/jobs/{job_id}", response_model=ScoutJobResponse)
+async def get_scout_job(job_id: str, scout_jobs: ScoutJobQueue = Depends(get_scout_jobs)):
+    """Status, progress and (once completed) ranked candidates of a scout job"""
+    try:
+        job = await scout_jobs.get(job_id)
+
+        if not job:
+            raise HTTPException(status_code=404, detail="Scout job not found")
+
+        return job
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Get scout job error: {e}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@router.delete("/scout/jobs/{job_id}", response_model=ScoutJobResponse)
+async def cancel_scout_job(job_id: str, scout_jobs: ScoutJobQueue = Depends(get_scout_jobs)):
+    """Cancel a queued or running scout job"""
+    try:
+        job = await scout_jobs.cancel(job_id)
+
+        if not job:
+            raise HTTPException(status_code=404, detail="Scout job not found")
+        if job.status != "cancelled":
+            raise HTTPException(status_code=409, detail=f"Scout job already {job.status}")
+
+        return job
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Cancel scout job error: {e}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
 @router.put("/candidates/{candidate_id}/pipeline")
-async def update_pipeline_stage(candidate_id: int, request: UpdatePipelineRequest):
+async def update_pipeline_stage(candidate_id: int, request: UpdatePipelineRequest, talent_service: TalentService = Depends(get_talent_service)):
     """Update pipeline stage for a candidate"""
     try:
-        talent_service = TalentService()
-        await talent_service.prisma.connect()
-
         success = await talent_service.update_pipeline_stage(candidate_id, request.pipeline_stage)
 
-        await talent_service.prisma.disconnect()
-
         if not success:
             raise HTTPException(status_code=404, detail="Failed to update pipeline stage")
 
@@ -105,16 +254,11 @@ async def update_pipeline_stage(candidate_id: int, request: UpdatePipelineReques
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.post("/notifications", response_model=NotificationResponse)
-async def create_notification(request: NotificationRequest):
+async def create_notification(request: NotificationRequest, talent_service: TalentService = Depends(get_talent_service)):
     """Create a notification for a candidate (e.g., when advancing stages)"""
     try:
-        talent_service = TalentService()
-        await talent_service.prisma.connect()
-
         notification = await talent_service.create_notification(request)
 
-        await talent_service.prisma.disconnect()
-
         if not notification:
             raise HTTPException(status_code=404, detail="Failed to create notification")
 
@@ -127,16 +271,11 @@ async def create_notification(request: NotificationRequest):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.get("/candidates/{candidate_id}/notifications", response_model=List[NotificationResponse])
-async def get_candidate_notifications(candidate_id: int):
+async def get_candidate_notifications(candidate_id: int, talent_service: TalentService = Depends(get_talent_service)):
     """Get all notifications for a specific candidate"""
     try:
-        talent_service = TalentService()
-        await talent_service.prisma.connect()
-
         notifications = await talent_service.get_candidate_notifications(candidate_id)
 
-        await talent_service.prisma.disconnect()
-
         return notifications
 
     except Exception as e:
@@ -144,16 +283,11 @@ async def get_candidate_notifications(candidate_id: int):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.get("/lookup/{username}", response_model=CandidateResponse)
-async def lookup_user_by_username(username: str):
+async def lookup_user_by_username(username: str, talent_service: TalentService = Depends(get_talent_service)):
     """Lookup a Twitter user by username and add to database if found"""
     try:
-        talent_service = TalentService()
-        await talent_service.prisma.connect()
-
         candidate = await talent_service.lookup_and_add_user(username)
 
-        await talent_service.prisma.disconnect()
-
         if not candidate:
             raise HTTPException(status_code=404, detail=f"User @{username} not found on Twitter")
 
@@ -166,10 +300,8 @@ async def lookup_user_by_username(username: str):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 # Twitter OAuth endpoints
-oauth_service = TwitterOAuthService()
-
 @router.get("/auth/twitter/authorize")
-async def twitter_auth():
+async def twitter_auth(oauth_service: TwitterOAuthService = Depends(get_oauth_service)):
     """Initiate Twitter OAuth flow"""
     try:
         auth_data = oauth_service.get_authorization_url()
@@ -179,7 +311,7 @@ async def twitter_auth():
         raise HTTPException(status_code=500, detail=f"Failed to initiate OAuth: {str(e)}")
 
 @router.get("/auth/twitter/callback")
-async def twitter_callback(code: str, state: str):
+async def twitter_callback(code: str, state: str, oauth_service: TwitterOAuthService = Depends(get_oauth_service)):
     """Handle Twitter OAuth callback"""
     try:
         token_data = await oauth_service.exchange_code_for_token(code, state)
@@ -202,7 +334,7 @@ async def twitter_callback(code: str, state: str):
         return RedirectResponse(url=error_redirect)
 
 @router.post("/messages/send-dm")
-async def send_twitter_dm(request: Request):
+async def send_twitter_dm(request: Request, oauth_service: TwitterOAuthService = Depends(get_oauth_service)):
     """Send a DM to a Twitter user"""
     try:
         data = await request.json()
@@ -228,16 +360,11 @@ async def send_twitter_dm(request: Request):
 
 # Message endpoints
 @router.post("/messages", response_model=MessageResponse)
-async def send_message(request: SendMessageRequest):
+async def send_message(request: SendMessageRequest, talent_service: TalentService = Depends(get_talent_service)):
     """Send a message in a conversation with a candidate"""
     try:
-        talent_service = TalentService()
-        await talent_service.prisma.connect()
-
         message = await talent_service.send_message(request)
 
-        await talent_service.prisma.disconnect()
-
         if not message:
             raise HTTPException(status_code=404, detail="Failed to send message")
 
@@ -250,16 +377,11 @@ async def send_message(request: SendMessageRequest):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.get("/candidates/{candidate_id}/messages", response_model=List[MessageResponse])
-async def get_candidate_messages(candidate_id: int):
+async def get_candidate_messages(candidate_id: int, talent_service: TalentService = Depends(get_talent_service)):
     """Get all messages for a specific candidate"""
     try:
-        talent_service = TalentService()
-        await talent_service.prisma.connect()
-
         messages = await talent_service.get_candidate_messages(candidate_id)
 
-        await talent_service.prisma.disconnect()
-
         return messages
 
     except Exception as e:
@@ -268,16 +390,11 @@ async def get_candidate_messages(candidate_id: int):
 
 # Event endpoints
 @router.post("/events", response_model=EventResponse)
-async def create_event(request: CreateEventRequest):
+async def create_event(request: CreateEventRequest, talent_service: TalentService = Depends(get_talent_service)):
     """Create a calendar event/meeting with a candidate"""
     try:
-        talent_service = TalentService()
-        await talent_service.prisma.connect()
-
         event = await talent_service.create_event(request)
 
-        await talent_service.prisma.disconnect()
-
         if not event:
             raise HTTPException(status_code=404, detail="Failed to create event")
 
@@ -290,16 +407,11 @@ async def create_event(request: CreateEventRequest):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.get("/candidates/{candidate_id}/events", response_model=List[EventResponse])
-async def get_candidate_events(candidate_id: int):
+async def get_candidate_events(candidate_id: int, talent_service: TalentService = Depends(get_talent_service)):
     """Get all events/meetings for a specific candidate"""
     try:
-        talent_service = TalentService()
-        await talent_service.prisma.connect()
-
         events = await talent_service.get_candidate_events(candidate_id)
 
-        await talent_service.prisma.disconnect()
-
         return events
 
     except Exception as e:
@@ -307,16 +419,11 @@ async def get_candidate_events(candidate_id: int):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.get("/events", response_model=List[EventResponse])
-async def get_all_events():
+async def get_all_events(talent_service: TalentService = Depends(get_talent_service)):
     """Get all upcoming events across all candidates"""
     try:
-        talent_service = TalentService()
-        await talent_service.prisma.connect()
-
         events = await talent_service.get_all_events()
 
-        await talent_service.prisma.disconnect()
-
         return events
 
     except Exception as e:
@@ -324,12 +431,9 @@ async def get_all_events():
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.get("/events/{event_id}/calendar-invite")
-async def download_calendar_invite(event_id: int):
+async def download_calendar_invite(event_id: int, talent_service: TalentService = Depends(get_talent_service)):
     """Download the .ics calendar invite file for a specific event"""
     try:
-        talent_service = TalentService()
-        await talent_service.prisma.connect()
-
         # Get the event
         event = await talent_service.prisma.event.find_unique(
             where={"id": event_id},
@@ -359,8 +463,6 @@ async def download_calendar_invite(event_id: int):
                 except:
                     continue
 
-        await talent_service.prisma.disconnect()
-
         if not calendar_invite:
             # Generate a new one if not found
             calendar_invite = talent_service.calendar_service.generate_ics(
@@ -394,16 +496,11 @@ async def download_calendar_invite(event_id: int):
 
 # Feedback endpoints
 @router.post("/feedback", response_model=FeedbackResponse)
-async def create_feedback(request: CreateFeedbackRequest):
+async def create_feedback(request: CreateFeedbackRequest, talent_service: TalentService = Depends(get_talent_service)):
     """Create interview feedback for a candidate"""
     try:
-        talent_service = TalentService()
-        await talent_service.prisma.connect()
-
         feedback = await talent_service.create_feedback(request)
 
-        await talent_service.prisma.disconnect()
-
         if not feedback:
             raise HTTPException(status_code=404, detail="Failed to create feedback")
 
@@ -416,16 +513,11 @@ async def create_feedback(request: CreateFeedbackRequest):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.get("/feedback/candidates-with-feedback", response_model=List[CandidateWithFeedback])
-async def get_candidates_with_feedback():
+async def get_candidates_with_feedback(talent_service: TalentService = Depends(get_talent_service)):
     """Get all candidates that have received feedback"""
     try:
-        talent_service = TalentService()
-        await talent_service.prisma.connect()
-
         candidates = await talent_service.get_candidates_with_feedback()
 
-        await talent_service.prisma.disconnect()
-
         return candidates
 
     except HTTPException:
@@ -435,16 +527,11 @@ async def get_candidates_with_feedback():
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.get("/candidates/{candidate_id}/feedback", response_model=List[FeedbackResponse])
-async def get_candidate_feedback(candidate_id: int):
+async def get_candidate_feedback(candidate_id: int, talent_service: TalentService = Depends(get_talent_service)):
     """Get all feedback for a specific candidate"""
     try:
-        talent_service = TalentService()
-        await talent_service.prisma.connect()
-
         feedback = await talent_service.get_candidate_feedback(candidate_id)
 
-        await talent_service.prisma.disconnect()
-
         return feedback
 
     except HTTPException:
@@ -454,16 +541,11 @@ async def get_candidate_feedback(candidate_id: int):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.post("/feedback/submit-as-message", response_model=MessageResponse)
-async def submit_feedback_as_message(request: SubmitFeedbackMessageRequest):
+async def submit_feedback_as_message(request: SubmitFeedbackMessageRequest, talent_service: TalentService = Depends(get_talent_service)):
     """Submit interview feedback as an internal message (creates both message and feedback record)"""
     try:
-        talent_service = TalentService()
-        await talent_service.prisma.connect()
-
         message = await talent_service.submit_feedback_as_message(request)
 
-        await talent_service.prisma.disconnect()
-
         if not message:
             raise HTTPException(status_code=404, detail="Failed to submit feedback")
 
@@ -477,16 +559,11 @@ async def submit_feedback_as_message(request: SubmitFeedbackMessageRequest):
 
 # Assessment endpoints
 @router.post("/assessments", response_model=AssessmentResponse)
-async def create_assessment(request: CreateAssessmentRequest):
+async def create_assessment(request: CreateAssessmentRequest, talent_service: TalentService = Depends(get_talent_service)):
     """Create an assessment for a candidate"""
     try:
-        talent_service = TalentService()
-        await talent_service.prisma.connect()
-
         assessment = await talent_service.create_assessment(request)
 
-        await talent_service.prisma.disconnect()
-
         if not assessment:
             raise HTTPException(status_code=404, detail="Failed to create assessment")
 
@@ -499,16 +576,11 @@ async def create_assessment(request: CreateAssessmentRequest):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.get("/assessments/awaiting-feedback", response_model=List[AssessmentResponse])
-async def get_assessments_awaiting_feedback():
+async def get_assessments_awaiting_feedback(talent_service: TalentService = Depends(get_talent_service)):
     """Get all assessments that are awaiting feedback"""
     try:
-        talent_service = TalentService()
-        await talent_service.prisma.connect()
-
         assessments = await talent_service.get_assessments_awaiting_feedback()
 
-        await talent_service.prisma.disconnect()
-
         return assessments
 
     except HTTPException:
@@ -518,16 +590,11 @@ async def get_assessments_awaiting_feedback():
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.post("/assessments/forward")
-async def forward_assessment(request: ForwardAssessmentRequest):
+async def forward_assessment(request: ForwardAssessmentRequest, talent_service: TalentService = Depends(get_talent_service)):
     """Forward an assessment to an engineer for review"""
     try:
-        talent_service = TalentService()
-        await talent_service.prisma.connect()
-
         success = await talent_service.forward_assessment(request)
 
-        await talent_service.prisma.disconnect()
-
         if not success:
             raise HTTPException(status_code=404, detail="Failed to forward assessment")
 
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 class ScoutRequest(BaseModel):
     job_title: str
@@ -19,6 +19,16 @@ class CandidateResponse(BaseModel):
     recent_post: str
     roles: List[str]
     pipeline_stage: Optional[str] = None
+    scored: bool = True  # False when Grok couldn't score the candidate (match is 0)
+
+class SearchSnippet(BaseModel):
+    source: str  # "bio", "tweet" or "reasoning"
+    text: str  # matched terms wrapped in **
+
+class CandidateSearchResult(BaseModel):
+    candidate: CandidateResponse
+    score: float  # relevance, higher is better (not comparable across queries)
+    snippets: List[SearchSnippet]
 
 class TwitterUser(BaseModel):
     id: str
@@ -30,10 +40,23 @@ class TwitterUser(BaseModel):
     profile_image_url: str = ""
     profile_banner_url: str = ""
     recent_tweet: str = ""
+    matched_tweets: List[str] = []  # search hits by this author (free pre-ranking signal)
+    pre_rank_score: Optional[float] = None
+    tweets_refreshed: bool = False  # timeline fetched in full (not just since lastTweetId) this run
 
 class GrokScoringResult(BaseModel):
-    score: int
+    score: Optional[int]  # None when the candidate couldn't be scored
     reasoning: str
+    latency_ms: float = 0  # cost of producing this score (0 when served from cache)
+    tokens_used: int = 0
+
+    @property
+    def scored(self) -> bool:
+        return self.score is not None
+
+    @classmethod
+    def unscored(cls, reason: str) -> "GrokScoringResult":
+        return cls(score=None, reasoning=reason)
 
 class TweetResponse(BaseModel):
     id: str
@@ -225,4 +248,17 @@ class CandidateWithFeedback(BaseModel):
     stage: str
     feedback_count: int
     avg_rating: float
-    top_recommendation: str
\ No newline at end of file
+    top_recommendation: str
+
+
+class ScoutJobResponse(BaseModel):
+    id: str
+    status: str  # "queued", "running", "completed", "failed", "cancelled"
+    job_title: str
+    keywords: List[str]
+    progress: Dict[str, Any] = {}
+    candidates: Optional[List[CandidateResponse]] = None  # ranked top 10 once completed
+    error: Optional[str] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
@@ -0,0 +1,178 @@
+"""Full-text index over candidate bios, stored tweets and Grok reasoning.
+
+One index row per source document, kept in step by triggers on Candidate,
+Tweet and SearchResult (SQLite FTS5, or a tsvector + GIN table on
+PostgreSQL). Index rows are keyed by ``sourceId * 4 + source code`` so a
+trigger can replace or drop a document with a primary-key lookup instead of
+scanning the index.
+"""
+import re
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+SOURCES = {"bio": 1, "tweet": 2, "reasoning": 3}
+SNIPPET_OPEN, SNIPPET_CLOSE = "**", "**"
+# Documents fetched per requested result, so candidates with many matching tweets don't crowd out the rest
+SEARCH_HITS_PER_RESULT = 10
+# Backfilling a large table can outlast Prisma's default 5 s interactive-transaction timeout
+SETUP_TIMEOUT = timedelta(minutes=10)
+# pg_advisory_xact_lock key held while the index is set up, so workers starting together take turns
+SETUP_LOCK_KEY = 4_213_775_021
+
+# Which table feeds each source: (table, id column, candidate column, text column)
+_SOURCE_TABLES = {
+    "bio": ("Candidate", "id", "id", "bio"),
+    "tweet": ("Tweet", "id", "candidateId", "content"),
+    "reasoning": ("SearchResult", "id", "candidateId", "reasoning"),
+}
+
+
+def _sqlite_triggers(source: str) -> List[str]:
+    table, id_col, candidate_col, text_col = _SOURCE_TABLES[source]
+    code = SOURCES[source]
+    insert = (
+        f'INSERT INTO "CandidateSearch" ("rowid", "candidateId", "source", "body") '
+        f'SELECT NEW."{id_col}" * 4 + {code}, NEW."{candidate_col}", \'{source}\', NEW."{text_col}" '
+        f'WHERE NEW."{text_col}" IS NOT NULL;'
+    )
+    delete = f'DELETE FROM "CandidateSearch" WHERE "rowid" = OLD."{id_col}" * 4 + {code};'
+    return [
+        f'CREATE TRIGGER IF NOT EXISTS "{table}_search_insert" AFTER INSERT ON "{table}" BEGIN {insert} END',
+        f'CREATE TRIGGER IF NOT EXISTS "{table}_search_update" AFTER UPDATE OF "{text_col}" ON "{table}" '
+        f'WHEN OLD."{text_col}" IS NOT NEW."{text_col}" BEGIN {delete} {insert} END',
+        f'CREATE TRIGGER IF NOT EXISTS "{table}_search_delete" AFTER DELETE ON "{table}" BEGIN {delete} END',
+    ]
+
+
+def _postgres_triggers(source: str) -> List[str]:
+    table, id_col, candidate_col, text_col = _SOURCE_TABLES[source]
+    code = SOURCES[source]
+    function = f"{table.lower()}_search_sync"
+    return [
+        f'''CREATE OR REPLACE FUNCTION {function}() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        DELETE FROM "CandidateSearch" WHERE "id" = OLD."{id_col}"::bigint * 4 + {code};
+    END IF;
+    IF TG_OP <> 'DELETE' AND NEW."{text_col}" IS NOT NULL THEN
+        INSERT INTO "CandidateSearch" ("id", "candidateId", "source", "body")
+        VALUES (NEW."{id_col}"::bigint * 4 + {code}, NEW."{candidate_col}", '{source}', NEW."{text_col}");
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql''',
+        f'CREATE OR REPLACE TRIGGER "{table}_search_sync" AFTER INSERT OR DELETE OR UPDATE OF "{text_col}" ON "{table}" '
+        f'FOR EACH ROW EXECUTE FUNCTION {function}()',
+    ]
+
+
+def _backfill(source: str, provider: str) -> str:
+    """Index every existing document of a source, skipping (or rewriting) rows already indexed"""
+    table, id_col, candidate_col, text_col = _SOURCE_TABLES[source]
+    if provider == "postgresql":
+        insert, key_column, on_conflict = "INSERT", "id", ' ON CONFLICT ("id") DO NOTHING'
+    else:
+        # FTS5 rejects OR IGNORE on a rowid clash but honours OR REPLACE, which rewrites the same text
+        insert, key_column, on_conflict = "INSERT OR REPLACE", "rowid", ""
+    return (
+        f'{insert} INTO "CandidateSearch" ("{key_column}", "candidateId", "source", "body") '
+        f'SELECT CAST("{id_col}" AS BIGINT) * 4 + {SOURCES[source]}, "{candidate_col}", \'{source}\', "{text_col}" '
+        f'FROM "{table}" WHERE "{text_col}" IS NOT NULL{on_conflict}'
+    )
+
+
+SQL = {
+    "sqlite": {
+        "exists": 'SELECT "name" FROM "sqlite_master" WHERE "type" = \'table\' AND "name" = \'CandidateSearch\'',
+        "setup": [
+            'CREATE VIRTUAL TABLE IF NOT EXISTS "CandidateSearch" USING fts5('
+            '"candidateId" UNINDEXED, "source" UNINDEXED, "body", tokenize = \'porter unicode61\')',
+            *[trigger for source in SOURCES for trigger in _sqlite_triggers(source)],
+        ],
+        "backfill": [_backfill(source, "sqlite") for source in SOURCES],
+        # bm25() is lower-is-better; negate it so both providers rank higher-is-better
+        "search": (
+            'SELECT "candidateId", "source", '
+            f'snippet("CandidateSearch", 2, \'{SNIPPET_OPEN}\', \'{SNIPPET_CLOSE}\', \'…\', 12) AS "snippet", '
+            '-bm25("CandidateSearch") AS "score" '
+            'FROM "CandidateSearch" WHERE "CandidateSearch" MATCH ? ORDER BY "score" DESC LIMIT ?'
+        ),
+    },
+    "postgresql": {
+        # execute_raw rather than query_raw: Prisma can't deserialize the void this SELECT returns
+        "lock": [f"SELECT pg_advisory_xact_lock({SETUP_LOCK_KEY})"],
+        "exists": 'SELECT 1 FROM information_schema.tables WHERE table_name = \'CandidateSearch\'',
+        "setup": [
+            'CREATE TABLE IF NOT EXISTS "CandidateSearch" ('
+            '"id" BIGINT PRIMARY KEY, "candidateId" INTEGER NOT NULL, "source" TEXT NOT NULL, "body" TEXT NOT NULL, '
+            '"document" tsvector GENERATED ALWAYS AS (to_tsvector(\'english\', "body")) STORED)',
+            'CREATE INDEX IF NOT EXISTS "CandidateSearch_document_idx" ON "CandidateSearch" USING GIN ("document")',
+            *[statement for source in SOURCES for statement in _postgres_triggers(source)],
+        ],
+        "backfill": [_backfill(source, "postgresql") for source in SOURCES],
+        # Rank in the inner query so ts_headline only runs on the rows returned
+        "search": (
+            'SELECT "candidateId", "source", '
+            f'ts_headline(\'english\', "body", to_tsquery(\'english\', $1), \'StartSel={SNIPPET_OPEN}, StopSel={SNIPPET_CLOSE}, '
+            'MaxWords=24, MinWords=8\') AS "snippet", "score" '
+            'FROM (SELECT "candidateId", "source", "body", ts_rank("document", query) AS "score" '
+            'FROM "CandidateSearch", to_tsquery(\'english\', $1) AS query '
+            'WHERE "document" @@ query ORDER BY "score" DESC LIMIT $2) AS hits '
+            'ORDER BY "score" DESC'
+        ),
+    },
+}
+
+
+def match_query(text: str, provider: str) -> Optional[str]:
+    """User search text as a prefix-matching AND query in the provider's syntax (None if no words)"""
+    words = re.findall(r"\w+", (text or "").lower())
+    if not words:
+        return None
+    if provider == "postgresql":
+        return " & ".join(f"{word}:*" for word in words)
+    # Quoted so FTS5 operators and column filters in user input are just text
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def group_hits(rows: List[Dict], limit: int, snippets_per_candidate: int = 3) -> List[Dict]:
+    """Fold document hits (best first) into ranked candidates.
+
+    A candidate scores the sum over sources of its best document in each, so
+    matching in bio and tweets beats one strong tweet, while twenty similar
+    tweets (or the same reasoning from repeated scouts) don't stack up.
+    """
+    candidates: Dict[int, Dict] = {}
+    for row in rows:
+        candidate_id = int(row["candidateId"])
+        hit = candidates.setdefault(candidate_id, {"candidate_id": candidate_id, "best": {}, "snippets": []})
+        hit["best"][row["source"]] = max(hit["best"].get(row["source"], 0.0), float(row["score"]))
+        if len(hit["snippets"]) < snippets_per_candidate:
+            hit["snippets"].append({"source": row["source"], "text": row["snippet"]})
+    ranked = sorted(
+        ({"candidate_id": hit["candidate_id"], "score": sum(hit["best"].values()), "snippets": hit["snippets"]}
+         for hit in candidates.values()),
+        key=lambda hit: hit["score"], reverse=True
+    )
+    return ranked[:limit]
+
+
+async def ensure_search_index(client, provider: str) -> bool:
+    """Create the index and its triggers if missing (idempotent). Returns True if it was built now.
+
+    Runs in one transaction, so a failed setup leaves nothing half-built. On
+    PostgreSQL an advisory lock makes workers that start together take turns,
+    and the backfill tolerates rows that are already indexed. A missing index
+    (e.g. dropped by ``prisma db push``) is rebuilt from the source tables.
+    """
+    statements = SQL[provider]
+    async with client.tx(timeout=SETUP_TIMEOUT) as tx:
+        for statement in statements.get("lock", []):
+            await tx.execute_raw(statement)
+        existed = bool(await tx.query_raw(statements["exists"]))
+        for statement in statements["setup"]:
+            await tx.execute_raw(statement)
+        if not existed:
+            for statement in statements["backfill"]:
+                await tx.execute_raw(statement)
+    return not existed
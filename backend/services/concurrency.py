@@ -0,0 +1,184 @@
+import asyncio
+import statistics
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional
+
+
+class HostLimiter:
+    """Caps in-flight requests per upstream host, shared by every caller"""
+
+    def __init__(self, limits: Dict[str, int], default: int):
+        self.limits = limits
+        self.default = default
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Dict[str, int] = {}
+
+    def semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.limits.get(host, self.default))
+            self._in_flight[host] = 0
+        return self._semaphores[host]
+
+    async def acquire(self, host: str):
+        await self.semaphore(host).acquire()
+        self._in_flight[host] += 1
+
+    def release(self, host: str):
+        self._in_flight[host] -= 1
+        self._semaphores[host].release()
+
+    def stats(self) -> Dict:
+        return {
+            host: {"in_flight": self._in_flight[host], "limit": self.limits.get(host, self.default)}
+            for host in self._semaphores
+        }
+
+
+class _CallOutcome:
+    def __init__(self):
+        self.throttled = False
+        self.failed = False
+
+    def record(self, status_code: int):
+        self.throttled = status_code == 429
+        self.failed = status_code >= 500
+
+
+# Latency differences below this are scheduler jitter, not an upstream slowing down
+_SLOW_FLOOR_MS = 1.0
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit for calls to one upstream.
+
+    Each healthy call grows the limit by 1/limit (about +1 per full window of
+    calls). A 429, 5xx, transport error or a latency above `latency_tolerance`
+    times the baseline multiplies it by `backoff`, at most once per baseline
+    latency so one burst of failures counts as a single signal. Waiters are
+    admitted in FIFO order as soon as any call finishes.
+
+    Latency is measured per unit of work (a call declares its size in
+    `slot(units=...)`, e.g. candidates in a pack), and the baseline is the
+    median of the last `baseline_window` successful calls, slow ones
+    included, so it follows a lasting latency shift instead of pinning the
+    limit at min_limit.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial: int,
+        min_limit: int,
+        max_limit: int,
+        latency_tolerance: float = 2.0,
+        backoff: float = 0.5,
+        baseline_window: int = 20
+    ):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self.baseline_ms: Optional[float] = None  # per unit
+        self._recent_ms: Deque[float] = deque(maxlen=baseline_window)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.successes = 0
+        self.throttled = 0
+        self.errors = 0
+        self.slow_calls = 0
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def _acquire(self):
+        if not self._waiters and self.in_flight < int(self.limit):
+            self._take()
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter  # the slot is taken on our behalf by _wake
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def _take(self):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._take()
+                waiter.set_result(None)
+
+    def _observe(self, latency_ms: float, outcome: _CallOutcome):
+        slow = (
+            self.baseline_ms is not None
+            and latency_ms > max(self.baseline_ms * self.latency_tolerance, self.baseline_ms + _SLOW_FLOOR_MS)
+        )
+        if not (outcome.throttled or outcome.failed):
+            # Slow successes count too, or a lasting shift would look slow forever
+            self._recent_ms.append(latency_ms)
+            self.baseline_ms = statistics.median(self._recent_ms)
+
+        if outcome.throttled or outcome.failed or slow:
+            self.throttled += outcome.throttled
+            self.errors += outcome.failed
+            self.slow_calls += slow and not (outcome.throttled or outcome.failed)
+            now = time.monotonic()
+            if now - self._last_decrease >= (self.baseline_ms or latency_ms) / 1000:
+                self._last_decrease = now
+                self.decreases += 1
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+            return
+
+        self.successes += 1
+        self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    @asynccontextmanager
+    async def slot(self, units: float = 1):
+        """Hold one concurrency slot for a call of `units` work; record its status code on the yielded outcome"""
+        await self._acquire()
+        outcome = _CallOutcome()
+        started = time.perf_counter()
+        cancelled = False
+        try:
+            yield outcome
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        except Exception:
+            outcome.failed = True
+            raise
+        finally:
+            if not cancelled:
+                self._observe((time.perf_counter() - started) * 1000 / max(units, 1), outcome)
+            self._release()
+
+    def snapshot(self) -> Dict:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "peak_in_flight": self.peak_in_flight,
+            "baseline_latency_ms": round(self.baseline_ms, 1) if self.baseline_ms is not None else None,
+            "successes": self.successes,
+            "throttled": self.throttled,
+            "errors": self.errors,
+            "slow_calls": self.slow_calls,
+            "decreases": self.decreases
+        }
@@ -0,0 +1,59 @@
+from .database import Database
+from .http_clients import HttpClients
+from .rate_limiter import TwitterRateLimiter
+from .resilience import CircuitBreaker
+from .scoring_cache import ScoringCache
+from ..config.settings import settings
+from .twitter_service import TwitterService
+from .grok_service import GrokService
+from .calendar_service import CalendarService
+from .twitter_oauth_service import TwitterOAuthService
+from .talent_service import TalentService
+from .scout_jobs import ScoutJobQueue
+
+
+class ServiceContainer:
+    """Long-lived services shared by every request.
+
+    Built once in main.py's lifespan and handed to route handlers through
+    ``Depends``, so env validation, HTTP clients, caches and DB handles are
+    set up a single time instead of per request.
+    """
+
+    def __init__(self, database: Database = None):
+        self.database = database or Database()
+        self.http_clients = HttpClients()
+        self.rate_limiter = TwitterRateLimiter()
+        self.breakers = {"twitter": CircuitBreaker("twitter"), "xai": CircuitBreaker("xai")}
+        self.twitter_service = TwitterService(
+            client=self.http_clients.twitter,
+            rate_limiter=self.rate_limiter,
+            breaker=self.breakers["twitter"]
+        )
+        self.scoring_cache = ScoringCache() if settings.SCORING_CACHE_ENABLED else None
+        self.grok_service = GrokService(
+            client=self.http_clients.xai,
+            breaker=self.breakers["xai"],
+            cache=self.scoring_cache
+        )
+        self.calendar_service = CalendarService()
+        self.oauth_service = TwitterOAuthService(client=self.http_clients.twitter)
+        self.talent_service = TalentService(
+            prisma=self.database.leased_client,
+            twitter_service=self.twitter_service,
+            grok_service=self.grok_service,
+            calendar_service=self.calendar_service,
+            provider=self.database.provider
+        )
+        self.scout_jobs = ScoutJobQueue(self.talent_service, self.database)
+
+    async def startup(self):
+        await self.database.connect()
+        await self.scout_jobs.start()
+
+    async def shutdown(self):
+        await self.scout_jobs.stop()
+        await self.http_clients.aclose()
+        if self.scoring_cache:
+            self.scoring_cache.close()
+        await self.database.disconnect()
@@ -0,0 +1,185 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import parse_qsl, urlencode
+from fastapi import HTTPException
+from prisma import Prisma
+from ..config.settings import database_provider, settings
+from .candidate_search import ensure_search_index
+from .leased_client import LeasedClient
+from .sqlite_profile import MAINTENANCE_PRAGMAS, parse_checkpoint, sqlite_connection_pragmas
+
+
+class DatabasePoolTimeout(HTTPException):
+    """Raised when no pooled connection frees up within the pool timeout (routes pass it on as a 503)"""
+
+    def __init__(self, detail: str):
+        super().__init__(status_code=503, detail=detail)
+
+
+def with_pool_params(url: str, pool_size: int, pool_timeout: float, busy_timeout: Optional[float] = None) -> str:
+    """Add Prisma's connection_limit/pool_timeout params to a datasource URL (existing ones win).
+
+    For SQLite, `busy_timeout` becomes `socket_timeout`, which the engine
+    applies to every connection as SQLite's busy timeout.
+    """
+    base, _, query = url.partition("?")
+    params = dict(parse_qsl(query))
+    params.setdefault("connection_limit", str(pool_size))
+    params.setdefault("pool_timeout", str(int(pool_timeout)))
+    if busy_timeout is not None:
+        params.setdefault("socket_timeout", str(max(1, int(busy_timeout))))
+    return f"{base}?{urlencode(params)}"
+
+
+class Database:
+    """App-lifetime Prisma client shared by every request.
+
+    The Prisma query engine owns the actual connection pool (sized through the
+    datasource's ``connection_limit``). ``lease()`` hands out the shared client
+    while holding one of ``pool_size`` slots, so callers queue instead of
+    overloading the engine and saturation can be reported. Services use
+    ``leased_client``, which takes a slot per query rather than per request.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        pool_size: Optional[int] = None,
+        pool_timeout: Optional[float] = None,
+        connect_timeout: Optional[float] = None
+    ):
+        self.pool_size = pool_size or settings.DB_POOL_SIZE
+        self.pool_timeout = pool_timeout if pool_timeout is not None else settings.DB_POOL_TIMEOUT
+        self.connect_timeout = connect_timeout if connect_timeout is not None else settings.DB_CONNECT_TIMEOUT
+        url = url or settings.DATABASE_URL
+        # The generated client must match: `python scripts/render_schema.py` then `prisma generate --schema ...`
+        self.provider = database_provider(url)
+        self.sqlite_tuning = self.provider == "sqlite" and settings.SQLITE_TUNING_ENABLED
+        self.url = with_pool_params(
+            url, self.pool_size, self.pool_timeout,
+            busy_timeout=settings.SQLITE_BUSY_TIMEOUT if self.sqlite_tuning else None
+        )
+
+        self.client = Prisma(
+            datasource={"url": self.url},
+            connect_timeout=timedelta(seconds=self.connect_timeout)
+        )
+        self.leased_client = LeasedClient(self)
+
+        self._semaphore = asyncio.Semaphore(self.pool_size)
+        self._in_use = 0
+        self._waiting = 0
+        self._peak_in_use = 0
+        self._total_leases = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+
+        self._maintenance_task: Optional[asyncio.Task] = None
+        self._sqlite_stats: Dict = {}
+
+    async def connect(self):
+        if not self.client.is_connected():
+            await self.client.connect()
+            print(f"✓ Database connected ({self.provider}, pool size {self.pool_size})")
+            if self.sqlite_tuning:
+                await self.apply_sqlite_profile()
+                if settings.SQLITE_MAINTENANCE_INTERVAL > 0:
+                    self._maintenance_task = asyncio.create_task(self._maintenance_loop())
+            if settings.CANDIDATE_SEARCH_ENABLED:
+                if await ensure_search_index(self.client, self.provider):
+                    print("✓ Candidate search index built")
+
+    async def disconnect(self):
+        if self._maintenance_task:
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+            self._maintenance_task = None
+        if self.client.is_connected():
+            await self.client.disconnect()
+
+    async def apply_sqlite_profile(self):
+        """WAL journal plus the per-connection pragmas from Settings.
+
+        journal_mode is stored in the database file, and the busy timeout goes
+        in the URL (``with_pool_params``), so both cover every connection. The
+        rest (synchronous, cache_size, mmap_size, temp_store) can't be set
+        through the URL and the engine has no per-connection hook, so they are
+        best effort: issued once per pool slot and again on every maintenance
+        pass, and a connection the engine opens in between runs with SQLite's
+        defaults until then. Only speed depends on them, not locking.
+        """
+        rows = await self.client.query_raw(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        journal_mode = list(rows[0].values())[0] if rows else None
+        await asyncio.gather(*[self._apply_connection_pragmas() for _ in range(self.pool_size)])
+        self._sqlite_stats["journal_mode"] = journal_mode
+        print(f"✓ SQLite profile applied (journal_mode={journal_mode}, synchronous={settings.SQLITE_SYNCHRONOUS})")
+
+    async def _apply_connection_pragmas(self):
+        for pragma in sqlite_connection_pragmas():
+            await self.client.query_raw(pragma)
+
+    async def run_sqlite_maintenance(self) -> Dict:
+        """Checkpoint the WAL (without blocking anyone) and refresh planner stats"""
+        async with self.lease() as db:
+            checkpoint = parse_checkpoint(await db.query_raw(MAINTENANCE_PRAGMAS[0]))
+            for pragma in MAINTENANCE_PRAGMAS[1:]:
+                await db.query_raw(pragma)
+            await self._apply_connection_pragmas()
+        self._sqlite_stats.update(last_checkpoint=checkpoint, last_maintenance=time.time())
+        return checkpoint
+
+    async def _maintenance_loop(self):
+        while True:
+            await asyncio.sleep(settings.SQLITE_MAINTENANCE_INTERVAL)
+            try:
+                await self.run_sqlite_maintenance()
+            except Exception as e:
+                print(f"SQLite maintenance failed: {e}")
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[Prisma]:
+        """Borrow the shared client for the duration of a unit of work"""
+        started = time.perf_counter()
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.pool_timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            raise DatabasePoolTimeout(
+                f"No database connection available after {self.pool_timeout}s ({self.pool_size} in use)"
+            )
+        finally:
+            self._waiting -= 1
+
+        self._total_wait += time.perf_counter() - started
+        self._total_leases += 1
+        self._in_use += 1
+        self._peak_in_use = max(self._peak_in_use, self._in_use)
+        try:
+            yield self.client
+        finally:
+            self._in_use -= 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict:
+        """Pool saturation snapshot for the admin endpoint"""
+        return {
+            "connected": self.client.is_connected(),
+            "provider": self.provider,
+            "pool_size": self.pool_size,
+            "in_use": self._in_use,
+            "available": self.pool_size - self._in_use,
+            "waiting": self._waiting,
+            "saturation": round(self._in_use / self.pool_size, 3),
+            "peak_in_use": self._peak_in_use,
+            "total_leases": self._total_leases,
+            "timeouts": self._timeouts,
+            "avg_wait_ms": round(self._total_wait / self._total_leases * 1000, 2) if self._total_leases else 0.0,
+            "sqlite": self._sqlite_stats if self.sqlite_tuning else None
+        }
@@ -1,26 +1,24 @@
 import httpx
 import json
 import asyncio
-from typing import List
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple, TYPE_CHECKING
 from ..config.settings import settings
 from ..models.schemas import GrokScoringResult, TwitterUser
+from .http_clients import build_client
+from .concurrency import AdaptiveLimiter
+from .resilience import CircuitBreaker, call_with_retries
 
-class GrokService:
-    def __init__(self):
-        if not settings.XAI_API_KEY:
-            raise ValueError("XAI_API_KEY not found in environment")
+if TYPE_CHECKING:
+    from .scoring_cache import ScoringCache
 
-    async def score_candidate(self, job_title: str, user: TwitterUser) -> GrokScoringResult:
-        try:
-            prompt = f"""You are an expert technical recruiter evaluating a candidate for: "{job_title}"
+# Bump whenever the scoring prompt changes so cached scores are not reused
+SCORING_PROMPT_VERSION = "v1"
 
-CANDIDATE PROFILE:
-Name: {user.name}
-Bio: {user.description}
-Followers: {user.followers_count}
-Recent Tweet: {user.recent_tweet}
 
-EVALUATION CRITERIA (be generous and look for potential):
+def _scoring_rubric(job_title: str) -> str:
+    """Evaluation criteria shared by the single and packed scoring prompts"""
+    return f"""EVALUATION CRITERIA (be generous and look for potential):
 1. Technical Skills Match (0-40 points):
    - Does bio mention ANY relevant technologies or programming languages?
    - Look for keywords like: developer, engineer, programmer, coder, tech
@@ -50,108 +48,300 @@ SCORING GUIDELINES (be more generous):
 - 0-24: Poor match - no clear technical background
 
 AIM FOR BALANCE: Score candidates fairly. Most qualified candidates should score 60-85.
-Give higher scores to anyone with clear technical skills and relevant experience.
+Give higher scores to anyone with clear technical skills and relevant experience."""
+
+
+def _candidate_profile(user: TwitterUser) -> str:
+    return f"""Name: {user.name}
+Bio: {user.description}
+Followers: {user.followers_count}
+Recent Tweet: {user.recent_tweet}"""
+
+
+def _parse_packed_scores(content: str) -> Dict[str, dict]:
+    """Map candidate ID -> entry from a packed JSON array response (tolerates code fences)"""
+    text = content.strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        text = text[text.index("\n") + 1:] if "\n" in text else ""
+    entries = json.loads(text)
+    if not isinstance(entries, list):
+        raise ValueError("Packed scoring response is not a JSON array")
+    return {str(entry["id"]): entry for entry in entries if isinstance(entry, dict) and "id" in entry}
+
+
+class GrokService:
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        cache: Optional["ScoringCache"] = None,
+        limiter: Optional[AdaptiveLimiter] = None
+    ):
+        if not settings.XAI_API_KEY:
+            raise ValueError("XAI_API_KEY not found in environment")
+
+        # Shared keep-alive client (owned by the app lifespan when injected)
+        self.client = client or build_client("xai", settings.XAI_TIMEOUT)
+        self.breaker = breaker or CircuitBreaker("xai")
+        self.cache = cache
+        # Adaptive cap on in-flight scoring calls; learned across scouts
+        self.limiter = limiter or AdaptiveLimiter(
+            "grok-scoring",
+            initial=settings.GROK_CONCURRENCY_INITIAL,
+            min_limit=settings.GROK_CONCURRENCY_MIN,
+            max_limit=settings.GROK_CONCURRENCY_MAX,
+            latency_tolerance=settings.GROK_LATENCY_TOLERANCE
+        )
+
+    async def _post_completion(
+        self,
+        payload: dict,
+        timeout: Optional[float] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        units: int = 1
+    ) -> httpx.Response:
+        """POST a chat completion with retries/backoff behind the xAI circuit breaker.
+
+        With a limiter, each attempt holds one of its slots and reports its
+        latency and status, so backoff sleeps between retries don't hold a slot.
+        `units` is the number of candidates in the prompt, so packs and
+        single-candidate calls are judged against the same per-candidate baseline.
+        """
+        async def post():
+            return await self.client.post(
+                f"{settings.XAI_BASE_URL}/chat/completions",
+                headers={
+                    "Authorization": f"Bearer {settings.XAI_API_KEY}",
+                    "Content-Type": "application/json"
+                },
+                json=payload,
+                timeout=timeout or httpx.USE_CLIENT_DEFAULT
+            )
+
+        async def send():
+            if not limiter:
+                return await post()
+            async with limiter.slot(units=units) as outcome:
+                response = await post()
+                outcome.record(response.status_code)
+                return response
+
+        return await call_with_retries(self.breaker, send)
+
+    async def score_candidate(self, job_title: str, user: TwitterUser) -> GrokScoringResult:
+        try:
+            prompt = f"""You are an expert technical recruiter evaluating a candidate for: "{job_title}"
+
+CANDIDATE PROFILE:
+{_candidate_profile(user)}
+
+{_scoring_rubric(job_title)}
 
 Return ONLY valid JSON:
 {{"score": <0-100>, "reasoning": "<concise 1-2 sentence explanation>"}}"""
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{settings.XAI_BASE_URL}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {settings.XAI_API_KEY}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "grok-3",
-                        "messages": [{"role": "user", "content": prompt}],
-                        "temperature": 0.3,
-                        "max_tokens": 200
-                    }
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    content = result["choices"][0]["message"]["content"]
-
-                    try:
-                        parsed = json.loads(content)
-                        return GrokScoringResult(
-                            score=min(100, max(1, int(parsed.get("score", 50)))),
-                            reasoning=parsed.get("reasoning", "No reasoning provided")
-                        )
-                    except:
-                        return GrokScoringResult(
-                            score=50,
-                            reasoning="Could not parse Grok response"
-                        )
-                else:
-                    print(f"Grok API error: {response.status_code} - {response.text}")
+            started = time.perf_counter()
+            response = await self._post_completion({
+                "model": "grok-3",
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": 0.3,
+                "max_tokens": 200
+            }, limiter=self.limiter)
+
+            if response.status_code == 200:
+                result = response.json()
+                content = result["choices"][0]["message"]["content"]
+
+                try:
+                    parsed = json.loads(content)
                     return GrokScoringResult(
-                        score=50,
-                        reasoning="API error"
+                        score=min(100, max(1, int(parsed["score"]))),
+                        reasoning=parsed.get("reasoning", "No reasoning provided"),
+                        latency_ms=(time.perf_counter() - started) * 1000,
+                        tokens_used=result.get("usage", {}).get("total_tokens", 0)
                     )
+                except (ValueError, KeyError, TypeError):
+                    return GrokScoringResult.unscored("Could not parse Grok response")
+            else:
+                print(f"Grok API error: {response.status_code} - {response.text}")
+                return GrokScoringResult.unscored(f"Grok API error ({response.status_code})")
 
         except Exception as e:
             print(f"Grok scoring error: {e}")
-            return GrokScoringResult(
-                score=50,
-                reasoning=f"Error: {str(e)}"
-            )
+            return GrokScoringResult.unscored(f"Scoring unavailable: {str(e) or type(e).__name__}")
 
-    async def score_candidates_batch(self, job_title: str, users: List[TwitterUser], batch_size: int = 5) -> List[GrokScoringResult]:
-        """Score multiple candidates in parallel batches for better performance"""
-        results = []
+    async def score_candidates_batch(self, job_title: str, users: List[TwitterUser]) -> List[GrokScoringResult]:
+        """Score multiple candidates, serving repeat profiles from the scoring cache"""
+        results: List[Optional[GrokScoringResult]] = [None] * len(users)
+        async for index, result in self.iter_scores(job_title, users):
+            results[index] = result
+        return results
 
-        # Process in batches to avoid overwhelming the API
-        for i in range(0, len(users), batch_size):
-            batch = users[i:i + batch_size]
-            print(f"Scoring batch {i//batch_size + 1} ({len(batch)} candidates)...")
+    async def iter_scores(self, job_title: str, users: List[TwitterUser]) -> AsyncIterator[Tuple[int, GrokScoringResult]]:
+        """Yield (index, result) as scores become available.
 
-            # Score all candidates in this batch concurrently
-            batch_tasks = [self.score_candidate(job_title, user) for user in batch]
-            batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
+        Cache hits come first, then each pack (or single candidate when
+        packing is off) as soon as its completion returns.
+        """
+        pending = list(range(len(users)))
+        if self.cache:
+            cached = await self.cache.get_many(job_title, users)
+            pending = [i for i, result in enumerate(cached) if result is None]
+            print(f"Scoring cache: {len(users) - len(pending)} hits, {len(pending)} misses")
+            for index, result in enumerate(cached):
+                if result is not None:
+                    yield index, result
 
-            # Handle any exceptions
-            for result in batch_results:
-                if isinstance(result, Exception):
-                    print(f"Batch scoring error: {result}")
-                    results.append(GrokScoringResult(score=50, reasoning="Batch error"))
-                else:
-                    results.append(result)
+        chunk_size = max(1, settings.GROK_PACK_SIZE)
+        chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
 
-            # Small delay between batches to be nice to the API
-            if i + batch_size < len(users):
-                await asyncio.sleep(0.5)
+        async def score(chunk: List[int]):
+            chunk_users = [users[i] for i in chunk]
+            try:
+                results = await self._score_uncached(job_title, chunk_users)
+            except Exception as e:
+                print(f"Batch scoring error: {e}")
+                results = [GrokScoringResult.unscored("Batch error")] * len(chunk)
+            if self.cache:
+                await self.cache.put_many(job_title, chunk_users, results)
+            return chunk, results
+
+        tasks = [asyncio.ensure_future(score(chunk)) for chunk in chunks]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                chunk, results = await next_done
+                for index, result in zip(chunk, results):
+                    yield index, result
+        finally:
+            # Consumer stopped early (e.g. a streaming client disconnected)
+            for task in tasks:
+                task.cancel()
+
+    async def _score_uncached(self, job_title: str, users: List[TwitterUser]) -> List[GrokScoringResult]:
+        """Score candidates in packed prompts, or one request each when packing is disabled"""
+        if settings.GROK_PACK_SIZE > 1 and len(users) > 1:
+            return await self.score_candidates_packed(job_title, users, settings.GROK_PACK_SIZE)
+        return await self._score_individually(job_title, users)
+
+    async def score_candidates_packed(
+        self,
+        job_title: str,
+        users: List[TwitterUser],
+        pack_size: Optional[int] = None
+    ) -> List[GrokScoringResult]:
+        """Score several candidates per completion, rescoring malformed or missing entries one by one"""
+        pack_size = max(1, pack_size or settings.GROK_PACK_SIZE)
+        packs = [users[i:i + pack_size] for i in range(0, len(users), pack_size)]
+        pack_results = await asyncio.gather(*[self._score_pack(job_title, pack) for pack in packs])
+        results = [result for pack in pack_results for result in pack]
+
+        missing = [i for i, result in enumerate(results) if result is None]
+        print(f"Packed scoring: {len(users)} candidates in {len(packs)} requests, "
+              f"{len(missing)} falling back to single scoring")
+        if missing:
+            fallback = await self._score_individually(job_title, [users[i] for i in missing])
+            for i, result in zip(missing, fallback):
+                results[i] = result
 
         return results
 
+    async def _score_pack(self, job_title: str, pack: List[TwitterUser]) -> List[Optional[GrokScoringResult]]:
+        """One completion for the whole pack; None marks malformed or missing entries to rescore singly"""
+        profiles = "\n\n".join(f"[ID: {user.id}]\n{_candidate_profile(user)}" for user in pack)
+        prompt = f"""You are an expert technical recruiter evaluating {len(pack)} candidates for: "{job_title}"
+
+Score each candidate independently.
+
+CANDIDATE PROFILES:
+{profiles}
+
+{_scoring_rubric(job_title)}
+
+Return ONLY a valid JSON array with exactly one entry per candidate ID:
+[{{"id": "<candidate ID>", "score": <0-100>, "reasoning": "<concise 1-2 sentence explanation>"}}]"""
+
+        try:
+            started = time.perf_counter()
+            response = await self._post_completion({
+                "model": "grok-3",
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": 0.3,
+                "max_tokens": 150 * len(pack)
+            }, limiter=self.limiter, units=len(pack))
+        except Exception as e:
+            # Upstream is failing (retries exhausted or circuit open): re-asking per candidate won't help
+            print(f"Grok packed scoring error: {e}")
+            return [GrokScoringResult.unscored(f"Scoring unavailable: {str(e) or type(e).__name__}")] * len(pack)
+
+        if response.status_code != 200:
+            print(f"Grok API error: {response.status_code} - {response.text}")
+            return [GrokScoringResult.unscored(f"Grok API error ({response.status_code})")] * len(pack)
+
+        try:
+            result = response.json()
+            entries = _parse_packed_scores(result["choices"][0]["message"]["content"])
+        except (ValueError, KeyError, TypeError, IndexError):
+            print(f"Could not parse packed Grok response for {len(pack)} candidates")
+            return [None] * len(pack)
+
+        # Attribute the pack's latency and tokens evenly so cache savings stay comparable
+        latency_ms = (time.perf_counter() - started) * 1000 / len(pack)
+        tokens_used = result.get("usage", {}).get("total_tokens", 0) // len(pack)
+
+        scored = []
+        for user in pack:
+            entry = entries.get(user.id)
+            try:
+                scored.append(GrokScoringResult(
+                    score=min(100, max(1, int(entry["score"]))),
+                    reasoning=entry.get("reasoning") or "No reasoning provided",
+                    latency_ms=latency_ms,
+                    tokens_used=tokens_used
+                ))
+            except (ValueError, KeyError, TypeError, AttributeError):
+                scored.append(None)
+        return scored
+
+    async def _score_individually(self, job_title: str, users: List[TwitterUser]) -> List[GrokScoringResult]:
+        """Score candidates one request each, in input order.
+
+        All calls are started at once and the adaptive limiter admits the next
+        one whenever a slot frees up, instead of fixed batches that wait for
+        their slowest call plus a pause.
+        """
+        print(f"Scoring {len(users)} candidates (concurrency limit {int(self.limiter.limit)})...")
+        results = await asyncio.gather(
+            *[self.score_candidate(job_title, user) for user in users],
+            return_exceptions=True
+        )
+
+        scored = []
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"Batch scoring error: {result}")
+                scored.append(GrokScoringResult.unscored("Batch error"))
+            else:
+                scored.append(result)
+        return scored
+
     async def _make_grok_request(self, prompt: str, temperature: float = 0.7, max_tokens: int = 500) -> str:
         """Make a direct request to Grok API and return the text response"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{settings.XAI_BASE_URL}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {settings.XAI_API_KEY}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "grok-3",
-                        "messages": [{"role": "user", "content": prompt}],
-                        "temperature": temperature,
-                        "max_tokens": max_tokens
-                    },
-                    timeout=30.0
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    content = result["choices"][0]["message"]["content"]
-                    return content.strip()
-                else:
-                    print(f"Grok API error: {response.status_code}")
-                    return None
+            response = await self._post_completion({
+                "model": "grok-3",
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": temperature,
+                "max_tokens": max_tokens
+            }, timeout=30.0)
+
+            if response.status_code == 200:
+                result = response.json()
+                content = result["choices"][0]["message"]["content"]
+                return content.strip()
+            else:
+                print(f"Grok API error: {response.status_code}")
+                return None
 
         except Exception as e:
             print(f"Error making Grok request: {e}")
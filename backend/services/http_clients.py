@@ -0,0 +1,144 @@
+import httpx
+from typing import AsyncIterator, Callable, Dict, Optional
+from ..config.settings import settings
+from .concurrency import HostLimiter
+
+
+class ConnectionMetrics:
+    """Counts requests vs. newly opened connections for one upstream.
+
+    Hooks into httpcore's ``trace`` request extension, so every TCP connect
+    and TLS handshake is seen; requests that didn't open a connection rode
+    on a pooled keep-alive one.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+        self.http2_requests = 0
+        self.connect_failures = 0
+
+    async def on_request(self, request: httpx.Request):
+        self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def _trace(self, event_name: str, info: dict):
+        if event_name == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+        elif event_name == "connection.connect_tcp.failed":
+            self.connect_failures += 1
+        elif event_name == "connection.start_tls.complete":
+            self.tls_handshakes += 1
+        elif event_name == "http2.send_request_headers.started":
+            self.http2_requests += 1
+
+    def snapshot(self) -> Dict:
+        reused = max(0, self.requests - self.connections_opened)
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "connections_reused": reused,
+            "reuse_ratio": round(reused / self.requests, 3) if self.requests else 0.0,
+            "tls_handshakes": self.tls_handshakes,
+            "http2_requests": self.http2_requests,
+            "connect_failures": self.connect_failures
+        }
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body wrapper that frees the host slot once the body is closed"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+        self._released = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._release()
+
+
+class HostLimitedTransport(httpx.AsyncBaseTransport):
+    """Holds a per-host concurrency slot from request start until the body is read"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, host_limiter: HostLimiter):
+        self._transport = transport
+        self._host_limiter = host_limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        await self._host_limiter.acquire(host)
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self._host_limiter.release(host)
+            raise
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, lambda: self._host_limiter.release(host)),
+            extensions=response.extensions
+        )
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+def build_host_limiter() -> HostLimiter:
+    return HostLimiter(settings.HOST_CONCURRENCY_LIMITS, settings.HOST_CONCURRENCY_DEFAULT)
+
+
+def build_client(
+    name: str,
+    timeout: float,
+    metrics: Optional[ConnectionMetrics] = None,
+    host_limiter: Optional[HostLimiter] = None
+) -> httpx.AsyncClient:
+    """Keep-alive, HTTP/2-capable client with explicit limits, timeouts and per-host caps"""
+    metrics = metrics or ConnectionMetrics(name)
+    transport = httpx.AsyncHTTPTransport(
+        http2=settings.HTTP2_ENABLED,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+        )
+    )
+    return httpx.AsyncClient(
+        transport=HostLimitedTransport(transport, host_limiter or build_host_limiter()),
+        timeout=httpx.Timeout(timeout, connect=settings.HTTP_CONNECT_TIMEOUT),
+        event_hooks={"request": [metrics.on_request]}
+    )
+
+
+class HttpClients:
+    """One shared client per upstream (Twitter, xAI), owned by the app lifespan"""
+
+    def __init__(self):
+        self.twitter_metrics = ConnectionMetrics("twitter")
+        self.xai_metrics = ConnectionMetrics("xai")
+        self.host_limiter = build_host_limiter()
+        self.twitter = build_client("twitter", settings.TWITTER_TIMEOUT, self.twitter_metrics, self.host_limiter)
+        self.xai = build_client("xai", settings.XAI_TIMEOUT, self.xai_metrics, self.host_limiter)
+
+    async def aclose(self):
+        await self.twitter.aclose()
+        await self.xai.aclose()
+
+    def stats(self) -> Dict:
+        return {
+            "twitter": self.twitter_metrics.snapshot(),
+            "xai": self.xai_metrics.snapshot(),
+            "hosts": self.host_limiter.stats()
+        }
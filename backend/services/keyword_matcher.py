@@ -0,0 +1,97 @@
+import re
+from typing import Dict, List, Optional, Sequence
+
+# Developer/engineer role indicators in a bio
+ROLE_TERMS = [
+    "developer", "engineer", "engineering", "programmer", "software",
+    "frontend", "backend", "full stack", "fullstack",
+    "devops", "sre", "architect", "tech lead", "cto", "ceo"
+]
+
+# Technical keywords in a bio
+TECH_TERMS = [
+    "react", "vue", "angular", "javascript", "typescript", "python",
+    "java", "golang", "rust", "node", "aws", "docker", "kubernetes",
+    "api", "database", "code", "git", "github", "coding", "programming"
+]
+
+# Skills shown as candidate tags, in display order
+SKILL_TERMS = [
+    "python", "javascript", "react", "node", "aws", "docker", "kubernetes", "typescript", "go", "rust",
+    "vue", "angular", "postgresql", "mongodb"
+]
+
+# Other spellings that count as a term ("Golang" is Go, "Node.js" is node)
+SKILL_ALIASES = {
+    "go": ["golang"],
+    "node": ["nodejs", "node.js"],
+    "react": ["reactjs", "react.js"],
+    "vue": ["vuejs", "vue.js"],
+}
+
+# What a recruiter message is about (for AI-simulated candidate replies);
+# "word*" terms are stems, so "schedul*" covers scheduled/scheduling
+INTENT_TERMS = {
+    "scheduling": ["schedul*", "time", "availab*", "call", "meeting", "interview*"],
+    "technical": ["experience*", "skills", "tech", "project", "work on"],
+    "compensation": ["salary", "compensation", "pay", "benefits"],
+    "next_steps": ["next steps", "process", "timeline"],
+}
+
+
+class KeywordMatcher:
+    """Whole-word matcher for several vocabularies compiled into one regex.
+
+    ``scan`` walks the text once and reports, per vocabulary, which of its
+    terms occur. Terms match on word boundaries (so "go" doesn't match
+    "good") with an optional plural "s"; multi-word terms match across any
+    whitespace. A term ending in "*" is a stem and matches any word starting
+    with it, and ``aliases`` maps a term to other spellings that count as it.
+    """
+
+    def __init__(self, vocabularies: Dict[str, Sequence[str]], aliases: Optional[Dict[str, Sequence[str]]] = None):
+        self.vocabularies = {name: list(terms) for name, terms in vocabularies.items()}
+        terms = {term.lower() for vocabulary in self.vocabularies.values() for term in vocabulary}
+
+        # Surface form -> the terms it counts as
+        self._terms: Dict[str, set] = {term: {term} for term in terms if not term.endswith("*")}
+        for term, forms in (aliases or {}).items():
+            for form in forms:
+                self._terms.setdefault(form.lower(), set()).add(term.lower())
+        self._stems = sorted((term[:-1] for term in terms if term.endswith("*")), key=len, reverse=True)
+
+        # Longest first so "golang" wins over "go" and "tech lead" over "tech"
+        alternatives = [
+            r"\s+".join(re.escape(word) for word in form.split())
+            for form in sorted(self._terms, key=len, reverse=True)
+        ] + [re.escape(stem) + r"\w*" for stem in self._stems]
+        self._pattern = re.compile(r"(?<!\w)(" + "|".join(alternatives) + r")s?(?!\w)")
+
+    def _matched_terms(self, text: str) -> set:
+        if text in self._terms:
+            return self._terms[text]
+        return {f"{stem}*" for stem in self._stems if text.startswith(stem)}
+
+    def scan(self, text: str) -> Dict[str, List[str]]:
+        """Vocabulary name -> matched terms (in vocabulary order), for vocabularies with any hit"""
+        found = set()
+        for match in self._pattern.finditer((text or "").lower()):
+            found |= self._matched_terms(" ".join(match.group(1).split()))
+        if not found:
+            return {}
+
+        hits = {}
+        for name, vocabulary in self.vocabularies.items():
+            matched = [term for term in vocabulary if term in found]
+            if matched:
+                hits[name] = matched
+        return hits
+
+
+PROFILE_MATCHER = KeywordMatcher({"roles": ROLE_TERMS, "tech": TECH_TERMS, "skills": SKILL_TERMS}, SKILL_ALIASES)
+INTENT_MATCHER = KeywordMatcher(INTENT_TERMS)
+
+
+def skill_tags(text: str) -> List[str]:
+    """Known skills mentioned in a bio, in display order"""
+    return PROFILE_MATCHER.scan(text).get("skills", [])
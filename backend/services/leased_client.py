@@ -0,0 +1,67 @@
+import functools
+import inspect
+from contextlib import asynccontextmanager
+from typing import Any
+
+
+class _Leased:
+    """Proxy that holds a pool slot while each awaited call on the target runs"""
+
+    def __init__(self, database, target):
+        self._database = database
+        self._target = target
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if inspect.iscoroutinefunction(attr):
+            @functools.wraps(attr)
+            async def call(*args, **kwargs):
+                async with self._database.lease():
+                    return await attr(*args, **kwargs)
+            return call
+        return attr
+
+
+class _LeasedBatch(_Leased):
+    """A batch queues its actions without I/O; only the commit on exit holds a slot"""
+
+    async def __aenter__(self):
+        await self._target.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type:
+            return await self._target.__aexit__(exc_type, exc, tb)
+        async with self._database.lease():
+            return await self._target.__aexit__(exc_type, exc, tb)
+
+
+class LeasedClient(_Leased):
+    """The shared Prisma client, leasing a pool slot per query instead of per request.
+
+    ``client.candidate.find_many(...)`` (any model action, ``query_raw`` and
+    friends) holds a slot only while the query runs, a ``tx()`` holds one for
+    the whole transaction and a ``batch_()`` for its commit. Long handlers
+    such as scouts, which spend most of their time on Twitter and Grok, then
+    don't keep a slot through that I/O and starve cheap reads.
+    """
+
+    def __init__(self, database):
+        super().__init__(database, database.client)
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "tx":
+            return self._tx
+        if name == "batch_":
+            return lambda *args, **kwargs: _LeasedBatch(self._database, self._target.batch_(*args, **kwargs))
+        attr = getattr(self._target, name)
+        if hasattr(attr, "find_many"):
+            return _Leased(self._database, attr)
+        return super().__getattr__(name)
+
+    @asynccontextmanager
+    async def _tx(self, *args, **kwargs):
+        # The transaction's own client is used as-is: the slot is already held
+        async with self._database.lease():
+            async with self._target.tx(*args, **kwargs) as tx:
+                yield tx
@@ -0,0 +1,78 @@
+import re
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+from ..config.settings import settings
+from ..models.schemas import TwitterUser
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+# BM25 parameters (standard defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def candidate_document(user: TwitterUser) -> str:
+    """Text the pre-ranker sees: bio plus whatever tweets we already have for free"""
+    return " ".join([user.description, *user.matched_tweets, user.recent_tweet])
+
+
+def pre_rank_scores(job_title: str, keywords: Sequence[str], users: Sequence[TwitterUser]) -> np.ndarray:
+    """Cheap relevance score (0-100) per user: BM25 of the job title and keywords
+    over each candidate's text, blended with a log-scaled follower signal.
+
+    Computed for the whole batch at once; scores are relative to the batch.
+    """
+    if not users:
+        return np.zeros(0)
+
+    terms = list(dict.fromkeys(tokenize(" ".join([job_title, *keywords]))))
+    term_index: Dict[str, int] = {term: i for i, term in enumerate(terms)}
+
+    # Term-frequency matrix (users x query terms) and document lengths
+    rows, cols = [], []
+    doc_lengths = np.zeros(len(users))
+    for row, user in enumerate(users):
+        tokens = tokenize(candidate_document(user))
+        doc_lengths[row] = len(tokens)
+        for token in tokens:
+            col = term_index.get(token)
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+    tf = np.zeros((len(users), len(terms)))
+    np.add.at(tf, (np.array(rows, dtype=int), np.array(cols, dtype=int)), 1)
+
+    n_docs = len(users)
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+    avg_length = max(doc_lengths.mean(), 1.0)
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths / avg_length)
+    bm25 = (idf * tf * (BM25_K1 + 1) / (tf + norm[:, None])).sum(axis=1)
+
+    followers = np.log1p(np.array([user.followers_count for user in users], dtype=float))
+    relevance = bm25 / bm25.max() if bm25.max() > 0 else bm25
+    reach = followers / followers.max() if followers.max() > 0 else followers
+
+    weight = settings.PRERANK_FOLLOWER_WEIGHT
+    return np.round(100 * ((1 - weight) * relevance + weight * reach), 2)
+
+
+def pre_rank(job_title: str, keywords: Sequence[str], users: Sequence[TwitterUser]) -> List[Tuple[TwitterUser, float]]:
+    """Users with their pre-rank score, best first (search order breaks ties)"""
+    scores = pre_rank_scores(job_title, keywords, users)
+    order = np.argsort(-scores, kind="stable")
+    return [(users[i], float(scores[i])) for i in order]
+
+
+def rank_correlation(a: Sequence[float], b: Sequence[float]) -> float:
+    """Spearman rank correlation (ties broken by position); 0.0 for fewer than 2 pairs"""
+    if len(a) < 2:
+        return 0.0
+    ranks_a = np.argsort(np.argsort(np.asarray(a, dtype=float), kind="stable"))
+    ranks_b = np.argsort(np.argsort(np.asarray(b, dtype=float), kind="stable"))
+    corr = np.corrcoef(ranks_a, ranks_b)[0, 1]
+    return 0.0 if np.isnan(corr) else round(float(corr), 3)
@@ -0,0 +1,151 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from typing import Dict, List, Mapping, Optional, Tuple
+from ..config.settings import settings
+
+# Request priorities (lower runs first)
+INTERACTIVE = 0
+BULK = 1
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request would have to wait longer than the allowed max wait"""
+
+
+class _Bucket:
+    """Token budget for one endpoint, learned from x-rate-limit-* headers"""
+
+    def __init__(self, endpoint: str, limit: int, window: float):
+        self.endpoint = endpoint
+        self.limit = limit
+        self.window = window
+        self.remaining = limit
+        self.reset_at: Optional[float] = None  # epoch seconds, from x-rate-limit-reset
+        self.next_slot_at = 0.0  # monotonic pacing gate for bulk requests
+        self.learned = False
+        self.throttled = 0
+        self.waiters: List[Tuple[int, int]] = []  # heap of (priority, seq)
+        self.condition = asyncio.Condition()
+
+    def refresh(self, now: float):
+        if self.reset_at is not None and now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = None
+            self.next_slot_at = 0.0
+
+    def reserve(self) -> int:
+        """Tokens bulk traffic must leave for interactive calls"""
+        return math.ceil(self.limit * settings.RATE_LIMIT_INTERACTIVE_RESERVE)
+
+    def wait_time(self, priority: int, now: float, monotonic_now: float) -> float:
+        """0 if a request of this priority may go now, else seconds until it might"""
+        floor = 0 if priority == INTERACTIVE else self.reserve()
+        if self.remaining <= floor:
+            return max(0.5, (self.reset_at - now) if self.reset_at else self.window / self.limit)
+        if priority != INTERACTIVE and monotonic_now < self.next_slot_at:
+            return self.next_slot_at - monotonic_now
+        return 0.0
+
+    def take(self, priority: int, now: float, monotonic_now: float):
+        self.remaining -= 1
+        # Pace bulk traffic once the budget runs low: spread what's left over the rest of the window
+        if priority != INTERACTIVE and self.reset_at and self.remaining < self.limit * settings.RATE_LIMIT_PACE_BELOW:
+            usable = max(1, self.remaining - self.reserve())
+            self.next_slot_at = monotonic_now + max(0.0, self.reset_at - now) / usable
+
+    def snapshot(self, now: float) -> Dict:
+        return {
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "resets_in": round(max(0.0, self.reset_at - now), 1) if self.reset_at else None,
+            "learned_from_headers": self.learned,
+            "queued": len(self.waiters),
+            "throttled_responses": self.throttled
+        }
+
+
+class TwitterRateLimiter:
+    """Per-endpoint token buckets that queue and pace requests to fit the rate-limit window.
+
+    Budgets start from a conservative default and are corrected from the
+    x-rate-limit-limit/remaining/reset headers on every response. Waiters are
+    served in priority order, and bulk scouting can't spend the last
+    RATE_LIMIT_INTERACTIVE_RESERVE of a window, so interactive lookups still
+    get through while a scout is draining the budget.
+    """
+
+    def __init__(self, default_limit: Optional[int] = None, window: Optional[float] = None):
+        self.default_limit = default_limit or settings.RATE_LIMIT_DEFAULT_LIMIT
+        self.window = window or settings.RATE_LIMIT_WINDOW
+        self._buckets: Dict[str, _Bucket] = {}
+        self._seq = itertools.count()
+
+    def _bucket(self, endpoint: str) -> _Bucket:
+        if endpoint not in self._buckets:
+            self._buckets[endpoint] = _Bucket(endpoint, self.default_limit, self.window)
+        return self._buckets[endpoint]
+
+    async def acquire(self, endpoint: str, priority: int = BULK, max_wait: Optional[float] = None):
+        """Wait for a token on `endpoint`; raises RateLimitExceeded past max_wait"""
+        bucket = self._bucket(endpoint)
+        max_wait = max_wait if max_wait is not None else settings.RATE_LIMIT_MAX_WAIT
+        deadline = time.monotonic() + max_wait
+        entry = (priority, next(self._seq))
+
+        async with bucket.condition:
+            heapq.heappush(bucket.waiters, entry)
+            try:
+                while True:
+                    now, monotonic_now = time.time(), time.monotonic()
+                    bucket.refresh(now)
+
+                    wait = bucket.wait_time(priority, now, monotonic_now)
+                    if bucket.waiters[0] == entry and wait == 0:
+                        bucket.take(priority, now, monotonic_now)
+                        return
+
+                    if monotonic_now + min(wait, 0.05) > deadline:
+                        raise RateLimitExceeded(
+                            f"{endpoint}: rate limit budget exhausted (resets in {wait:.0f}s)"
+                        )
+
+                    # Not our turn (or no token yet): sleep until woken or a token may be available
+                    timeout = min(wait, deadline - monotonic_now) if wait else deadline - monotonic_now
+                    try:
+                        await asyncio.wait_for(bucket.condition.wait(), timeout=max(0.01, timeout))
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                bucket.waiters.remove(entry)
+                heapq.heapify(bucket.waiters)
+                bucket.condition.notify_all()
+
+    async def update(self, endpoint: str, status_code: int, headers: Mapping[str, str]):
+        """Learn the real budget from a response's rate-limit headers"""
+        bucket = self._bucket(endpoint)
+        async with bucket.condition:
+            try:
+                if "x-rate-limit-limit" in headers:
+                    bucket.limit = int(headers["x-rate-limit-limit"])
+                if "x-rate-limit-remaining" in headers:
+                    bucket.remaining = int(headers["x-rate-limit-remaining"])
+                    bucket.learned = True
+                if "x-rate-limit-reset" in headers:
+                    bucket.reset_at = float(headers["x-rate-limit-reset"])
+            except ValueError:
+                pass
+
+            if status_code == 429:
+                bucket.throttled += 1
+                bucket.remaining = 0
+                if bucket.reset_at is None:
+                    bucket.reset_at = time.time() + bucket.window
+
+            bucket.condition.notify_all()
+
+    def snapshot(self) -> Dict:
+        now = time.time()
+        return {endpoint: bucket.snapshot(now) for endpoint, bucket in self._buckets.items()}
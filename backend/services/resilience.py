@@ -0,0 +1,129 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Dict, Optional
+import httpx
+from ..config.settings import settings
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the upstream while its circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Fails fast while an upstream is down.
+
+    Opens after `failure_threshold` consecutive failed calls (retries
+    exhausted), rejects calls for `recovery_timeout` seconds, then lets a
+    single trial call through (half-open) to decide whether to close again.
+    """
+
+    def __init__(self, name: str, failure_threshold: Optional[int] = None, recovery_timeout: Optional[float] = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.CIRCUIT_FAILURE_THRESHOLD
+        self.recovery_timeout = recovery_timeout if recovery_timeout is not None else settings.CIRCUIT_RECOVERY_TIMEOUT
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.recovery_timeout:
+            self.state = "half_open"
+            self._trial_in_flight = False
+
+        if self.state == "closed":
+            return True
+        if self.state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+
+    def release(self):
+        """End a call without a verdict (cancelled, or failed before reaching the upstream)"""
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                print(f"⚠ Circuit for {self.name} opened after {self.consecutive_failures} failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "rejected_calls": self.rejected,
+            "retry_in": round(max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at)), 1)
+            if self.state == "open" else None
+        }
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Full-jitter exponential backoff for the given (1-based) attempt"""
+    return random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+
+
+async def call_with_retries(
+    breaker: CircuitBreaker,
+    send: Callable[[], Awaitable[httpx.Response]],
+    max_attempts: Optional[int] = None,
+    base_delay: Optional[float] = None,
+    max_delay: Optional[float] = None,
+    final: Optional[Callable[[httpx.Response], bool]] = None
+) -> httpx.Response:
+    """Run `send` with bounded, jittered retries on 429/5xx/timeouts behind a circuit breaker.
+
+    Returns the first non-retryable response (or one `final` says not to
+    retry), or the last response once retries are exhausted; re-raises the
+    last transport error if no response was ever received.
+    """
+    max_attempts = max_attempts or settings.RETRY_MAX_ATTEMPTS
+    base_delay = base_delay if base_delay is not None else settings.RETRY_BASE_DELAY
+    max_delay = max_delay if max_delay is not None else settings.RETRY_MAX_DELAY
+
+    if not breaker.allow():
+        raise CircuitOpenError(f"{breaker.name} circuit is open; failing fast")
+
+    response = None
+    error = None
+    try:
+        for attempt in range(1, max_attempts + 1):
+            try:
+                response = await send()
+                error = None
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                response, error = None, e
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES or (final and final(response)):
+                    breaker.record_success()
+                    return response
+
+            if attempt < max_attempts:
+                reason = f"HTTP {response.status_code}" if response is not None else type(error).__name__
+                delay = backoff_delay(attempt, base_delay, max_delay)
+                print(f"{breaker.name} call failed ({reason}), retry {attempt}/{max_attempts - 1} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+    except BaseException:
+        # Cancelled (e.g. a caller's deadline) or a non-HTTP error: no verdict on the upstream,
+        # but a half-open trial must give its slot back or the breaker rejects every call after it
+        breaker.release()
+        raise
+
+    breaker.record_failure()
+    if error is not None:
+        raise error
+    return response
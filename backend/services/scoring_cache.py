@@ -0,0 +1,167 @@
+import asyncio
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+from ..config.settings import settings
+from ..models.schemas import GrokScoringResult, TwitterUser
+from .grok_service import SCORING_PROMPT_VERSION
+
+
+def default_cache_path(database_url: str) -> str:
+    """Put the cache file next to the Prisma SQLite DB (or in the working dir for other providers)"""
+    if database_url.startswith("file:"):
+        db_path = database_url[len("file:"):].split("?", 1)[0]
+        return os.path.join(os.path.dirname(db_path), "scoring_cache.db")
+    return "scoring_cache.db"
+
+
+def _normalize(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def follower_bucket(followers: int) -> int:
+    """Order-of-magnitude-ish bucket (half-decades) so small follower changes keep the same key"""
+    return int(math.log10(max(followers, 1)) * 2)
+
+
+def cache_key(job_title: str, user: TwitterUser, prompt_version: str) -> str:
+    fingerprint = json.dumps([
+        prompt_version,
+        _normalize(job_title),
+        _normalize(user.description),
+        follower_bucket(user.followers_count),
+        _normalize(user.recent_tweet)
+    ])
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+
+class ScoringCache:
+    """Persistent Grok score cache with TTL and LRU eviction.
+
+    Entries are keyed by a hash of the normalized job title, bio, follower
+    bucket, recent tweet and prompt version, so repeat and overlapping
+    searches skip the LLM. Each entry remembers what the original scoring
+    cost (latency and tokens) to report what hits saved.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        self.path = path or settings.SCORING_CACHE_PATH or default_cache_path(settings.DATABASE_URL)
+        self.ttl = ttl if ttl is not None else settings.SCORING_CACHE_TTL
+        self.max_entries = max_entries or settings.SCORING_CACHE_MAX_ENTRIES
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS scoring_cache (
+                key TEXT PRIMARY KEY,
+                score INTEGER NOT NULL,
+                reasoning TEXT NOT NULL,
+                latency_ms REAL NOT NULL DEFAULT 0,
+                tokens INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS scoring_cache_last_used ON scoring_cache (last_used_at)")
+        self._conn.commit()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saved_latency_ms = 0.0
+        self.saved_tokens = 0
+
+    def _get_many(self, keys: List[str]) -> Dict[str, tuple]:
+        now = time.time()
+        with self._lock:
+            placeholders = ",".join("?" * len(keys))
+            rows = self._conn.execute(
+                f"SELECT key, score, reasoning, latency_ms, tokens FROM scoring_cache "
+                f"WHERE key IN ({placeholders}) AND created_at >= ?",
+                [*keys, now - self.ttl]
+            ).fetchall()
+            found = {row[0]: row[1:] for row in rows}
+            if found:
+                self._conn.executemany(
+                    "UPDATE scoring_cache SET last_used_at = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+        return found
+
+    def _put_many(self, entries: List[tuple]):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO scoring_cache (key, score, reasoning, latency_ms, tokens, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(*entry, now, now) for entry in entries]
+            )
+            # Drop expired entries, then least-recently-used ones beyond max_entries
+            expired = self._conn.execute("DELETE FROM scoring_cache WHERE created_at < ?", (now - self.ttl,)).rowcount
+            count = self._conn.execute("SELECT COUNT(*) FROM scoring_cache").fetchone()[0]
+            overflow = max(0, count - self.max_entries)
+            if overflow:
+                self._conn.execute(
+                    "DELETE FROM scoring_cache WHERE key IN "
+                    "(SELECT key FROM scoring_cache ORDER BY last_used_at ASC LIMIT ?)",
+                    (overflow,)
+                )
+            self._conn.commit()
+            self.evictions += expired + overflow
+
+    async def get_many(self, job_title: str, users: List[TwitterUser]) -> List[Optional[GrokScoringResult]]:
+        """Cached result per user (None on miss), in input order"""
+        if not users:
+            return []
+        keys = [cache_key(job_title, user, SCORING_PROMPT_VERSION) for user in users]
+        found = await asyncio.to_thread(self._get_many, keys)
+
+        results = []
+        for key in keys:
+            row = found.get(key)
+            if row is None:
+                self.misses += 1
+                results.append(None)
+                continue
+            score, reasoning, latency_ms, tokens = row
+            self.hits += 1
+            self.saved_latency_ms += latency_ms
+            self.saved_tokens += tokens
+            results.append(GrokScoringResult(score=score, reasoning=reasoning))
+        return results
+
+    async def put_many(self, job_title: str, users: List[TwitterUser], results: List[GrokScoringResult]):
+        """Store scored results (unscored ones are never cached)"""
+        entries = [
+            (cache_key(job_title, user, SCORING_PROMPT_VERSION), result.score, result.reasoning,
+             result.latency_ms, result.tokens_used)
+            for user, result in zip(users, results) if result.scored
+        ]
+        if entries:
+            await asyncio.to_thread(self._put_many, entries)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM scoring_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "saved_latency_seconds": round(self.saved_latency_ms / 1000, 1),
+            "saved_tokens": self.saved_tokens
+        }
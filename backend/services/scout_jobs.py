@@ -0,0 +1,248 @@
+import asyncio
+import json
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, TYPE_CHECKING
+from ..config.settings import settings
+from ..models.schemas import ScoutJobResponse, ScoutRequest
+from .talent_service import TalentService
+
+if TYPE_CHECKING:
+    from .database import Database
+
+FINISHED_STATUSES = {"completed", "failed", "cancelled"}
+UNFINISHED_STATUSES = ["queued", "running"]
+
+
+class ScoutJobQueue:
+    """In-process queue that runs scouts in the background.
+
+    Job state lives in the ScoutJob table, so queued work survives a restart:
+    ``start()`` re-enqueues queued jobs. A running job is leased by the worker
+    that runs it (``workerId``, renewed through ``heartbeatAt``), so when
+    several processes share one database only jobs whose lease has expired
+    are taken over, never ones another live worker is still running. At most
+    ``concurrency`` scouts run at once; each takes a database pool slot per
+    query rather than holding one through its Twitter and Grok calls.
+    """
+
+    def __init__(self, talent_service: TalentService, database: "Database", concurrency: Optional[int] = None):
+        self.talent_service = talent_service
+        self.database = database
+        self.prisma = database.leased_client
+        self.concurrency = concurrency or settings.SCOUT_JOB_CONCURRENCY
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._workers: List[asyncio.Task] = []
+        self._lease_task: Optional[asyncio.Task] = None
+        self._running: Dict[str, asyncio.Task] = {}
+        self._leased: Set[str] = set()
+        self._cancel_requested: Set[str] = set()
+        self._lost: Set[str] = set()
+
+    async def start(self):
+        """Resume queued jobs and expired leases from the DB and start the workers"""
+        queued = await self.prisma.scoutjob.find_many(where={"status": "queued"}, order={"createdAt": "asc"})
+        for job in queued:
+            self._queue.put_nowait(job.id)
+        reclaimed = await self._reclaim_expired()
+        if queued or reclaimed:
+            print(f"Resuming {len(queued) + reclaimed} unfinished scout jobs")
+
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        self._lease_task = asyncio.create_task(self._lease_loop())
+
+    async def stop(self):
+        """Stop the workers; interrupted jobs are released back to the queue and resume on next start"""
+        if self._lease_task:
+            self._lease_task.cancel()
+        running = list(self._running.values())
+        for task in [*self._workers, *running]:
+            task.cancel()
+        await asyncio.gather(*self._workers, *running, *filter(None, [self._lease_task]), return_exceptions=True)
+        self._workers = []
+        self._lease_task = None
+
+    async def submit(self, request: ScoutRequest) -> ScoutJobResponse:
+        job = await self.prisma.scoutjob.create({"request": request.model_dump_json()})
+        self._queue.put_nowait(job.id)
+        return self._to_response(job)
+
+    async def get(self, job_id: str) -> Optional[ScoutJobResponse]:
+        job = await self.prisma.scoutjob.find_unique(where={"id": job_id})
+        return self._to_response(job) if job else None
+
+    async def cancel(self, job_id: str) -> Optional[ScoutJobResponse]:
+        """Cancel a queued or running job; finished jobs are returned unchanged"""
+        job = await self.prisma.scoutjob.find_unique(where={"id": job_id})
+        if not job or job.status in FINISHED_STATUSES:
+            return self._to_response(job) if job else None
+
+        task = self._running.get(job_id)
+        if task:
+            # The worker records the cancellation once the scout unwinds
+            self._cancel_requested.add(job_id)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        else:
+            # Queued, or running on another worker: that worker's next heartbeat sees it and stops
+            await self._finish(job_id, "cancelled")
+        return await self.get(job_id)
+
+    async def join(self):
+        """Wait until every job submitted so far has been processed"""
+        await self._queue.join()
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = await self.prisma.scoutjob.find_unique(where={"id": job_id})
+                if job and job.status == "queued":
+                    task = asyncio.create_task(self._run(job_id, ScoutRequest.model_validate_json(job.request)))
+                    self._running[job_id] = task
+                    await asyncio.gather(task, return_exceptions=True)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Scout job {job_id} worker error: {e}")
+            finally:
+                self._running.pop(job_id, None)
+                self._queue.task_done()
+
+    async def _run(self, job_id: str, request: ScoutRequest):
+        claimed = False
+        try:
+            # Conditional update so a cancel or another worker that raced the dequeue wins
+            now = datetime.now(timezone.utc)
+            claimed = bool(await self.prisma.scoutjob.update_many(
+                where={"id": job_id, "status": "queued"},
+                data={"status": "running", "startedAt": now, "workerId": self.worker_id, "heartbeatAt": now}
+            ))
+            if not claimed:
+                return
+            self._leased.add(job_id)
+            print(f"Starting scout job {job_id}: {request.job_title}")
+            progress = {}
+            async for event in self.talent_service.iter_scout_events(request):
+                if event["type"] == "candidate":
+                    continue
+                if event["type"] == "done":
+                    candidates = [candidate.model_dump() for candidate in event["candidates"]]
+                    await self._finish(job_id, "completed", result=json.dumps(candidates), where=self._owned(job_id))
+                    print(f"Scout job {job_id} completed with {len(candidates)} candidates")
+                    return
+
+                progress.update({key: value for key, value in event.items() if key != "type"})
+                progress["stage"] = event["type"]
+                await self.prisma.scoutjob.update_many(
+                    where=self._owned(job_id),
+                    data={"progress": json.dumps(progress), "heartbeatAt": datetime.now(timezone.utc)}
+                )
+        except asyncio.CancelledError:
+            if job_id in self._lost:
+                self._lost.discard(job_id)
+                return
+            if job_id in self._cancel_requested:
+                self._cancel_requested.discard(job_id)
+                # Cancelled before our claim landed: the row is still queued (or just claimed)
+                await self._finish(job_id, "cancelled", where=self._owned(job_id) if claimed else None)
+                print(f"Scout job {job_id} cancelled")
+                return
+            if not claimed:
+                raise  # shutting down before the claim: the job is still queued for the next start
+            # Shutting down: hand the job back so the next worker to start doesn't wait out the lease
+            await self.prisma.scoutjob.update_many(
+                where=self._owned(job_id),
+                data={"status": "queued", "startedAt": None, "workerId": None, "heartbeatAt": None}
+            )
+            raise
+        except Exception as e:
+            print(f"Scout job {job_id} failed: {e}")
+            # Failing before the claim (e.g. no pool slot for it) mustn't leave the job queued to rerun on restart,
+            # nor touch it if another worker claimed it meanwhile
+            await self._finish(job_id, "failed", error=str(e) or type(e).__name__,
+                               where=self._owned(job_id) if claimed else {"id": job_id, "status": "queued"})
+        finally:
+            self._leased.discard(job_id)
+
+    def _owned(self, job_id: str) -> Dict:
+        """Where-clause matching the job only while this worker still holds its lease"""
+        return {"id": job_id, "status": "running", "workerId": self.worker_id}
+
+    async def _lease_loop(self):
+        """Renew our leases and take over jobs whose worker stopped heartbeating"""
+        while True:
+            await asyncio.sleep(settings.SCOUT_JOB_LEASE_SECONDS / 3)
+            try:
+                await self._renew_leases()
+                await self._reclaim_expired()
+            except Exception as e:
+                print(f"Scout job lease renewal failed: {e}")
+
+    async def _renew_leases(self):
+        now = datetime.now(timezone.utc)
+        for job_id in list(self._leased):
+            renewed = await self.prisma.scoutjob.update_many(where=self._owned(job_id), data={"heartbeatAt": now})
+            task = self._running.get(job_id)
+            if not renewed and task and not task.done():
+                # Cancelled elsewhere, or taken over after our lease lapsed: stop spending on it
+                print(f"Scout job {job_id} lease lost; stopping")
+                self._lost.add(job_id)
+                task.cancel()
+
+    async def _reclaim_expired(self) -> int:
+        """Re-queue running jobs whose lease has expired (their worker died); returns how many"""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.SCOUT_JOB_LEASE_SECONDS)
+        expired = await self.prisma.scoutjob.find_many(
+            where={"status": "running", "OR": [{"heartbeatAt": None}, {"heartbeatAt": {"lt": cutoff}}]},
+            order={"createdAt": "asc"}
+        )
+        reclaimed = 0
+        for job in expired:
+            # Conditional on the lease we saw, so only one worker takes it over and a late heartbeat wins
+            claimed = await self.prisma.scoutjob.update_many(
+                where={"id": job.id, "status": "running", "workerId": job.workerId, "heartbeatAt": job.heartbeatAt},
+                data={"status": "queued", "startedAt": None, "workerId": None, "heartbeatAt": None}
+            )
+            if claimed:
+                print(f"Scout job {job.id} lease expired (worker {job.workerId}); re-queued")
+                self._queue.put_nowait(job.id)
+                reclaimed += 1
+        return reclaimed
+
+    async def _finish(
+        self,
+        job_id: str,
+        status: str,
+        result: Optional[str] = None,
+        error: Optional[str] = None,
+        where: Optional[Dict] = None
+    ):
+        """Record a job's outcome if `where` (default: the job, while unfinished) still matches.
+
+        A worker passes ``_owned(job_id)``, so it only records the outcome while
+        it still holds the lease and can't overwrite a cancel from another
+        process or a job another worker took over.
+        """
+        await self.prisma.scoutjob.update_many(
+            where=where or {"id": job_id, "status": {"in": UNFINISHED_STATUSES}},
+            data={"status": status, "result": result, "error": error, "finishedAt": datetime.now(timezone.utc)}
+        )
+
+    def _to_response(self, job) -> ScoutJobResponse:
+        request = ScoutRequest.model_validate_json(job.request)
+        return ScoutJobResponse(
+            id=job.id,
+            status=job.status,
+            job_title=request.job_title,
+            keywords=request.keywords,
+            progress=json.loads(job.progress) if job.progress else {},
+            candidates=json.loads(job.result) if job.result else None,
+            error=job.error,
+            created_at=job.createdAt.isoformat(),
+            started_at=job.startedAt.isoformat() if job.startedAt else None,
+            finished_at=job.finishedAt.isoformat() if job.finishedAt else None
+        )
@@ -0,0 +1,38 @@
+from typing import Dict, List, Optional
+from ..config.settings import settings
+
+
+def sqlite_connection_pragmas() -> List[str]:
+    """Per-connection pragmas of the configured profile (busy timeout is set through the URL).
+
+    Through Prisma these are best effort; see ``Database.apply_sqlite_profile``.
+    """
+    return [
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}",  # negative = KiB rather than pages
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+
+def sqlite_profile_pragmas(busy_timeout: Optional[float] = None) -> List[str]:
+    """Every pragma of the profile, for a client that owns its connection (scripts, sqlite3)"""
+    timeout = settings.SQLITE_BUSY_TIMEOUT if busy_timeout is None else busy_timeout
+    return [
+        f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA busy_timeout={int(timeout * 1000)}",
+        *sqlite_connection_pragmas(),
+    ]
+
+
+# wal_checkpoint(PASSIVE) never blocks readers or the writer; optimize refreshes
+# planner stats only for tables whose shape changed enough to matter
+MAINTENANCE_PRAGMAS = ["PRAGMA wal_checkpoint(PASSIVE)", "PRAGMA optimize"]
+
+
+def parse_checkpoint(rows: List[Dict]) -> Dict:
+    """wal_checkpoint returns (busy, log, checkpointed) as one row"""
+    if not rows:
+        return {}
+    values = list(rows[0].values())
+    return {"busy": bool(values[0]), "wal_frames": values[1], "checkpointed_frames": values[2]}
@@ -1,216 +1,518 @@
-from typing import List, Optional
-from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, TYPE_CHECKING
+from datetime import datetime, timedelta, timezone
+import asyncio
+import base64
 import json
-from prisma import Prisma
 from .twitter_service import TwitterService
 from .grok_service import GrokService
 from .calendar_service import CalendarService
-from ..config.settings import settings
+from .candidate_search import SEARCH_HITS_PER_RESULT, SQL, group_hits, match_query
+from .keyword_matcher import INTENT_MATCHER, skill_tags
+from .pre_ranker import pre_rank, rank_correlation
+from .rate_limiter import INTERACTIVE
+from ..config.settings import database_provider, settings
 from ..models.schemas import (
-    ScoutRequest, CandidateResponse, DetailedCandidateResponse,
+    ScoutRequest, CandidateResponse, DetailedCandidateResponse, TwitterUser,
     TweetResponse, NotificationRequest, NotificationResponse,
-    SendMessageRequest, MessageResponse, CreateEventRequest, EventResponse
+    SendMessageRequest, MessageResponse, CreateEventRequest, EventResponse,
+    CandidateSearchResult, SearchSnippet
 )
 
+if TYPE_CHECKING:
+    from prisma import Prisma
+
+
+def _snowflake_key(tweet_id: str) -> tuple:
+    """Sort key for tweet IDs: snowflakes grow over time, but are stored as strings"""
+    return len(tweet_id), tweet_id
+
+
 class TalentService:
-    def __init__(self):
-        self.twitter_service = TwitterService()
-        self.grok_service = GrokService()
-        self.calendar_service = CalendarService()
-        self.prisma = Prisma()
+    def __init__(
+        self,
+        prisma: Optional["Prisma"] = None,
+        twitter_service: Optional[TwitterService] = None,
+        grok_service: Optional[GrokService] = None,
+        calendar_service: Optional[CalendarService] = None,
+        provider: Optional[str] = None
+    ):
+        # The API passes in the shared services from its ServiceContainer;
+        # standalone scripts (seed.py) get their own instances
+        if prisma is None:
+            from prisma import Prisma
+            prisma = Prisma()
+
+        self.prisma = prisma
+        self.twitter_service = twitter_service or TwitterService()
+        self.grok_service = grok_service or GrokService()
+        self.calendar_service = calendar_service or CalendarService()
+        # Raw SQL (full-text search) differs between SQLite and PostgreSQL
+        self.provider = provider or database_provider(settings.DATABASE_URL)
 
     async def scout_talent(self, request: ScoutRequest) -> List[CandidateResponse]:
         """Main talent scouting function"""
+        # Nobody watches intermediate events here, so save everything in one transaction
+        async for event in self.iter_scout_events(request, persist_batch_size=0):
+            if event["type"] == "done":
+                return event["candidates"]
+        return []
+
+    async def iter_scout_events(self, request: ScoutRequest, persist_batch_size: Optional[int] = None) -> AsyncIterator[Dict]:
+        """Run the scouting pipeline, yielding progress events as it goes.
+
+        Events: "search" (candidates found), "enriched", "scored" (running
+        count), "candidate" (each CandidateResponse once its batch is
+        persisted) and a final "done" with the ranked top 10. Scored
+        candidates are saved in transactions of `persist_batch_size`
+        (default SCOUT_PERSIST_BATCH_SIZE; 0 saves everything at the end).
+        """
+        if persist_batch_size is None:
+            persist_batch_size = settings.SCOUT_PERSIST_BATCH_SIZE
 
         # 1. Search Twitter for users with enhanced query and pre-filtering
         print(f"Searching for candidates with keywords: {request.keywords}")
         users = await self.twitter_service.search_users(
             request.keywords,
             job_title=request.job_title,
-            max_results=100
+            max_results=100,
+            target=max(settings.PRERANK_POOL_SIZE, settings.PRERANK_TOP_K)
         )
 
         if not users:
-            return []
+            yield {"type": "search", "found": 0, "selected": 0}
+            yield {"type": "done", "candidates": []}
+            return
 
         print(f"Found {len(users)} potential candidates")
 
-        # 2. Get recent tweets for candidates (limit to first N)
-        limited_users = users[:settings.MAX_CANDIDATES_PER_SEARCH]
-
-        # Fetch detailed tweets for each user (for storing in DB)
-        user_tweets_map = {}
-        for user in limited_users:
-            user.recent_tweet = await self.twitter_service.get_recent_tweet(user.id)
-            # Also fetch detailed tweets for storing
-            tweets = await self.twitter_service.get_recent_tweets_detailed(user.id, max_count=5)
-            user_tweets_map[user.id] = tweets
+        # 2. Cheap local pre-rank; only the top K go on to enrichment and Grok
+        limited_users = []
+        for user, pre_rank_score in pre_rank(request.job_title, request.keywords, users)[:settings.PRERANK_TOP_K]:
+            user.pre_rank_score = pre_rank_score
+            limited_users.append(user)
+        print(f"Pre-ranked {len(users)} candidates, sending top {len(limited_users)} to Grok")
+        yield {"type": "search", "found": len(users), "selected": len(limited_users)}
 
-        # 3. Create search session
-        session = await self.prisma.searchsession.create({
-            "jobTitle": request.job_title,
-            "keywords": ",".join(request.keywords)
-        })
+        # Fetch detailed tweets for each user concurrently (stored in DB, snippet used for scoring)
+        user_tweets_map = await self._enrich_candidates(limited_users)
+        yield {"type": "enriched", "count": len(limited_users)}
 
-        # 4. Score candidates with Grok (in parallel batches)
+        # 3. Score candidates with Grok, saving them in batched transactions as scores arrive
         print(f"Scoring {len(limited_users)} candidates in parallel...")
-        scoring_results = await self.grok_service.score_candidates_batch(request.job_title, limited_users, batch_size=5)
-
-        # 5. Save all candidates and results
+        session_id = None
+        pending = []
         results = []
-        for user, scoring_result in zip(limited_users, scoring_results):
-            print(f"Saving candidate: {user.username} (score: {scoring_result.score})")
+        async for index, scoring_result in self.grok_service.iter_scores(request.job_title, limited_users):
+            user = limited_users[index]
+            pending.append((user, scoring_result, user_tweets_map.get(user.id)))
+            yield {"type": "scored", "count": len(results) + len(pending), "total": len(limited_users)}
+
+            if persist_batch_size and len(pending) >= persist_batch_size:
+                session_id, saved = await self._persist_scout_batch(request, session_id, pending)
+                pending = []
+                results.extend(saved)
+                for result in saved:
+                    yield {"type": "candidate", "candidate": self._format_scout_result(result, request.job_title)}
+
+        if pending:
+            session_id, saved = await self._persist_scout_batch(request, session_id, pending)
+            results.extend(saved)
+            for result in saved:
+                yield {"type": "candidate", "candidate": self._format_scout_result(result, request.job_title)}
+
+        # 4. Sort by score (unscored last) and return top 10
+        results.sort(key=lambda x: (x["scored"], x["score"]), reverse=True)
+        yield {
+            "type": "done",
+            "candidates": [self._format_scout_result(result, request.job_title) for result in results[:10]]
+        }
 
-            # Set pipeline stage based on match score
-            # >= 75%: Qualified (strong match)
-            # < 75%: Discovered (needs review)
-            initial_pipeline_stage = "Qualified" if scoring_result.score >= 75 else "Discovered"
+    async def _persist_scout_batch(self, request: ScoutRequest, session_id: Optional[int], items: List[tuple]) -> tuple:
+        """Save scored candidates, their skill tags, tweets and search results in one transaction.
+
+        `items` are (user, scoring_result, tweets) tuples. The search session
+        is created with the first batch. Writes go out as two batched
+        requests around a single read of the candidate rows, instead of
+        several awaited statements per candidate.
+        """
+        print(f"Saving {len(items)} candidates: " + ", ".join(
+            f"{user.username} ({result.score if result.scored else 'unscored'})" for user, result, _ in items
+        ))
+        handles = [user.username for user, _, _ in items]
+
+        async with self.prisma.tx() as tx:
+            if session_id is None:
+                session = await tx.searchsession.create({
+                    "jobTitle": request.job_title,
+                    "keywords": ",".join(request.keywords)
+                })
+                session_id = session.id
 
-            # Save candidate to database
-            candidate = await self.prisma.candidate.upsert(
-                where={"handle": user.username},
-                data={
-                    "create": {
-                        "handle": user.username,
-                        "twitterId": user.id,
-                        "name": user.name,
-                        "bio": user.description,
-                        "followers": user.followers_count,
-                        "following": user.following_count,
-                        "avatar": user.profile_image_url,
-                        "headerImage": user.profile_banner_url or None,
-                        "recentTweet": user.recent_tweet,
-                        "pipelineStage": initial_pipeline_stage
-                    },
-                    "update": {
-                        "twitterId": user.id,
-                        "name": user.name,
-                        "bio": user.description,
-                        "followers": user.followers_count,
-                        "following": user.following_count,
-                        "avatar": user.profile_image_url,
-                        "headerImage": user.profile_banner_url or None,
-                        "recentTweet": user.recent_tweet
-                        # Don't update pipelineStage on update - preserve manual changes
-                    }
-                }
-            )
+            async with tx.batch_() as batch:
+                for user, scoring_result, tweets in items:
+                    batch.candidate.upsert(
+                        where={"handle": user.username},
+                        data=self._candidate_upsert_data(user, scoring_result, tweets)
+                    )
 
-            # Save tweets to database
-            if user.id in user_tweets_map and user_tweets_map[user.id]:
-                # Delete old tweets for this candidate first
-                await self.prisma.tweet.delete_many(where={"candidateId": candidate.id})
+            # Stored tweets come back with the candidates so the timeline sync needs no extra read
+            candidates = {
+                candidate.handle: candidate
+                for candidate in await tx.candidate.find_many(
+                    where={"handle": {"in": handles}},
+                    include={"tweets": any(tweets for _, _, tweets in items)}
+                )
+            }
+
+            tags_by_handle = {user.username: skill_tags(user.description) for user, _, _ in items}
+            skill_rows = [
+                {"candidateId": candidates[handle].id, "skill": tag, "position": i}
+                for handle, tags in tags_by_handle.items()
+                for i, tag in enumerate(tags)
+            ]
+            tweet_rows, tweet_updates, stale_tweet_ids = self._sync_tweet_rows(candidates, items)
+            # Unscored candidates get no search result, so no fake score is persisted
+            result_rows = [
+                {
+                    "score": scoring_result.score,
+                    "reasoning": scoring_result.reasoning,
+                    "preRankScore": user.pre_rank_score,
+                    "candidateId": candidates[user.username].id,
+                    "sessionId": session_id
+                }
+                for user, scoring_result, _ in items if scoring_result.scored
+            ]
 
-                # Save new tweets
-                for tweet in user_tweets_map[user.id]:
-                    await self.prisma.tweet.create({
+            async with tx.batch_() as batch:
+                batch.candidateskill.delete_many(where={"candidateId": {"in": [c.id for c in candidates.values()]}})
+                if skill_rows:
+                    batch.candidateskill.create_many(data=skill_rows)
+                if tweet_rows:
+                    batch.tweet.create_many(data=tweet_rows)
+                for tweet_id, metrics in tweet_updates:
+                    batch.tweet.update(where={"id": tweet_id}, data=metrics)
+                if stale_tweet_ids:
+                    batch.tweet.delete_many(where={"id": {"in": stale_tweet_ids}})
+                if result_rows:
+                    batch.searchresult.create_many(data=result_rows)
+                    # Keep the denormalized best score in step; the guard makes it safe against concurrent scouts
+                    for row in result_rows:
+                        batch.candidate.update_many(
+                            where={
+                                "id": row["candidateId"],
+                                "OR": [{"bestScore": None}, {"bestScore": {"lt": row["score"]}}]
+                            },
+                            data={
+                                "bestScore": row["score"],
+                                "bestReasoning": row["reasoning"],
+                                "bestJobTitle": request.job_title
+                            }
+                        )
+
+        results = [
+            {
+                "candidate": candidates[user.username],
+                "tags": tags_by_handle[user.username],
+                "score": scoring_result.score if scoring_result.scored else 0,
+                "scored": scoring_result.scored,
+                "reasoning": scoring_result.reasoning
+            }
+            for user, scoring_result, _ in items
+        ]
+        return session_id, results
+
+    @staticmethod
+    def _sync_tweet_rows(candidates: Dict, items: List[tuple]) -> tuple:
+        """Merge fetched timelines into the stored ones (candidates fetched with include tweets).
+
+        Returns (rows to create, (id, metrics) updates for tweets we already
+        have, ids of stored tweets beyond TWEETS_RETAINED_PER_CANDIDATE).
+        """
+        rows, updates, stale = [], [], []
+        for user, _, tweets in items:
+            if not tweets:
+                continue
+            candidate = candidates[user.username]
+            stored = {tweet.tweetId: tweet for tweet in candidate.tweets or []}
+            for tweet in tweets:
+                metrics = {"likes": tweet["likes"], "retweets": tweet["retweets"], "replies": tweet["replies"]}
+                existing = stored.get(tweet["id"])
+                if existing is None:
+                    rows.append({
                         "tweetId": tweet["id"],
                         "content": tweet["content"],
-                        "likes": tweet["likes"],
-                        "retweets": tweet["retweets"],
-                        "replies": tweet["replies"],
                         "createdAt": tweet["created_at"],
-                        "candidateId": candidate.id
+                        "candidateId": candidate.id,
+                        **metrics
                     })
+                elif any(getattr(existing, key) != value for key, value in metrics.items()):
+                    updates.append((existing.id, metrics))
 
-            # Save search result
-            await self.prisma.searchresult.create({
-                "score": scoring_result.score,
-                "reasoning": scoring_result.reasoning,
-                "candidateId": candidate.id,
-                "sessionId": session.id
-            })
+            kept = sorted({*stored, *(tweet["id"] for tweet in tweets)}, key=_snowflake_key, reverse=True)
+            stale.extend(
+                stored[tweet_id].id
+                for tweet_id in kept[settings.TWEETS_RETAINED_PER_CANDIDATE:] if tweet_id in stored
+            )
+        return rows, updates, stale
+
+    @staticmethod
+    def _candidate_upsert_data(user: TwitterUser, scoring_result, tweets: Optional[List[dict]] = None) -> Dict:
+        # Set pipeline stage based on match score
+        # >= 75%: Qualified (strong match)
+        # < 75% or unscored: Discovered (needs review)
+        initial_pipeline_stage = "Qualified" if scoring_result.scored and scoring_result.score >= 75 else "Discovered"
+
+        profile = {
+            "twitterId": user.id,
+            "name": user.name,
+            "bio": user.description,
+            "followers": user.followers_count,
+            "following": user.following_count,
+            "avatar": user.profile_image_url,
+            "headerImage": user.profile_banner_url or None,
+            "recentTweet": user.recent_tweet
+        }
+        if tweets:
+            # Timelines come back newest first, and since_id only returns newer tweets
+            profile["lastTweetId"] = max((tweet["id"] for tweet in tweets), key=_snowflake_key)
+        if user.tweets_refreshed:
+            profile["tweetsRefreshedAt"] = datetime.now(timezone.utc)
+        return {
+            "create": {"handle": user.username, **profile, "pipelineStage": initial_pipeline_stage},
+            # Don't update pipelineStage on update - preserve manual changes
+            "update": profile
+        }
 
-            results.append({
-                "candidate": candidate,
-                "score": scoring_result.score,
-                "reasoning": scoring_result.reasoning
-            })
+    def _format_scout_result(self, result: Dict, job_title: str) -> CandidateResponse:
+        candidate = result["candidate"]
+        found_skills = result["tags"]
 
-        # 5. Sort by score and return top 10
-        results.sort(key=lambda x: x["score"], reverse=True)
-        top_results = results[:10]
+        return CandidateResponse(
+            id=str(candidate.id),
+            name=candidate.name or candidate.handle,
+            handle=f"@{candidate.handle}",
+            avatar=candidate.avatar or "https://via.placeholder.com/100",
+            bio=candidate.bio or "No bio available",
+            followers=self._format_number(candidate.followers or 0),
+            following=self._format_number(candidate.following or 0),
+            match=result["score"],
+            tags=found_skills[:4] if found_skills else ["Developer"],
+            recent_post=candidate.recentTweet or "No recent posts",
+            roles=[job_title],
+            pipeline_stage=candidate.pipelineStage,
+            scored=result["scored"]
+        )
 
-        # 6. Format for response
-        response_data = []
-        for result in top_results:
-            candidate = result["candidate"]
+    async def pre_rank_agreement(self, limit: int = 1000) -> Dict:
+        """How well local pre-rank scores agree with Grok scores over recent search results"""
+        results = await self.prisma.searchresult.find_many(
+            where={"preRankScore": {"not": None}},
+            order={"id": "desc"},
+            take=limit
+        )
+        by_session: Dict[int, List] = {}
+        for result in results:
+            by_session.setdefault(result.sessionId, []).append(result)
+
+        # Pre-rank scores are relative to their batch, so correlate within each session
+        session_correlations = [
+            rank_correlation([r.preRankScore for r in session], [r.score for r in session])
+            for session in by_session.values() if len(session) >= 3
+        ]
+        return {
+            "results": len(results),
+            "sessions": len(session_correlations),
+            "spearman_overall": rank_correlation([r.preRankScore for r in results], [r.score for r in results]),
+            "spearman_mean_per_session": round(sum(session_correlations) / len(session_correlations), 3)
+            if session_correlations else None
+        }
 
-            # Extract skills from bio
-            bio_lower = candidate.bio.lower() if candidate.bio else ""
-            common_skills = ["python", "javascript", "react", "node", "aws", "docker", "kubernetes", "typescript", "go", "rust"]
-            found_skills = [skill for skill in common_skills if skill in bio_lower]
+    async def _store_skill_tags(self, candidate_id: int, bio: Optional[str]) -> List[str]:
+        """Extract skill tags once at ingest and replace the candidate's stored tags"""
+        tags = skill_tags(bio)
+        # One batch (a single transaction), so a failure or a concurrent scout can't leave the tags half replaced
+        async with self.prisma.batch_() as batch:
+            batch.candidateskill.delete_many(where={"candidateId": candidate_id})
+            if tags:
+                batch.candidateskill.create_many(
+                    data=[{"candidateId": candidate_id, "skill": tag, "position": i} for i, tag in enumerate(tags)]
+                )
+        return tags
+
+    @staticmethod
+    def _stored_tags(candidate) -> List[str]:
+        """Skill tags stored at ingest (candidate fetched with include skills)"""
+        return [skill.skill for skill in sorted(candidate.skills or [], key=lambda skill: skill.position)]
+
+    async def _enrich_candidates(self, users: List[TwitterUser]) -> Dict[str, List[dict]]:
+        """Enrichment stage: one timeline fetch per user, fanned out under a semaphore.
+
+        Candidates we already store are synced incrementally: the fetch asks
+        only for tweets newer than their lastTweetId, and if nothing is new
+        the stored recent tweet is reused. Incremental fetches never return
+        tweets we already have, so once tweetsRefreshedAt is older than
+        TWEET_METRICS_REFRESH_INTERVAL the whole retained window is fetched
+        instead and the stored tweets' engagement metrics are updated.
+        Per-host caps are enforced by the shared HTTP client; each fetch also
+        gets its own deadline so one slow timeline can't stall the scout.
+        """
+        semaphore = asyncio.Semaphore(settings.ENRICHMENT_CONCURRENCY)
+        known = {
+            candidate.handle: candidate
+            for candidate in await self.prisma.candidate.find_many(
+                where={"handle": {"in": [user.username for user in users]}}
+            )
+        }
+        # Prisma hands DateTime columns back as UTC-aware datetimes
+        refresh_before = datetime.now(timezone.utc) - timedelta(seconds=settings.TWEET_METRICS_REFRESH_INTERVAL)
+
+        async def enrich(user: TwitterUser) -> List[dict]:
+            stored = known.get(user.username)
+            since_id, max_count = None, settings.MAX_TWEETS_PER_USER
+            if stored and stored.lastTweetId and stored.tweetsRefreshedAt and stored.tweetsRefreshedAt > refresh_before:
+                since_id = stored.lastTweetId
+            elif stored:
+                # Full refresh: cover the stored window so every kept tweet gets fresh metrics
+                max_count = max(max_count, settings.TWEETS_RETAINED_PER_CANDIDATE)
+            async with semaphore:
+                try:
+                    tweets = await asyncio.wait_for(
+                        self.twitter_service.get_recent_tweets_detailed(user.id, max_count=max_count, since_id=since_id),
+                        timeout=settings.ENRICHMENT_CALL_TIMEOUT
+                    )
+                except asyncio.TimeoutError:
+                    print(f"Timed out fetching tweets for @{user.username}")
+                    return []
+            # An empty full fetch may be an API error, so don't let it postpone the next refresh
+            user.tweets_refreshed = since_id is None and bool(tweets)
+            return tweets
 
-            response_data.append(CandidateResponse(
-                id=str(candidate.id),
-                name=candidate.name or candidate.handle,
-                handle=f"@{candidate.handle}",
-                avatar=candidate.avatar or "https://via.placeholder.com/100",
-                bio=candidate.bio or "No bio available",
-                followers=self._format_number(candidate.followers or 0),
-                following=self._format_number(candidate.following or 0),
-                match=result["score"],
-                tags=found_skills[:4] if found_skills else ["Developer"],
-                recent_post=candidate.recentTweet or "No recent posts",
-                roles=[request.job_title],
-                pipeline_stage=candidate.pipelineStage
-            ))
+        print(f"Enriching {len(users)} candidates (concurrency {settings.ENRICHMENT_CONCURRENCY}, {len(known)} already stored)...")
+        all_tweets = await asyncio.gather(*[enrich(user) for user in users])
 
-        return response_data
+        user_tweets_map = {}
+        for user, tweets in zip(users, all_tweets):
+            stored = known.get(user.username)
+            if not tweets and stored and stored.recentTweet:
+                user.recent_tweet = stored.recentTweet
+            else:
+                user.recent_tweet = self.twitter_service.recent_tweet_snippet(tweets)
+            user_tweets_map[user.id] = tweets
 
-    async def get_all_candidates(self) -> List[CandidateResponse]:
-        """Get all candidates from the database with their highest scores"""
+        return user_tweets_map
+
+    async def list_candidates(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        stage: Optional[str] = None,
+        min_score: Optional[int] = None,
+        skill: Optional[str] = None,
+        job_title: Optional[str] = None,
+        with_tags: bool = True
+    ) -> tuple:
+        """Scored candidates ordered by best score, filtered and paginated in the database.
+
+        Pages are keyset-paginated on (bestScore desc, id asc): `cursor` is the
+        opaque value returned for the previous page. Returns (candidates,
+        next_cursor), with next_cursor None on the last page. Raises
+        ValueError for a malformed cursor.
+        """
+        # Best score per candidate is denormalized onto Candidate, so this is one indexed query
+        where: Dict = {"bestScore": {"not": None}}
+        if stage:
+            where["pipelineStage"] = stage
+        if min_score is not None:
+            where["bestScore"]["gte"] = min_score
+        if skill:
+            where["skills"] = {"some": {"skill": skill.lower()}}
+        if job_title:
+            where["bestJobTitle"] = job_title
+        if cursor:
+            after_score, after_id = self._decode_cursor(cursor)
+            # The lte bound is implied by the OR, but lets the planner walk one index range instead of merging two
+            where["bestScore"]["lte"] = after_score
+            where["OR"] = [
+                {"bestScore": {"lt": after_score}},
+                {"bestScore": after_score, "id": {"gt": after_id}}
+            ]
 
-        # Get all search results with candidates, ordered by score
-        search_results = await self.prisma.searchresult.find_many(
-            include={
-                "candidate": True,
-                "session": True
-            },
-            order=[{"score": "desc"}]
+        candidates = await self.prisma.candidate.find_many(
+            where=where,
+            include={"skills": True} if with_tags else None,
+            order=[{"bestScore": "desc"}, {"id": "asc"}],
+            # One extra row tells us whether there is another page
+            take=limit + 1 if limit else None
         )
 
-        # Group by candidate to get their best score
-        candidate_map = {}
-        for result in search_results:
-            candidate_id = result.candidate.id
-
-            if candidate_id not in candidate_map or result.score > candidate_map[candidate_id]["score"]:
-                candidate_map[candidate_id] = {
-                    "candidate": result.candidate,
-                    "score": result.score,
-                    "reasoning": result.reasoning,
-                    "job_title": result.session.jobTitle
-                }
+        next_cursor = None
+        if limit and len(candidates) > limit:
+            candidates = candidates[:limit]
+            next_cursor = self._encode_cursor(candidates[-1].bestScore, candidates[-1].id)
 
-        # Format for response
-        response_data = []
-        for result in candidate_map.values():
-            candidate = result["candidate"]
+        response_data = [self._stored_candidate_response(candidate, with_tags) for candidate in candidates]
 
-            # Extract skills from bio
-            bio_lower = candidate.bio.lower() if candidate.bio else ""
-            common_skills = ["python", "javascript", "react", "node", "aws", "docker", "kubernetes", "typescript", "go", "rust"]
-            found_skills = [skill for skill in common_skills if skill in bio_lower]
+        return response_data, next_cursor
 
-            response_data.append(CandidateResponse(
-                id=str(candidate.id),
-                name=candidate.name or candidate.handle,
-                handle=f"@{candidate.handle}",
-                avatar=candidate.avatar or "https://via.placeholder.com/100",
-                bio=candidate.bio or "No bio available",
-                followers=self._format_number(candidate.followers or 0),
-                following=self._format_number(candidate.following or 0),
-                match=result["score"],
-                tags=found_skills[:4] if found_skills else ["Developer"],
-                recent_post=candidate.recentTweet or "No recent posts",
-                roles=[result["job_title"]],
-                pipeline_stage=candidate.pipelineStage
-            ))
+    def _stored_candidate_response(self, candidate, with_tags: bool = True) -> CandidateResponse:
+        """A stored candidate as returned by the list and search endpoints"""
+        found_skills = self._stored_tags(candidate) if with_tags else []
+        return CandidateResponse(
+            id=str(candidate.id),
+            name=candidate.name or candidate.handle,
+            handle=f"@{candidate.handle}",
+            avatar=candidate.avatar or "https://via.placeholder.com/100",
+            bio=candidate.bio or "No bio available",
+            followers=self._format_number(candidate.followers or 0),
+            following=self._format_number(candidate.following or 0),
+            match=candidate.bestScore or 0,
+            tags=found_skills[:4] if found_skills else ["Developer"],
+            recent_post=candidate.recentTweet or "No recent posts",
+            roles=[candidate.bestJobTitle or "Developer"],
+            pipeline_stage=candidate.pipelineStage,
+            scored=candidate.bestScore is not None
+        )
+
+    async def search_candidates(self, q: str, limit: int = 20) -> List[CandidateSearchResult]:
+        """Full-text search of the stored pool over bios, stored tweets and Grok reasoning.
+
+        Ranked by the best matching document per source, summed, so a candidate
+        whose bio and tweets both match beats one with a single strong tweet.
+        """
+        query = match_query(q, self.provider)
+        if not query:
+            return []
+        rows = await self.prisma.query_raw(SQL[self.provider]["search"], query, limit * SEARCH_HITS_PER_RESULT)
+        hits = group_hits(rows, limit)
+        if not hits:
+            return []
+
+        candidates = await self.prisma.candidate.find_many(
+            where={"id": {"in": [hit["candidate_id"] for hit in hits]}},
+            include={"skills": True}
+        )
+        by_id = {candidate.id: candidate for candidate in candidates}
+        return [
+            CandidateSearchResult(
+                candidate=self._stored_candidate_response(by_id[hit["candidate_id"]]),
+                score=hit["score"],
+                snippets=[SearchSnippet(**snippet) for snippet in hit["snippets"]]
+            )
+            # A candidate deleted between the two reads just drops out
+            for hit in hits if hit["candidate_id"] in by_id
+        ]
+
+    @staticmethod
+    def _encode_cursor(score: int, candidate_id: int) -> str:
+        return base64.urlsafe_b64encode(f"{score}:{candidate_id}".encode()).decode().rstrip("=")
 
-        # Sort by score and return
-        response_data.sort(key=lambda x: x.match, reverse=True)
-        return response_data
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple:
+        try:
+            score, candidate_id = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode().split(":")
+            return int(score), int(candidate_id)
+        except (ValueError, UnicodeDecodeError):
+            raise ValueError("Invalid cursor")
 
     def _format_number(self, num: int) -> str:
         if num >= 1000000:
@@ -223,16 +525,13 @@ class TalentService:
     async def get_candidate_profile(self, candidate_id: int) -> Optional[DetailedCandidateResponse]:
         """Get detailed candidate profile with tweets and AI insights"""
 
-        # Get candidate with their best search result and tweets from database
+        # Get candidate (best search result is denormalized onto it) and tweets from database
         candidate = await self.prisma.candidate.find_unique(
             where={"id": candidate_id},
             include={
-                "searches": {
-                    "include": {"session": True},
-                    "order_by": [{"score": "desc"}],
-                    "take": 1
-                },
-                "tweets": True  # Include tweets from database
+                # Newest stored tweets (timelines are synced incrementally, so more may be kept)
+                "tweets": {"order_by": {"createdAt": "desc"}, "take": settings.MAX_TWEETS_PER_USER},
+                "skills": True
             }
         )
 
@@ -240,13 +539,12 @@ class TalentService:
             return None
 
         # Handle candidates with and without search results (manually looked up vs. searched)
-        has_search_results = candidate.searches and len(candidate.searches) > 0
+        has_search_results = candidate.bestScore is not None
 
         if has_search_results:
-            best_result = candidate.searches[0]
-            match_score = best_result.score
-            job_title = best_result.session.jobTitle
-            reasoning = best_result.reasoning
+            match_score = candidate.bestScore
+            job_title = candidate.bestJobTitle
+            reasoning = candidate.bestReasoning
         else:
             # Manually looked up candidate - use defaults
             match_score = 50
@@ -276,10 +574,7 @@ class TalentService:
                 created_at=datetime.now().isoformat()
             ))
 
-        # Extract skills from bio
-        bio_lower = candidate.bio.lower() if candidate.bio else ""
-        common_skills = ["python", "javascript", "react", "node", "aws", "docker", "kubernetes", "typescript", "go", "rust", "vue", "angular", "postgresql", "mongodb"]
-        found_skills = [skill.title() for skill in common_skills if skill in bio_lower]
+        found_skills = [skill.title() for skill in self._stored_tags(candidate)]
 
         # Parse AI reasoning into insights
         insights = []
@@ -425,27 +720,18 @@ class TalentService:
             # First check if user already exists in database
             clean_username = username.lstrip('@')
             existing = await self.prisma.candidate.find_first(
-                where={"handle": clean_username}
+                where={"handle": clean_username},
+                include={"skills": True}
             )
 
             if existing:
                 print(f"User @{clean_username} already exists in database")
                 # Return existing candidate
-                bio_lower = existing.bio.lower() if existing.bio else ""
-                common_skills = ["python", "javascript", "react", "node", "aws", "docker", "kubernetes", "typescript", "go", "rust"]
-                found_skills = [skill for skill in common_skills if skill in bio_lower]
-
-                # Get their best score from search results
-                best_score = 50  # default
-                best_role = "Developer"
-                search_result = await self.prisma.searchresult.find_first(
-                    where={"candidateId": existing.id},
-                    include={"session": True},
-                    order=[{"score": "desc"}]
-                )
-                if search_result:
-                    best_score = search_result.score
-                    best_role = search_result.session.jobTitle
+                found_skills = self._stored_tags(existing)
+
+                # Their best score from search results (default for manual lookups)
+                best_score = existing.bestScore if existing.bestScore is not None else 50
+                best_role = existing.bestJobTitle or "Developer"
 
                 return CandidateResponse(
                     id=str(existing.id),
@@ -469,7 +755,7 @@ class TalentService:
                 return None
 
             # Get recent tweet
-            recent_tweet = await self.twitter_service.get_recent_tweet(twitter_user.id)
+            recent_tweet = await self.twitter_service.get_recent_tweet(twitter_user.id, priority=INTERACTIVE)
 
             # Add to database
             candidate = await self.prisma.candidate.upsert(
@@ -490,10 +776,8 @@ class TalentService:
                 }
             )
 
-            # Extract skills
-            bio_lower = twitter_user.description.lower() if twitter_user.description else ""
-            common_skills = ["python", "javascript", "react", "node", "aws", "docker", "kubernetes", "typescript", "go", "rust"]
-            found_skills = [skill for skill in common_skills if skill in bio_lower]
+            # Extract and store skills
+            found_skills = await self._store_skill_tags(candidate.id, twitter_user.description)
 
             return CandidateResponse(
                 id=str(candidate.id),
@@ -599,14 +883,13 @@ class TalentService:
                     conversation_context += f"{sender}: {msg.content}\n"
 
             # Determine response type based on message content
-            message_lower = recruiter_message.lower()
-
             # Check for specific scenarios
             is_initial_outreach = len(conversation_history) <= 1
-            is_scheduling = any(word in message_lower for word in ["schedule", "time", "available", "call", "meeting", "interview"])
-            is_technical = any(word in message_lower for word in ["experience", "skills", "tech", "project", "work on"])
-            is_compensation = any(word in message_lower for word in ["salary", "compensation", "pay", "benefits"])
-            is_next_steps = any(word in message_lower for word in ["next steps", "process", "timeline"])
+            intents = INTENT_MATCHER.scan(recruiter_message)
+            is_scheduling = "scheduling" in intents
+            is_technical = "technical" in intents
+            is_compensation = "compensation" in intents
+            is_next_steps = "next_steps" in intents
 
             # Create a prompt for Grok
             prompt = f"""You are {candidate.name}, a {candidate.bio[:100] if candidate.bio else 'software engineer'}.
@@ -950,10 +1233,10 @@ Your response:"""
     async def get_candidates_with_feedback(self):
         """Get all candidates that have received feedback"""
         try:
-            # Get all candidates with feedback
+            # Get all candidates with feedback (best score and role are denormalized onto the candidate)
             candidates = await self.prisma.candidate.find_many(
                 where={"feedback": {"some": {}}},
-                include={"feedback": True, "searches": True}
+                include={"feedback": True}
             )
 
             result = []
@@ -971,19 +1254,9 @@ Your response:"""
                     recommendations[f.recommendation] = recommendations.get(f.recommendation, 0) + 1
                 top_recommendation = max(recommendations.items(), key=lambda x: x[1])[0] if recommendations else "no"
 
-                # Get role from search results
-                role = "Unknown Role"
-                if candidate.searches:
-                    search_session = await self.prisma.searchsession.find_first(
-                        where={"results": {"some": {"candidateId": candidate.id}}}
-                    )
-                    if search_session:
-                        role = search_session.jobTitle
-
-                # Get match score
-                match_score = 50
-                if candidate.searches:
-                    match_score = candidate.searches[0].score if candidate.searches else 50
+                # Role and match score from the candidate's best search result
+                role = candidate.bestJobTitle or "Unknown Role"
+                match_score = candidate.bestScore if candidate.bestScore is not None else 50
 
                 result.append({
                     "id": str(candidate.id),
@@ -1044,22 +1317,13 @@ Your response:"""
             from datetime import datetime
 
             # Get candidate details
-            candidate = await self.prisma.candidate.find_unique(
-                where={"id": request.candidate_id},
-                include={"searches": True}
-            )
+            candidate = await self.prisma.candidate.find_unique(where={"id": request.candidate_id})
 
             if not candidate:
                 return None
 
-            # Get role from search results
-            role = "Unknown Role"
-            if candidate.searches:
-                search_session = await self.prisma.searchsession.find_first(
-                    where={"results": {"some": {"candidateId": candidate.id}}}
-                )
-                if search_session:
-                    role = search_session.jobTitle
+            # Role from the candidate's best search result
+            role = candidate.bestJobTitle or "Unknown Role"
 
             completed_at = datetime.fromisoformat(request.completed_at.replace('Z', '+00:00'))
 
@@ -1101,7 +1365,7 @@ Your response:"""
         try:
             assessments = await self.prisma.assessment.find_many(
                 where={"status": {"in": ["pending", "forwarded"]}},
-                include={"candidate": {"include": {"searches": True}}},
+                include={"candidate": True},
                 order={"completedAt": "desc"}
             )
 
@@ -1109,14 +1373,8 @@ Your response:"""
             for assessment in assessments:
                 candidate = assessment.candidate
 
-                # Get role from search results
-                role = "Unknown Role"
-                if candidate.searches:
-                    search_session = await self.prisma.searchsession.find_first(
-                        where={"results": {"some": {"candidateId": candidate.id}}}
-                    )
-                    if search_session:
-                        role = search_session.jobTitle
+                # Role from the candidate's best search result
+                role = candidate.bestJobTitle or "Unknown Role"
 
                 result.append({
                     "id": assessment.id,
@@ -4,11 +4,13 @@ import base64
 import hashlib
 from typing import Optional, Dict
 from ..config.settings import settings
+from .http_clients import build_client
 
 class TwitterOAuthService:
     """Handle Twitter OAuth 2.0 PKCE flow for user authentication and DM sending"""
 
-    def __init__(self):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        self.client = client or build_client("twitter", settings.TWITTER_TIMEOUT)
         self.client_id = settings.TWITTER_CLIENT_ID
         self.client_secret = settings.TWITTER_CLIENT_SECRET
         self.callback_url = settings.TWITTER_OAUTH_CALLBACK_URL
@@ -76,81 +78,78 @@ class TwitterOAuthService:
         code_verifier = oauth_data['code_verifier']
 
         # Exchange code for token
-        async with httpx.AsyncClient() as client:
-            data = {
-                'grant_type': 'authorization_code',
-                'code': code,
-                'redirect_uri': self.callback_url,
-                'code_verifier': code_verifier,
-                'client_id': self.client_id
-            }
-
-            # Basic auth with client credentials
-            auth = base64.b64encode(f"{self.client_id}:{self.client_secret}".encode()).decode()
-            headers = {
-                'Authorization': f'Basic {auth}',
-                'Content-Type': 'application/x-www-form-urlencoded'
-            }
-
-            response = await client.post(self.token_url, data=data, headers=headers)
-
-            if response.status_code != 200:
-                print(f"Token exchange error: {response.status_code} - {response.text}")
-                return None
-
-            token_data = response.json()
-
-            # Clean up state
-            del self.oauth_states[state]
-
-            return {
-                'access_token': token_data['access_token'],
-                'refresh_token': token_data.get('refresh_token'),
-                'expires_in': token_data.get('expires_in', 7200),
-                'scope': token_data.get('scope', '')
-            }
+        data = {
+            'grant_type': 'authorization_code',
+            'code': code,
+            'redirect_uri': self.callback_url,
+            'code_verifier': code_verifier,
+            'client_id': self.client_id
+        }
+
+        # Basic auth with client credentials
+        auth = base64.b64encode(f"{self.client_id}:{self.client_secret}".encode()).decode()
+        headers = {
+            'Authorization': f'Basic {auth}',
+            'Content-Type': 'application/x-www-form-urlencoded'
+        }
+
+        response = await self.client.post(self.token_url, data=data, headers=headers)
+
+        if response.status_code != 200:
+            print(f"Token exchange error: {response.status_code} - {response.text}")
+            return None
+
+        token_data = response.json()
+
+        # Clean up state
+        del self.oauth_states[state]
+
+        return {
+            'access_token': token_data['access_token'],
+            'refresh_token': token_data.get('refresh_token'),
+            'expires_in': token_data.get('expires_in', 7200),
+            'scope': token_data.get('scope', '')
+        }
 
     async def send_dm(self, access_token: str, recipient_id: str, message: str) -> bool:
         """Send a direct message to a Twitter user"""
-        async with httpx.AsyncClient() as client:
-            headers = {
-                'Authorization': f'Bearer {access_token}',
-                'Content-Type': 'application/json'
-            }
-
-            data = {
-                'conversationId': recipient_id,
-                'text': message
-            }
-
-            response = await client.post(
-                f"{settings.TWITTER_BASE_URL}/dm_conversations/with/{recipient_id}/messages",
-                headers=headers,
-                json=data
-            )
-
-            if response.status_code in [200, 201]:
-                print(f"✓ DM sent to user {recipient_id}")
-                return True
-            else:
-                print(f"✗ Failed to send DM: {response.status_code} - {response.text}")
-                return False
+        headers = {
+            'Authorization': f'Bearer {access_token}',
+            'Content-Type': 'application/json'
+        }
+
+        data = {
+            'conversationId': recipient_id,
+            'text': message
+        }
+
+        response = await self.client.post(
+            f"{settings.TWITTER_BASE_URL}/dm_conversations/with/{recipient_id}/messages",
+            headers=headers,
+            json=data
+        )
+
+        if response.status_code in [200, 201]:
+            print(f"✓ DM sent to user {recipient_id}")
+            return True
+        else:
+            print(f"✗ Failed to send DM: {response.status_code} - {response.text}")
+            return False
 
     async def get_authenticated_user(self, access_token: str) -> Optional[Dict]:
         """Get the authenticated user's info"""
-        async with httpx.AsyncClient() as client:
-            headers = {
-                'Authorization': f'Bearer {access_token}'
-            }
+        headers = {
+            'Authorization': f'Bearer {access_token}'
+        }
 
-            response = await client.get(
-                f"{settings.TWITTER_BASE_URL}/users/me",
-                headers=headers,
-                params={'user.fields': 'id,name,username'}
-            )
+        response = await self.client.get(
+            f"{settings.TWITTER_BASE_URL}/users/me",
+            headers=headers,
+            params={'user.fields': 'id,name,username'}
+        )
 
-            if response.status_code == 200:
-                data = response.json()
-                return data.get('data')
+        if response.status_code == 200:
+            data = response.json()
+            return data.get('data')
 
-            return None
+        return None
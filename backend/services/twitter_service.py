@@ -1,18 +1,56 @@
 import httpx
-from typing import List
+import asyncio
+import time
+from typing import AsyncIterator, Dict, List, Optional
 from ..config.settings import settings
 from ..models.schemas import TwitterUser
+from .http_clients import build_client
+from .keyword_matcher import PROFILE_MATCHER
+from .rate_limiter import BULK, INTERACTIVE, TwitterRateLimiter
+from .resilience import CircuitBreaker, call_with_retries
+
+# GET /users?ids= accepts at most 100 IDs per request
+USERS_LOOKUP_BATCH_SIZE = 100
+
+
+def _rate_limited_until_reset(response: httpx.Response) -> bool:
+    """A 429 that says when the window resets: retrying before then can only wait out RATE_LIMIT_MAX_WAIT"""
+    return response.status_code == 429 and "x-rate-limit-reset" in response.headers
 
 class TwitterService:
-    def __init__(self):
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        rate_limiter: Optional[TwitterRateLimiter] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
         if not settings.TWITTER_BEARER_TOKEN:
             raise ValueError("TWITTER_BEARER_TOKEN not found in environment")
 
+        # Shared keep-alive client (owned by the app lifespan when injected)
+        self.client = client or build_client("twitter", settings.TWITTER_TIMEOUT)
+        self.rate_limiter = rate_limiter or TwitterRateLimiter()
+        self.breaker = breaker or CircuitBreaker("twitter")
+
         self.headers = {
             "Authorization": f"Bearer {settings.TWITTER_BEARER_TOKEN}",
             "Content-Type": "application/json"
         }
 
+    async def _get(self, endpoint: str, url: str, params: dict, priority: int = BULK) -> httpx.Response:
+        """GET through the rate-limit scheduler with retries, behind the Twitter circuit breaker.
+
+        A 429 carrying x-rate-limit-reset is returned straight away (the limiter
+        has already closed the bucket until then) so callers can fail fast.
+        """
+        async def send():
+            await self.rate_limiter.acquire(endpoint, priority)
+            response = await self.client.get(url, headers=self.headers, params=params)
+            await self.rate_limiter.update(endpoint, response.status_code, response.headers)
+            return response
+
+        return await call_with_retries(self.breaker, send, final=_rate_limited_until_reset)
+
     def _upgrade_image_quality(self, url: str) -> str:
         """Upgrade Twitter profile image from _normal (48x48) to higher resolution"""
         if not url:
@@ -44,25 +82,10 @@ class TwitterService:
         if not user.description or len(user.description.strip()) < 10:
             return False
 
-        bio_lower = user.description.lower()
-
-        # Check for developer/engineer role indicators in bio
-        role_keywords = [
-            'developer', 'engineer', 'programmer', 'software',
-            'frontend', 'backend', 'full stack', 'fullstack',
-            'devops', 'sre', 'architect', 'tech lead', 'cto', 'ceo'
-        ]
-
-        has_role_indicator = any(keyword in bio_lower for keyword in role_keywords)
-
-        # Check for technical keywords in bio
-        tech_keywords = [
-            'react', 'vue', 'angular', 'javascript', 'typescript', 'python',
-            'java', 'golang', 'rust', 'node', 'aws', 'docker', 'kubernetes',
-            'api', 'database', 'code', 'git', 'github', 'coding', 'programming'
-        ]
-
-        has_tech_keyword = any(keyword in bio_lower for keyword in tech_keywords)
+        # Role indicators and technical keywords, matched as whole words in one pass
+        hits = PROFILE_MATCHER.scan(user.description)
+        has_role_indicator = "roles" in hits
+        has_tech_keyword = "tech" in hits
 
         # Minimum follower threshold (at least some credibility)
         has_min_followers = user.followers_count >= 50
@@ -74,164 +97,223 @@ class TwitterService:
         # AND meet minimum followers and bio length requirements
         return (has_role_indicator or has_tech_keyword) and has_min_followers and has_meaningful_bio
 
-    async def _enrich_user_with_banner(self, client: httpx.AsyncClient, user: TwitterUser) -> TwitterUser:
-        """Fetch full user details to get banner image (tweet search doesn't return it)"""
+    async def _hydrate_batch(self, users: List[TwitterUser]):
+        """Fetch full profiles for up to 100 users in one multi-ID lookup"""
         try:
             params = {
-                "user.fields": "profile_banner_url"
+                "ids": ",".join(user.id for user in users),
+                "user.fields": "profile_banner_url,public_metrics,description"
             }
 
-            response = await client.get(
-                f"{settings.TWITTER_BASE_URL}/users/{user.id}",
-                headers=self.headers,
-                params=params
+            response = await self._get(
+                "/users",
+                f"{settings.TWITTER_BASE_URL}/users",
+                params
             )
 
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("data", {}).get("profile_banner_url"):
-                    user.profile_banner_url = data["data"]["profile_banner_url"]
-                    print(f"  ✓ Got banner for @{user.username}")
-                else:
-                    print(f"  - No banner for @{user.username}")
-
-            return user
+            if response.status_code != 200:
+                print(f"Twitter user lookup error: {response.status_code} - {response.text}")
+                return
 
-        except Exception as e:
-            print(f"  ✗ Error fetching banner for @{user.username}: {e}")
-            return user
+            profiles = {profile["id"]: profile for profile in response.json().get("data", [])}
 
-    async def search_users(self, keywords: List[str], job_title: str = "", max_results: int = 100) -> List[TwitterUser]:
-        try:
-            # Build enhanced query
-            query = self._build_enhanced_query(keywords, job_title)
+            for user in users:
+                profile = profiles.get(user.id)
+                if not profile:
+                    continue
+                metrics = profile.get("public_metrics", {})
+                user.profile_banner_url = profile.get("profile_banner_url", "") or user.profile_banner_url
+                user.followers_count = metrics.get("followers_count", user.followers_count)
+                user.following_count = metrics.get("following_count", user.following_count)
+                user.description = profile.get("description", user.description)
 
-            print(f"Enhanced Twitter query: {query}")
-
-            async with httpx.AsyncClient() as client:
-                params = {
-                    "query": query,
-                    "max_results": min(max_results, 100),
-                    "expansions": "author_id",
-                    "user.fields": "public_metrics,description,profile_image_url,name,username"
-                }
+        except Exception as e:
+            print(f"Error hydrating {len(users)} users: {e}")
+
+    async def hydrate_users(self, users: List[TwitterUser]) -> List[TwitterUser]:
+        """Merge banner and metrics onto users (tweet search doesn't return banners)"""
+        batches = [users[i:i + USERS_LOOKUP_BATCH_SIZE] for i in range(0, len(users), USERS_LOOKUP_BATCH_SIZE)]
+        await asyncio.gather(*[self._hydrate_batch(batch) for batch in batches])
+        return users
+
+    async def iter_search_users(
+        self,
+        keywords: List[str],
+        job_title: str = "",
+        max_results: int = 100,
+        target: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        time_budget: Optional[float] = None
+    ) -> AsyncIterator[TwitterUser]:
+        """Yield pre-filtered, hydrated users page by page, following next_token.
+
+        Authors are deduplicated across pages. Stops once `target` qualified
+        users were yielded, or the page/time budget runs out.
+        """
+        max_pages = max_pages or settings.TWITTER_SEARCH_MAX_PAGES
+        time_budget = time_budget if time_budget is not None else settings.TWITTER_SEARCH_TIME_BUDGET
+        deadline = time.monotonic() + time_budget
+
+        # Build enhanced query
+        query = self._build_enhanced_query(keywords, job_title)
+
+        print(f"Enhanced Twitter query: {query}")
+
+        seen_ids = set()
+        qualified = 0
+        next_token = None
+
+        for page in range(1, max_pages + 1):
+            params = {
+                "query": query,
+                "max_results": min(max_results, 100),
+                "expansions": "author_id",
+                "user.fields": "public_metrics,description,profile_image_url,name,username"
+            }
+            if next_token:
+                params["next_token"] = next_token
 
-                response = await client.get(
+            try:
+                response = await self._get(
+                    "/tweets/search/recent",
                     f"{settings.TWITTER_BASE_URL}/tweets/search/recent",
-                    headers=self.headers,
-                    params=params
+                    params
+                )
+            except Exception as e:
+                print(f"Twitter API error: {e}")
+                return
+
+            if response.status_code == 429:
+                print(f"Twitter search rate limited on page {page}; see /admin/rate-limits for the reset time")
+                return
+            if response.status_code != 200:
+                print(f"Twitter API error: {response.status_code} - {response.text}")
+                return
+
+            data = response.json()
+
+            # The matching tweets themselves are kept as a free signal for pre-ranking
+            tweets_by_author: Dict[str, List[str]] = {}
+            for tweet in data.get("data", []):
+                tweets_by_author.setdefault(tweet.get("author_id"), []).append(tweet.get("text", ""))
+
+            # Parse new authors and apply pre-filtering
+            users = []
+            filtered_count = 0
+
+            for user in data.get("includes", {}).get("users", []):
+                if user["id"] in seen_ids:
+                    continue
+                seen_ids.add(user["id"])
+
+                twitter_user = TwitterUser(
+                    id=user["id"],
+                    username=user["username"],
+                    name=user.get("name", user["username"]),
+                    description=user.get("description", ""),
+                    followers_count=user.get("public_metrics", {}).get("followers_count", 0),
+                    following_count=user.get("public_metrics", {}).get("following_count", 0),
+                    profile_image_url=self._upgrade_image_quality(user.get("profile_image_url", "")),
+                    profile_banner_url="",  # Will be enriched later
+                    matched_tweets=tweets_by_author.get(user["id"], [])
                 )
 
-                if response.status_code != 200:
-                    print(f"Twitter API error: {response.status_code} - {response.text}")
-                    return []
-
-                data = response.json()
-
-                if not data.get("data") or not data.get("includes", {}).get("users"):
-                    return []
-
-                # Parse users and apply pre-filtering
-                users = []
-                filtered_count = 0
-
-                for user in data["includes"]["users"]:
-                    twitter_user = TwitterUser(
-                        id=user["id"],
-                        username=user["username"],
-                        name=user.get("name", user["username"]),
-                        description=user.get("description", ""),
-                        followers_count=user.get("public_metrics", {}).get("followers_count", 0),
-                        following_count=user.get("public_metrics", {}).get("following_count", 0),
-                        profile_image_url=self._upgrade_image_quality(user.get("profile_image_url", "")),
-                        profile_banner_url="",  # Will be enriched later
-                    )
-
-                    # Apply pre-filtering
-                    if self._pre_filter_candidate(twitter_user):
-                        users.append(twitter_user)
-                    else:
-                        filtered_count += 1
-
-                print(f"Found {len(users)} qualified candidates ({filtered_count} filtered out)")
-
-                # Enrich with banner images (fetch full user profiles)
-                print(f"Fetching banner images for {len(users)} candidates...")
-                import asyncio
-                enriched_users = await asyncio.gather(*[
-                    self._enrich_user_with_banner(client, user) for user in users
-                ])
-
-                return enriched_users
+                # Apply pre-filtering
+                if self._pre_filter_candidate(twitter_user):
+                    users.append(twitter_user)
+                else:
+                    filtered_count += 1
+
+            if target:
+                users = users[:target - qualified]
+
+            print(f"Page {page}: {len(users)} qualified candidates ({filtered_count} filtered out)")
+
+            # Enrich with banner images (batched full user profiles)
+            for user in await self.hydrate_users(users):
+                yield user
+            qualified += len(users)
+
+            next_token = data.get("meta", {}).get("next_token")
+            if not next_token or (target and qualified >= target):
+                return
+            if time.monotonic() >= deadline:
+                print(f"Search time budget ({time_budget}s) reached after {page} pages")
+                return
+
+    async def search_users(
+        self,
+        keywords: List[str],
+        job_title: str = "",
+        max_results: int = 100,
+        target: Optional[int] = None,
+        max_pages: Optional[int] = None
+    ) -> List[TwitterUser]:
+        try:
+            users = [
+                user async for user in self.iter_search_users(
+                    keywords, job_title=job_title, max_results=max_results, target=target, max_pages=max_pages
+                )
+            ]
+            print(f"Found {len(users)} qualified candidates")
+            return users
 
         except Exception as e:
             print(f"Twitter API error: {e}")
             return []
 
-    async def get_recent_tweet(self, user_id: str) -> str:
-        try:
-            async with httpx.AsyncClient() as client:
-                params = {
-                    "max_results": settings.MAX_TWEETS_PER_USER,
-                    "exclude": "retweets,replies"
-                }
-
-                response = await client.get(
-                    f"{settings.TWITTER_BASE_URL}/users/{user_id}/tweets",
-                    headers=self.headers,
-                    params=params
-                )
-
-                if response.status_code != 200:
-                    return "No recent tweets"
-
-                data = response.json()
-                if data.get("data") and len(data["data"]) > 0:
-                    tweet_text = data["data"][0]["text"]
-                    return tweet_text[:200] + "..." if len(tweet_text) > 200 else tweet_text
-
-                return "No recent tweets"
-
-        except Exception as e:
-            print(f"Error getting tweets for user {user_id}: {e}")
+    @staticmethod
+    def recent_tweet_snippet(tweets: List[dict]) -> str:
+        """Short preview of the newest tweet from a get_recent_tweets_detailed result"""
+        if not tweets:
             return "No recent tweets"
+        tweet_text = tweets[0]["content"]
+        return tweet_text[:200] + "..." if len(tweet_text) > 200 else tweet_text
+
+    async def get_recent_tweet(self, user_id: str, priority: int = BULK) -> str:
+        tweets = await self.get_recent_tweets_detailed(user_id, max_count=settings.MAX_TWEETS_PER_USER, priority=priority)
+        return self.recent_tweet_snippet(tweets)
 
-    async def get_recent_tweets_detailed(self, user_id: str, max_count: int = 5) -> List[dict]:
-        """Fetch recent tweets with engagement metrics for detailed profile view"""
+    async def get_recent_tweets_detailed(
+        self, user_id: str, max_count: int = 5, priority: int = BULK, since_id: Optional[str] = None
+    ) -> List[dict]:
+        """Fetch recent tweets with engagement metrics, newest first (only those after since_id if given)"""
         try:
-            async with httpx.AsyncClient() as client:
-                params = {
-                    "max_results": max_count,
-                    "exclude": "retweets,replies",
-                    "tweet.fields": "created_at,public_metrics"
-                }
-
-                response = await client.get(
-                    f"{settings.TWITTER_BASE_URL}/users/{user_id}/tweets",
-                    headers=self.headers,
-                    params=params
-                )
+            params = {
+                "max_results": max_count,
+                "exclude": "retweets,replies",
+                "tweet.fields": "created_at,public_metrics"
+            }
+            if since_id:
+                params["since_id"] = since_id
+
+            response = await self._get(
+                "/users/:id/tweets",
+                f"{settings.TWITTER_BASE_URL}/users/{user_id}/tweets",
+                params,
+                priority=priority
+            )
 
-                if response.status_code != 200:
-                    return []
+            if response.status_code != 200:
+                return []
 
-                data = response.json()
-                if not data.get("data"):
-                    return []
+            data = response.json()
+            if not data.get("data"):
+                return []
 
-                tweets = []
-                for tweet in data["data"]:
-                    metrics = tweet.get("public_metrics", {})
-                    tweets.append({
-                        "id": tweet["id"],
-                        "content": tweet["text"],
-                        "likes": metrics.get("like_count", 0),
-                        "retweets": metrics.get("retweet_count", 0),
-                        "replies": metrics.get("reply_count", 0),
-                        "created_at": tweet.get("created_at", "")
-                    })
+            tweets = []
+            for tweet in data["data"]:
+                metrics = tweet.get("public_metrics", {})
+                tweets.append({
+                    "id": tweet["id"],
+                    "content": tweet["text"],
+                    "likes": metrics.get("like_count", 0),
+                    "retweets": metrics.get("retweet_count", 0),
+                    "replies": metrics.get("reply_count", 0),
+                    "created_at": tweet.get("created_at", "")
+                })
 
-                return tweets
+            return tweets
 
         except Exception as e:
             print(f"Error getting detailed tweets for user {user_id}: {e}")
@@ -243,47 +325,47 @@ class TwitterService:
             # Remove @ if present
             clean_username = username.lstrip('@')
 
-            async with httpx.AsyncClient() as client:
-                params = {
-                    "user.fields": "id,name,username,description,public_metrics,profile_image_url,profile_banner_url"
-                }
+            params = {
+                "user.fields": "id,name,username,description,public_metrics,profile_image_url,profile_banner_url"
+            }
 
-                response = await client.get(
-                    f"{settings.TWITTER_BASE_URL}/users/by/username/{clean_username}",
-                    headers=self.headers,
-                    params=params
-                )
+            response = await self._get(
+                "/users/by/username/:username",
+                f"{settings.TWITTER_BASE_URL}/users/by/username/{clean_username}",
+                params,
+                priority=INTERACTIVE
+            )
 
-                if response.status_code == 404:
-                    print(f"User @{clean_username} not found on Twitter")
-                    return None
+            if response.status_code == 404:
+                print(f"User @{clean_username} not found on Twitter")
+                return None
 
-                if response.status_code != 200:
-                    print(f"Twitter API error: {response.status_code}")
-                    return None
+            if response.status_code != 200:
+                print(f"Twitter API error: {response.status_code}")
+                return None
 
-                data = response.json()
-                user_data = data.get("data")
+            data = response.json()
+            user_data = data.get("data")
 
-                if not user_data:
-                    return None
+            if not user_data:
+                return None
 
-                # Upgrade profile image quality
-                profile_image = self._upgrade_image_quality(user_data.get("profile_image_url", ""))
+            # Upgrade profile image quality
+            profile_image = self._upgrade_image_quality(user_data.get("profile_image_url", ""))
 
-                user = TwitterUser(
-                    id=user_data["id"],
-                    username=user_data["username"],
-                    name=user_data.get("name", ""),
-                    description=user_data.get("description", ""),
-                    followers_count=user_data.get("public_metrics", {}).get("followers_count", 0),
-                    following_count=user_data.get("public_metrics", {}).get("following_count", 0),
-                    profile_image_url=profile_image,
-                    profile_banner_url=user_data.get("profile_banner_url", "")
-                )
+            user = TwitterUser(
+                id=user_data["id"],
+                username=user_data["username"],
+                name=user_data.get("name", ""),
+                description=user_data.get("description", ""),
+                followers_count=user_data.get("public_metrics", {}).get("followers_count", 0),
+                following_count=user_data.get("public_metrics", {}).get("following_count", 0),
+                profile_image_url=profile_image,
+                profile_banner_url=user_data.get("profile_banner_url", "")
+            )
 
-                print(f"✓ Found user: @{user.username} ({user.name}) - {user.followers_count} followers")
-                return user
+            print(f"✓ Found user: @{user.username} ({user.name}) - {user.followers_count} followers")
+            return user
 
         except Exception as e:
             print(f"Error looking up user @{username}: {e}")
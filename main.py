@@ -1,17 +1,19 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from prisma import Prisma
 from backend.api.routes import router
-
-# Initialize database
-prisma = Prisma()
+from backend.services.container import ServiceContainer
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await prisma.connect()
+    # Services (and the pooled database client) live for the whole app lifetime.
+    # Connecting applies the SQLite performance profile (WAL, pragmas) and starts
+    # its periodic checkpoint/optimize task; see the SQLITE_* settings.
+    services = ServiceContainer()
+    await services.startup()
+    app.state.services = services
     yield
-    await prisma.disconnect()
+    await services.shutdown()
 
 app = FastAPI(title="TalentScout X API", version="2.0.0", lifespan=lifespan)
 
@@ -21,6 +23,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # GET /candidates pagination
 )
 
 # Include routes
@@ -28,4 +31,4 @@ app.include_router(router)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
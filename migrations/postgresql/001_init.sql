@@ -0,0 +1,199 @@
+-- Full schema for PostgreSQL (equivalent to `prisma db push --schema schema.postgresql.prisma`
+-- on an empty database; names follow Prisma's conventions so later pushes see no drift).
+--   psql "$DATABASE_URL" -f migrations/postgresql/001_init.sql
+
+CREATE TABLE "Candidate" (
+    "id" SERIAL NOT NULL,
+    "handle" TEXT NOT NULL,
+    "twitterId" TEXT,
+    "name" TEXT,
+    "bio" TEXT,
+    "followers" INTEGER,
+    "following" INTEGER,
+    "avatar" TEXT,
+    "headerImage" TEXT,
+    "recentTweet" TEXT,
+    "lastTweetId" TEXT,
+    "tweetsRefreshedAt" TIMESTAMP(3),
+    "pipelineStage" TEXT,
+    "bestScore" INTEGER,
+    "bestReasoning" TEXT,
+    "bestJobTitle" TEXT,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "Candidate_pkey" PRIMARY KEY ("id")
+);
+
+CREATE TABLE "CandidateSkill" (
+    "candidateId" INTEGER NOT NULL,
+    "skill" TEXT NOT NULL,
+    "position" INTEGER NOT NULL,
+
+    CONSTRAINT "CandidateSkill_pkey" PRIMARY KEY ("candidateId", "skill")
+);
+
+CREATE TABLE "SearchSession" (
+    "id" SERIAL NOT NULL,
+    "jobTitle" TEXT NOT NULL,
+    "keywords" TEXT NOT NULL,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "SearchSession_pkey" PRIMARY KEY ("id")
+);
+
+CREATE TABLE "SearchResult" (
+    "id" SERIAL NOT NULL,
+    "score" INTEGER NOT NULL,
+    "reasoning" TEXT,
+    "preRankScore" DOUBLE PRECISION,
+    "candidateId" INTEGER NOT NULL,
+    "sessionId" INTEGER NOT NULL,
+
+    CONSTRAINT "SearchResult_pkey" PRIMARY KEY ("id")
+);
+
+CREATE TABLE "Tweet" (
+    "id" SERIAL NOT NULL,
+    "tweetId" TEXT NOT NULL,
+    "content" TEXT NOT NULL,
+    "likes" INTEGER NOT NULL DEFAULT 0,
+    "retweets" INTEGER NOT NULL DEFAULT 0,
+    "replies" INTEGER NOT NULL DEFAULT 0,
+    "createdAt" TEXT NOT NULL,
+    "candidateId" INTEGER NOT NULL,
+
+    CONSTRAINT "Tweet_pkey" PRIMARY KEY ("id")
+);
+
+CREATE TABLE "Notification" (
+    "id" SERIAL NOT NULL,
+    "candidateId" INTEGER NOT NULL,
+    "message" TEXT NOT NULL,
+    "eventType" TEXT NOT NULL,
+    "fromStage" TEXT,
+    "toStage" TEXT,
+    "isAIGenerated" BOOLEAN NOT NULL DEFAULT false,
+    "sentAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "Notification_pkey" PRIMARY KEY ("id")
+);
+
+CREATE TABLE "Message" (
+    "id" SERIAL NOT NULL,
+    "candidateId" INTEGER NOT NULL,
+    "content" TEXT NOT NULL,
+    "senderId" TEXT NOT NULL,
+    "senderType" TEXT NOT NULL,
+    "messageType" TEXT NOT NULL DEFAULT 'text',
+    "metadata" TEXT,
+    "isRead" BOOLEAN NOT NULL DEFAULT false,
+    "isInternal" BOOLEAN NOT NULL DEFAULT false,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "Message_pkey" PRIMARY KEY ("id")
+);
+
+CREATE TABLE "Event" (
+    "id" SERIAL NOT NULL,
+    "candidateId" INTEGER NOT NULL,
+    "title" TEXT NOT NULL,
+    "description" TEXT,
+    "eventType" TEXT NOT NULL,
+    "scheduledAt" TIMESTAMP(3) NOT NULL,
+    "duration" INTEGER NOT NULL,
+    "meetingType" TEXT NOT NULL DEFAULT 'video',
+    "status" TEXT NOT NULL DEFAULT 'scheduled',
+    "meetingLink" TEXT,
+    "notes" TEXT,
+    "assignedInterviewerId" TEXT,
+    "assignedInterviewerName" TEXT,
+    "assignedInterviewerRole" TEXT,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "Event_pkey" PRIMARY KEY ("id")
+);
+
+CREATE TABLE "Feedback" (
+    "id" SERIAL NOT NULL,
+    "candidateId" INTEGER NOT NULL,
+    "interviewerId" TEXT NOT NULL,
+    "interviewerName" TEXT NOT NULL,
+    "interviewerRole" TEXT NOT NULL,
+    "interviewerAvatar" TEXT NOT NULL,
+    "stage" TEXT NOT NULL,
+    "rating" INTEGER NOT NULL,
+    "recommendation" TEXT NOT NULL,
+    "technicalSkills" INTEGER NOT NULL,
+    "communication" INTEGER NOT NULL,
+    "cultureFit" INTEGER NOT NULL,
+    "comments" TEXT NOT NULL,
+    "strengths" TEXT NOT NULL,
+    "concerns" TEXT NOT NULL,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "Feedback_pkey" PRIMARY KEY ("id")
+);
+
+CREATE TABLE "Assessment" (
+    "id" SERIAL NOT NULL,
+    "candidateId" INTEGER NOT NULL,
+    "title" TEXT NOT NULL,
+    "description" TEXT,
+    "assessmentType" TEXT NOT NULL,
+    "timeLimit" INTEGER NOT NULL,
+    "status" TEXT NOT NULL DEFAULT 'pending',
+    "assignedEngineerId" TEXT,
+    "assignedEngineerName" TEXT,
+    "assignedEngineerRole" TEXT,
+    "assignedEngineerAvatar" TEXT,
+    "completedAt" TIMESTAMP(3) NOT NULL,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "Assessment_pkey" PRIMARY KEY ("id")
+);
+
+CREATE TABLE "ScoutJob" (
+    "id" TEXT NOT NULL,
+    "status" TEXT NOT NULL DEFAULT 'queued',
+    "request" TEXT NOT NULL,
+    "progress" TEXT,
+    "result" TEXT,
+    "error" TEXT,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "startedAt" TIMESTAMP(3),
+    "finishedAt" TIMESTAMP(3),
+    "workerId" TEXT,
+    "heartbeatAt" TIMESTAMP(3),
+
+    CONSTRAINT "ScoutJob_pkey" PRIMARY KEY ("id")
+);
+
+-- Unique constraints
+CREATE UNIQUE INDEX "Candidate_handle_key" ON "Candidate"("handle");
+CREATE UNIQUE INDEX "Tweet_candidateId_tweetId_key" ON "Tweet"("candidateId", "tweetId");
+
+-- Secondary indexes (same set as schema.prisma / migrations/sqlite)
+CREATE INDEX "Candidate_bestScore_id_idx" ON "Candidate"("bestScore" DESC, "id");
+CREATE INDEX "CandidateSkill_skill_idx" ON "CandidateSkill"("skill");
+CREATE INDEX "SearchResult_candidateId_score_idx" ON "SearchResult"("candidateId", "score");
+CREATE INDEX "SearchResult_sessionId_idx" ON "SearchResult"("sessionId");
+CREATE INDEX "Tweet_candidateId_createdAt_idx" ON "Tweet"("candidateId", "createdAt");
+CREATE INDEX "Notification_candidateId_sentAt_idx" ON "Notification"("candidateId", "sentAt");
+CREATE INDEX "Message_candidateId_createdAt_idx" ON "Message"("candidateId", "createdAt");
+CREATE INDEX "Event_status_scheduledAt_idx" ON "Event"("status", "scheduledAt");
+CREATE INDEX "Event_candidateId_scheduledAt_idx" ON "Event"("candidateId", "scheduledAt");
+CREATE INDEX "Feedback_candidateId_createdAt_idx" ON "Feedback"("candidateId", "createdAt");
+CREATE INDEX "Assessment_status_completedAt_idx" ON "Assessment"("status", "completedAt");
+CREATE INDEX "Assessment_candidateId_idx" ON "Assessment"("candidateId");
+CREATE INDEX "ScoutJob_status_createdAt_idx" ON "ScoutJob"("status", "createdAt");
+
+-- Foreign keys
+ALTER TABLE "CandidateSkill" ADD CONSTRAINT "CandidateSkill_candidateId_fkey" FOREIGN KEY ("candidateId") REFERENCES "Candidate"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+ALTER TABLE "SearchResult" ADD CONSTRAINT "SearchResult_candidateId_fkey" FOREIGN KEY ("candidateId") REFERENCES "Candidate"("id") ON DELETE RESTRICT ON UPDATE CASCADE;
+ALTER TABLE "SearchResult" ADD CONSTRAINT "SearchResult_sessionId_fkey" FOREIGN KEY ("sessionId") REFERENCES "SearchSession"("id") ON DELETE RESTRICT ON UPDATE CASCADE;
+ALTER TABLE "Tweet" ADD CONSTRAINT "Tweet_candidateId_fkey" FOREIGN KEY ("candidateId") REFERENCES "Candidate"("id") ON DELETE RESTRICT ON UPDATE CASCADE;
+ALTER TABLE "Notification" ADD CONSTRAINT "Notification_candidateId_fkey" FOREIGN KEY ("candidateId") REFERENCES "Candidate"("id") ON DELETE RESTRICT ON UPDATE CASCADE;
+ALTER TABLE "Message" ADD CONSTRAINT "Message_candidateId_fkey" FOREIGN KEY ("candidateId") REFERENCES "Candidate"("id") ON DELETE RESTRICT ON UPDATE CASCADE;
+ALTER TABLE "Event" ADD CONSTRAINT "Event_candidateId_fkey" FOREIGN KEY ("candidateId") REFERENCES "Candidate"("id") ON DELETE RESTRICT ON UPDATE CASCADE;
+ALTER TABLE "Feedback" ADD CONSTRAINT "Feedback_candidateId_fkey" FOREIGN KEY ("candidateId") REFERENCES "Candidate"("id") ON DELETE RESTRICT ON UPDATE CASCADE;
+ALTER TABLE "Assessment" ADD CONSTRAINT "Assessment_candidateId_fkey" FOREIGN KEY ("candidateId") REFERENCES "Candidate"("id") ON DELETE RESTRICT ON UPDATE CASCADE;
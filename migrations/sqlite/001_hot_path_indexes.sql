@@ -0,0 +1,34 @@
+-- Secondary indexes for the hot read paths (mirrors the @@index entries in schema.prisma,
+-- using Prisma's index names so `prisma db push` sees them as already applied).
+-- Idempotent; apply to an existing database with:
+--   sqlite3 dev.db < migrations/sqlite/001_hot_path_indexes.sql
+
+-- The candidate list: best score first, id as the tie-break (keyset pagination)
+DROP INDEX IF EXISTS "Candidate_bestScore_idx";
+CREATE INDEX IF NOT EXISTS "Candidate_bestScore_id_idx" ON "Candidate"("bestScore" DESC, "id");
+
+-- Skill filter on the candidate list
+CREATE INDEX IF NOT EXISTS "CandidateSkill_skill_idx" ON "CandidateSkill"("skill");
+
+-- Best result per candidate, and a session's results
+CREATE INDEX IF NOT EXISTS "SearchResult_candidateId_score_idx" ON "SearchResult"("candidateId", "score");
+CREATE INDEX IF NOT EXISTS "SearchResult_sessionId_idx" ON "SearchResult"("sessionId");
+
+-- A candidate's stored timeline, newest first
+CREATE INDEX IF NOT EXISTS "Tweet_candidateId_createdAt_idx" ON "Tweet"("candidateId", "createdAt");
+
+-- Per-candidate feeds, in time order
+CREATE INDEX IF NOT EXISTS "Notification_candidateId_sentAt_idx" ON "Notification"("candidateId", "sentAt");
+CREATE INDEX IF NOT EXISTS "Message_candidateId_createdAt_idx" ON "Message"("candidateId", "createdAt");
+CREATE INDEX IF NOT EXISTS "Event_candidateId_scheduledAt_idx" ON "Event"("candidateId", "scheduledAt");
+CREATE INDEX IF NOT EXISTS "Feedback_candidateId_createdAt_idx" ON "Feedback"("candidateId", "createdAt");
+CREATE INDEX IF NOT EXISTS "Assessment_candidateId_idx" ON "Assessment"("candidateId");
+
+-- Dashboards: upcoming events, assessments awaiting feedback
+CREATE INDEX IF NOT EXISTS "Event_status_scheduledAt_idx" ON "Event"("status", "scheduledAt");
+CREATE INDEX IF NOT EXISTS "Assessment_status_completedAt_idx" ON "Assessment"("status", "completedAt");
+
+-- Background scout jobs: next queued job, unfinished jobs at startup
+CREATE INDEX IF NOT EXISTS "ScoutJob_status_createdAt_idx" ON "ScoutJob"("status", "createdAt");
+
+ANALYZE;
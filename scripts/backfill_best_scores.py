@@ -0,0 +1,87 @@
+"""Fill Candidate.bestScore/bestReasoning/bestJobTitle from existing search results.
+
+Scouts keep these columns up to date as they write results; this is only
+needed once for candidates scored before the columns existed.
+
+On PostgreSQL this is a single UPDATE over a DISTINCT ON query; on SQLite
+it walks the candidates in id-keyed batches.
+
+Usage (from the repo root, after `prisma db push`):
+    python scripts/backfill_best_scores.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prisma import Prisma
+from backend.config.settings import database_provider, settings
+
+BATCH_SIZE = 500
+
+# Best result per candidate in one pass: DISTINCT ON keeps the first row of each
+# candidateId group, and the ORDER BY makes that the highest score (oldest on ties)
+POSTGRES_BACKFILL = """
+UPDATE "Candidate" AS c
+SET "bestScore" = best."score", "bestReasoning" = best."reasoning", "bestJobTitle" = best."jobTitle"
+FROM (
+    SELECT DISTINCT ON (r."candidateId") r."candidateId", r."score", r."reasoning", s."jobTitle"
+    FROM "SearchResult" r
+    JOIN "SearchSession" s ON s."id" = r."sessionId"
+    ORDER BY r."candidateId", r."score" DESC, r."id" ASC
+) AS best
+WHERE c."id" = best."candidateId"
+"""
+
+
+async def backfill():
+    prisma = Prisma()
+    await prisma.connect()
+    try:
+        if database_provider(settings.DATABASE_URL) == "postgresql":
+            updated = await prisma.execute_raw(POSTGRES_BACKFILL)
+            print(f"Backfilled best scores for {updated} candidates")
+            return
+
+        last_id = 0
+        updated = 0
+        while True:
+            candidates = await prisma.candidate.find_many(
+                where={"id": {"gt": last_id}},
+                include={
+                    "searches": {
+                        "include": {"session": True},
+                        "order_by": [{"score": "desc"}, {"id": "asc"}],
+                        "take": 1
+                    }
+                },
+                order={"id": "asc"},
+                take=BATCH_SIZE
+            )
+            if not candidates:
+                break
+
+            scored = [candidate for candidate in candidates if candidate.searches]
+            if scored:
+                async with prisma.batch_() as batch:
+                    for candidate in scored:
+                        best = candidate.searches[0]
+                        batch.candidate.update(
+                            where={"id": candidate.id},
+                            data={
+                                "bestScore": best.score,
+                                "bestReasoning": best.reasoning,
+                                "bestJobTitle": best.session.jobTitle
+                            }
+                        )
+
+            updated += len(scored)
+            last_id = candidates[-1].id
+            print(f"Backfilled best scores for {updated} candidates (through id {last_id})")
+    finally:
+        await prisma.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill())
@@ -0,0 +1,51 @@
+"""Store skill tags for candidates ingested before tags were extracted at write time.
+
+Usage (from the repo root, after `prisma db push`):
+    python scripts/backfill_skill_tags.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prisma import Prisma
+from backend.services.keyword_matcher import skill_tags
+
+BATCH_SIZE = 500
+
+
+async def backfill():
+    prisma = Prisma()
+    await prisma.connect()
+    try:
+        last_id = 0
+        tagged = 0
+        while True:
+            candidates = await prisma.candidate.find_many(
+                where={"id": {"gt": last_id}},
+                order={"id": "asc"},
+                take=BATCH_SIZE
+            )
+            if not candidates:
+                break
+
+            rows = [
+                {"candidateId": candidate.id, "skill": tag, "position": i}
+                for candidate in candidates
+                for i, tag in enumerate(skill_tags(candidate.bio))
+            ]
+            async with prisma.tx() as tx:
+                await tx.candidateskill.delete_many(where={"candidateId": {"in": [c.id for c in candidates]}})
+                if rows:
+                    await tx.candidateskill.create_many(data=rows)
+
+            tagged += len(candidates)
+            last_id = candidates[-1].id
+            print(f"Tagged {tagged} candidates ({len(rows)} tags in this batch)")
+    finally:
+        await prisma.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill())
@@ -0,0 +1,119 @@
+"""Compare the scout write path: per-row awaited writes vs. the batched transaction.
+
+Writes N synthetic candidates (with tweets and search results) both ways
+against the configured database, several rounds each, then deletes
+everything it created. Run from the repo root after `prisma db push`:
+
+    python scripts/benchmark_persistence.py --candidates 20 --tweets 5 --rounds 5
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prisma import Prisma
+from backend.models.schemas import GrokScoringResult, ScoutRequest, TwitterUser
+from backend.services.keyword_matcher import skill_tags
+from backend.services.talent_service import TalentService
+
+HANDLE_PREFIX = "bench_persist_"
+
+
+def make_items(n_candidates: int, n_tweets: int, round_no: int):
+    items = []
+    for i in range(n_candidates):
+        user = TwitterUser(
+            id=f"{round_no}{i:04d}", username=f"{HANDLE_PREFIX}{round_no}_{i}", name=f"Bench {i}",
+            description="Backend engineer working with Python, Docker and AWS", followers_count=100 + i,
+            recent_tweet="Shipping things", pre_rank_score=50.0
+        )
+        tweets = [
+            {"id": f"{round_no}{i:04d}{t}", "content": f"tweet {t}", "likes": t, "retweets": 0,
+             "replies": 0, "created_at": "2024-01-01T00:00:00.000Z"}
+            for t in range(n_tweets)
+        ]
+        items.append((user, GrokScoringResult(score=60 + i % 40, reasoning="benchmark"), tweets))
+    return items
+
+
+async def legacy_persist(prisma: Prisma, request: ScoutRequest, items) -> None:
+    """The old write path: every statement awaited on its own"""
+    session = await prisma.searchsession.create({"jobTitle": request.job_title, "keywords": ",".join(request.keywords)})
+    for user, scoring_result, tweets in items:
+        candidate = await prisma.candidate.upsert(
+            where={"handle": user.username},
+            data=TalentService._candidate_upsert_data(user, scoring_result)
+        )
+        await prisma.candidateskill.delete_many(where={"candidateId": candidate.id})
+        tags = skill_tags(user.description)
+        if tags:
+            await prisma.candidateskill.create_many(
+                data=[{"candidateId": candidate.id, "skill": tag, "position": i} for i, tag in enumerate(tags)]
+            )
+        await prisma.tweet.delete_many(where={"candidateId": candidate.id})
+        for tweet in tweets:
+            await prisma.tweet.create({
+                "tweetId": tweet["id"], "content": tweet["content"], "likes": tweet["likes"],
+                "retweets": tweet["retweets"], "replies": tweet["replies"], "createdAt": tweet["created_at"],
+                "candidateId": candidate.id
+            })
+        await prisma.searchresult.create({
+            "score": scoring_result.score, "reasoning": scoring_result.reasoning,
+            "preRankScore": user.pre_rank_score, "candidateId": candidate.id, "sessionId": session.id
+        })
+
+
+async def cleanup(prisma: Prisma):
+    candidates = await prisma.candidate.find_many(where={"handle": {"startswith": HANDLE_PREFIX}})
+    ids = [c.id for c in candidates]
+    session_ids = list({r.sessionId for r in await prisma.searchresult.find_many(where={"candidateId": {"in": ids}})})
+    async with prisma.batch_() as batch:
+        batch.searchresult.delete_many(where={"candidateId": {"in": ids}})
+        batch.tweet.delete_many(where={"candidateId": {"in": ids}})
+        batch.candidateskill.delete_many(where={"candidateId": {"in": ids}})
+        batch.candidate.delete_many(where={"id": {"in": ids}})
+        batch.searchsession.delete_many(where={"id": {"in": session_ids}})
+
+
+async def main(n_candidates: int, n_tweets: int, rounds: int):
+    prisma = Prisma()
+    await prisma.connect()
+    service = TalentService(prisma=prisma, twitter_service=object(), grok_service=object(), calendar_service=object())
+    request = ScoutRequest(job_title="Benchmark Engineer", keywords=["python"])
+    timings = {"per-row": [], "batched": []}
+
+    try:
+        await cleanup(prisma)
+        for round_no in range(rounds):
+            # Fresh handles per round so both paths do the same inserts
+            items = make_items(n_candidates, n_tweets, 2 * round_no)
+            started = time.perf_counter()
+            await legacy_persist(prisma, request, items)
+            timings["per-row"].append((time.perf_counter() - started) * 1000)
+
+            items = make_items(n_candidates, n_tweets, 2 * round_no + 1)
+            started = time.perf_counter()
+            await service._persist_scout_batch(request, None, items)
+            timings["batched"].append((time.perf_counter() - started) * 1000)
+    finally:
+        await cleanup(prisma)
+        await prisma.disconnect()
+
+    print(f"Write path for {n_candidates} candidates x {n_tweets} tweets ({rounds} rounds):")
+    for name, values in timings.items():
+        print(f"  {name:8s} median {statistics.median(values):8.1f} ms   min {min(values):8.1f} ms")
+    speedup = statistics.median(timings["per-row"]) / statistics.median(timings["batched"])
+    print(f"  speedup  {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=20)
+    parser.add_argument("--tweets", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.candidates, args.tweets, args.rounds))
@@ -0,0 +1,160 @@
+"""Readers alongside a scout writer: SQLite defaults vs. the tuned profile from Settings.
+
+Each run uses a fresh database file. A writer thread commits scout-sized
+transactions (upsert candidates, insert search results) while reader
+threads page through the candidate list, like GET /candidates. Reports
+reader throughput and latency, "database is locked" errors and write
+transaction time for each profile.
+
+    python scripts/benchmark_sqlite_concurrency.py --readers 8 --seconds 5
+"""
+import argparse
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.services.sqlite_profile import sqlite_profile_pragmas
+
+# What a fresh Prisma/SQLite connection runs with (rollback journal, fsync on every commit)
+DEFAULT_PROFILE = ["PRAGMA journal_mode=DELETE", "PRAGMA synchronous=FULL", "PRAGMA busy_timeout=0"]
+
+SCHEMA = """
+CREATE TABLE "Candidate" ("id" INTEGER PRIMARY KEY AUTOINCREMENT, "handle" TEXT NOT NULL UNIQUE,
+    "bio" TEXT, "bestScore" INTEGER, "bestJobTitle" TEXT);
+CREATE INDEX "Candidate_bestScore_id_idx" ON "Candidate"("bestScore" DESC, "id");
+CREATE TABLE "SearchResult" ("id" INTEGER PRIMARY KEY AUTOINCREMENT, "score" INTEGER NOT NULL,
+    "reasoning" TEXT, "candidateId" INTEGER NOT NULL, "sessionId" INTEGER NOT NULL);
+CREATE INDEX "SearchResult_candidateId_score_idx" ON "SearchResult"("candidateId", "score");
+"""
+
+LIST_QUERY = (
+    'SELECT * FROM "Candidate" WHERE "bestScore" IS NOT NULL AND "bestScore" >= ? '
+    'ORDER BY "bestScore" DESC, "id" ASC LIMIT 50'
+)
+
+
+def connect(path, pragmas):
+    # isolation_level=None: transactions are explicit, as in the Prisma engine
+    conn = sqlite3.connect(path, timeout=0, isolation_level=None, check_same_thread=False)
+    for pragma in pragmas:
+        conn.execute(pragma).fetchall()
+    return conn
+
+
+def seed(path, pragmas, candidates):
+    conn = connect(path, pragmas)
+    conn.executescript(SCHEMA)
+    conn.execute("BEGIN")
+    conn.executemany(
+        'INSERT INTO "Candidate" ("handle", "bio", "bestScore", "bestJobTitle") VALUES (?, ?, ?, ?)',
+        ((f"seed{i}", "Python developer", random.randrange(1, 101), "Backend") for i in range(candidates))
+    )
+    conn.execute("COMMIT")
+    conn.close()
+
+
+def writer(conn, stop, stats, batch_size):
+    session = 0
+    while not stop.is_set():
+        session += 1
+        started = time.perf_counter()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for i in range(batch_size):
+                score = random.randrange(1, 101)
+                handle = f"scout{random.randrange(5000)}"
+                conn.execute(
+                    'INSERT INTO "Candidate" ("handle", "bio") VALUES (?, ?) '
+                    'ON CONFLICT("handle") DO UPDATE SET "bio" = excluded."bio"',
+                    (handle, "Backend engineer")
+                )
+                candidate_id = conn.execute('SELECT "id" FROM "Candidate" WHERE "handle" = ?', (handle,)).fetchone()[0]
+                conn.execute(
+                    'INSERT INTO "SearchResult" ("score", "reasoning", "candidateId", "sessionId") VALUES (?, ?, ?, ?)',
+                    (score, "benchmark", candidate_id, session)
+                )
+                conn.execute(
+                    'UPDATE "Candidate" SET "bestScore" = ?, "bestJobTitle" = ? '
+                    'WHERE "id" = ? AND ("bestScore" IS NULL OR "bestScore" < ?)',
+                    (score, "Backend", candidate_id, score)
+                )
+            conn.execute("COMMIT")
+            stats["write_ms"].append((time.perf_counter() - started) * 1000)
+        except sqlite3.OperationalError as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            stats["write_errors"] += 1
+            if "locked" not in str(e):
+                raise
+        time.sleep(0.005)
+    conn.close()
+
+
+def reader(conn, stop, stats, lock):
+    latencies, errors = [], 0
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            conn.execute(LIST_QUERY, (random.randrange(0, 90),)).fetchall()
+            latencies.append((time.perf_counter() - started) * 1000)
+        except sqlite3.OperationalError as e:
+            errors += 1
+            if "locked" not in str(e):
+                raise
+    conn.close()
+    with lock:
+        stats["read_ms"].extend(latencies)
+        stats["read_errors"] += errors
+
+
+def run(name, pragmas, readers, seconds, batch_size, candidates):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "bench.db")
+        seed(path, pragmas, candidates)
+
+        stats = {"read_ms": [], "read_errors": 0, "write_ms": [], "write_errors": 0}
+        stop, lock = threading.Event(), threading.Lock()
+        # Connect up front: changing the journal mode needs the database to itself
+        threads = [threading.Thread(target=writer, args=(connect(path, pragmas), stop, stats, batch_size))]
+        threads += [
+            threading.Thread(target=reader, args=(connect(path, pragmas), stop, stats, lock))
+            for _ in range(readers)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    reads = sorted(stats["read_ms"])
+    p99 = reads[int(len(reads) * 0.99) - 1] if reads else 0.0
+    print(f"{name}:")
+    print(f"  reads      {len(reads) / seconds:9.0f}/s   p50 {statistics.median(reads) if reads else 0:7.2f} ms"
+          f"   p99 {p99:7.2f} ms   locked errors {stats['read_errors']}")
+    print(f"  writes     {len(stats['write_ms']) / seconds:9.1f} tx/s"
+          f"   p50 {statistics.median(stats['write_ms']) if stats['write_ms'] else 0:7.2f} ms"
+          f"   locked errors {stats['write_errors']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--batch-size", type=int, default=20, help="candidates per scout write transaction")
+    parser.add_argument("--candidates", type=int, default=20000, help="rows seeded before the run")
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers + 1 scout writer, {args.seconds:.0f}s per profile\n")
+    run("SQLite defaults", DEFAULT_PROFILE, args.readers, args.seconds, args.batch_size, args.candidates)
+    # A busy timeout alone: the writer waits instead of failing, but still needs readers to drain
+    with_timeout = DEFAULT_PROFILE[:-1] + [sqlite_profile_pragmas()[1]]
+    run("Defaults + busy timeout", with_timeout, args.readers, args.seconds, args.batch_size, args.candidates)
+    run("Tuned profile (Settings)", sqlite_profile_pragmas(), args.readers, args.seconds, args.batch_size, args.candidates)
@@ -1,6 +1,6 @@
 import asyncio
 from prisma import Prisma
-from backend.services.talent_service import TalentService
+from backend.services.container import ServiceContainer
 from backend.models.schemas import ScoutRequest
 
 async def seed_database():
@@ -28,28 +28,32 @@ async def seed_database():
         )
     ]
 
-    talent_service = TalentService()
-    await talent_service.prisma.connect()
+    # Same background queue the API uses (bounded by SCOUT_JOB_CONCURRENCY;
+    # the shared rate limiter paces Twitter calls across searches)
+    services = ServiceContainer()
+    await services.startup()
 
     try:
+        jobs = []
         for i, search in enumerate(sample_searches, 1):
-            print(f"\n📍 Running search {i}/{len(sample_searches)}: {search.job_title}")
+            job = await services.scout_jobs.submit(search)
+            jobs.append(job)
+            print(f"\n📍 Queued search {i}/{len(sample_searches)}: {search.job_title} (job {job.id})")
             print(f"   Keywords: {', '.join(search.keywords)}")
 
-            # Run the talent search
-            results = await talent_service.scout_talent(search)
+        await services.scout_jobs.join()
 
-            print(f"   ✅ Found {len(results)} candidates")
-
-            # Add delay to avoid rate limiting
-            if i < len(sample_searches):
-                print("   ⏳ Waiting 10 seconds before next search...")
-                await asyncio.sleep(10)
+        for job in jobs:
+            result = await services.scout_jobs.get(job.id)
+            if result.status == "completed":
+                print(f"   ✅ {result.job_title}: found {len(result.candidates)} candidates")
+            else:
+                print(f"   ❌ {result.job_title}: {result.status} {result.error or ''}")
 
     except Exception as e:
         print(f"❌ Error during seeding: {e}")
     finally:
-        await talent_service.prisma.disconnect()
+        await services.shutdown()
 
     print(f"\n🎉 Database seeding completed!")
     print("   You can now query the database for candidates and search results.")
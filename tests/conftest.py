@@ -0,0 +1,68 @@
+"""Shared fakes for the service tests.
+
+`make_service()` builds a TalentService over a FakePrisma; collaborators a
+test doesn't exercise are plain objects. `FakeTwitterService` stands in for
+the X API, and `make_twitter_service()` builds the real TwitterService over
+an httpx mock transport.
+"""
+import asyncio
+from typing import Callable, Dict, List, Optional
+import httpx
+from backend.models.schemas import TwitterUser
+from backend.services.talent_service import TalentService
+from backend.services.twitter_service import TwitterService
+from .fake_prisma import FakePrisma
+
+
+class FakeTwitterService:
+    """`search_users` returns `users`; timelines come from `tweets`.
+
+    With `tweets=None` every user has one tweet ("<user id>-1"), otherwise
+    every timeline is `tweets`. Timelines only return tweets newer than
+    `since_id`. Each fetch records its since_id and max_count per user and
+    the peak number in flight; fetches for `hang_for` never finish in time.
+    """
+    recent_tweet_snippet = staticmethod(TwitterService.recent_tweet_snippet)
+
+    def __init__(self, users: List[TwitterUser] = (), tweets: Optional[List[dict]] = None,
+                 delay: float = 0.01, hang_for: Optional[str] = None):
+        self.users = list(users)
+        self.tweets = tweets
+        self.delay = delay
+        self.hang_for = hang_for
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = 0
+        self.since_ids: Dict[str, Optional[str]] = {}
+        self.max_counts: Dict[str, int] = {}
+
+    async def search_users(self, keywords, job_title=None, max_results=100, target=None):
+        return self.users
+
+    async def get_recent_tweets_detailed(self, user_id: str, max_count: int = 5, since_id: str = None):
+        self.calls += 1
+        self.since_ids[user_id] = since_id
+        self.max_counts[user_id] = max_count
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(60 if user_id == self.hang_for else self.delay)
+        finally:
+            self.in_flight -= 1
+        if self.tweets is None:
+            return [] if since_id else [{"id": f"{user_id}-1", "content": f"tweet from {user_id}", "likes": 0,
+                                         "retweets": 0, "replies": 0, "created_at": ""}]
+        return [tweet for tweet in self.tweets if not since_id or int(tweet["id"]) > int(since_id)]
+
+
+def make_users(n: int, **fields) -> List[TwitterUser]:
+    return [TwitterUser(id=str(i), username=f"user{i}", name=f"User {i}", **fields) for i in range(n)]
+
+
+def make_service(twitter=None, prisma=None, grok=None, **kwargs) -> TalentService:
+    return TalentService(prisma=prisma if prisma is not None else FakePrisma(), twitter_service=twitter or object(),
+                         grok_service=grok or object(), calendar_service=object(), **kwargs)
+
+
+def make_twitter_service(handler: Callable[[httpx.Request], httpx.Response]) -> TwitterService:
+    return TwitterService(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
@@ -0,0 +1,267 @@
+"""Small in-memory stand-ins for the generated Prisma client and the pooled Database.
+
+Supports the subset of model actions the services use (`where` filters with
+equality, `in`, `gt`, `gte`, `lt`, `lte`, `not`, `OR` and relation `some`, `order`, `take`
+and one-to-many `include`s), plus `tx()` and `batch_()`. Every engine round trip is counted in `queries` (a committed
+batch or an include counts once, as in the real engine). Datetimes come back UTC-aware, as Prisma returns them.
+"""
+import asyncio
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from backend.services.leased_client import LeasedClient
+
+# (model, relation) -> (related model, foreign key)
+RELATIONS = {
+    ("candidate", "tweets"): ("tweet", "candidateId"),
+    ("candidate", "skills"): ("candidateskill", "candidateId"),
+    ("candidate", "searches"): ("searchresult", "candidateId"),
+    ("candidate", "feedback"): ("feedback", "candidateId"),
+    ("candidate", "assessments"): ("assessment", "candidateId"),
+}
+# (model, relation) -> (related model, foreign key on this model)
+TO_ONE = {
+    ("assessment", "candidate"): ("candidate", "candidateId"),
+    ("feedback", "candidate"): ("candidate", "candidateId"),
+}
+
+# Models keyed by a string id (cuid in the schema) rather than an autoincrement
+STRING_IDS = {"scoutjob"}
+
+DEFAULTS = {
+    "candidate": {"pipelineStage": None, "recentTweet": None, "avatar": None, "headerImage": None,
+                  "followers": 0, "following": 0, "bio": None, "name": None, "lastTweetId": None, "tweetsRefreshedAt": None,
+                  "bestScore": None, "bestReasoning": None, "bestJobTitle": None},
+    "scoutjob": {"status": "queued", "progress": None, "result": None, "error": None, "startedAt": None,
+                 "finishedAt": None, "workerId": None, "heartbeatAt": None},
+    "assessment": {"description": None, "status": "pending", "assignedEngineerId": None, "assignedEngineerName": None,
+                   "assignedEngineerRole": None, "assignedEngineerAvatar": None},
+}
+
+
+def _stored(value):
+    """A value as Prisma hands it back: naive datetimes are taken as UTC and come back aware"""
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _sorted(rows, order):
+    """Apply a Prisma `order` / `order_by` (dict or list of dicts); NULLs sort first, like SQLite"""
+    order = [order] if isinstance(order, dict) else order or []
+    for field, direction in reversed([item for spec in order for item in spec.items()]):
+        rows = sorted(rows, key=lambda row: (getattr(row, field) is not None, getattr(row, field) or 0),
+                      reverse=direction == "desc")
+    return rows
+
+
+class FakeTable:
+    def __init__(self, db, name):
+        self.db = db
+        self.name = name
+        self.rows = []
+        self._next_id = 1
+
+    def _insert(self, data):
+        data = {key: _stored(value) for key, value in data.items()}
+        row = SimpleNamespace(**{"createdAt": datetime.now(timezone.utc), **DEFAULTS.get(self.name, {}), **data})
+        if not hasattr(row, "id"):
+            row.id = str(uuid.uuid4()) if self.name in STRING_IDS else self._next_id
+            self._next_id += 1
+        self.rows.append(row)
+        return row
+
+    def _children(self, row, relation):
+        table, key = RELATIONS[(self.name, relation)]
+        related = getattr(self.db, table)
+        return related, [child for child in related.rows if getattr(child, key) == row.id]
+
+    def _matches(self, row, where):
+        for key, condition in (where or {}).items():
+            if key == "OR":
+                if not any(self._matches(row, option) for option in condition):
+                    return False
+                continue
+            if (self.name, key) in RELATIONS:
+                related, children = self._children(row, key)
+                if not any(related._matches(child, condition["some"]) for child in children):
+                    return False
+                continue
+            value = getattr(row, key, None)
+            if isinstance(condition, dict):
+                condition = {op: _stored(operand) for op, operand in condition.items()}
+                if "in" in condition and value not in condition["in"]:
+                    return False
+                if "gt" in condition and not (value is not None and value > condition["gt"]):
+                    return False
+                if "gte" in condition and not (value is not None and value >= condition["gte"]):
+                    return False
+                if "lte" in condition and not (value is not None and value <= condition["lte"]):
+                    return False
+                if "lt" in condition and not (value is not None and value < condition["lt"]):
+                    return False
+                if "not" in condition and value == condition["not"]:
+                    return False
+            elif value != _stored(condition):
+                return False
+        return True
+
+    async def create(self, data=None, **kwargs):
+        self.db.queries += 1
+        return self._insert(data or kwargs["data"])
+
+    async def create_many(self, data, skip_duplicates=False):
+        self.db.queries += 1
+        for row in data:
+            self._insert(row)
+        return len(data)
+
+    async def find_many(self, where=None, order=None, take=None, include=None, **kwargs):
+        self.db.queries += 1
+        rows = _sorted([row for row in self.rows if self._matches(row, where)], order)
+        rows = rows[:take] if take else rows
+        return [self._with_relations(row, include) for row in rows] if include else rows
+
+    def _with_relations(self, row, include):
+        related = {}
+        for relation, spec in include.items():
+            if not spec:
+                continue
+            if (self.name, relation) in TO_ONE:
+                table, key = TO_ONE[(self.name, relation)]
+                parent = getattr(self.db, table)
+                related[relation] = next(
+                    (parent._with_relations(other, spec.get("include") or {}) if isinstance(spec, dict) else other
+                     for other in parent.rows if other.id == getattr(row, key)),
+                    None
+                )
+                continue
+            _, children = self._children(row, relation)
+            if isinstance(spec, dict):
+                children = _sorted(children, spec.get("order_by"))
+                children = children[:spec["take"]] if spec.get("take") else children
+            related[relation] = children
+        return SimpleNamespace(**{**vars(row), **related})
+
+    async def find_first(self, where=None, order=None, include=None):
+        rows = await self.find_many(where, order=order, take=1, include=include)
+        return rows[0] if rows else None
+
+    async def find_unique(self, where, include=None):
+        rows = await self.find_many(where, include=include)
+        return rows[0] if rows else None
+
+    async def update(self, where, data):
+        self.db.queries += 1
+        row = next((row for row in self.rows if self._matches(row, where)), None)
+        if row:
+            for key, value in data.items():
+                setattr(row, key, _stored(value))
+        return row
+
+    async def update_many(self, where, data):
+        self.db.queries += 1
+        rows = [row for row in self.rows if self._matches(row, where)]
+        for row in rows:
+            for key, value in data.items():
+                setattr(row, key, _stored(value))
+        return len(rows)
+
+    async def upsert(self, where, data):
+        self.db.queries += 1
+        row = next((row for row in self.rows if self._matches(row, where)), None)
+        if row is None:
+            return self._insert(data["create"])
+        for key, value in data["update"].items():
+            setattr(row, key, _stored(value))
+        return row
+
+    async def delete_many(self, where=None):
+        self.db.queries += 1
+        before = len(self.rows)
+        self.rows = [row for row in self.rows if not self._matches(row, where)]
+        return before - len(self.rows)
+
+    async def count(self, where=None):
+        self.db.queries += 1
+        return sum(1 for row in self.rows if self._matches(row, where))
+
+
+class _Batch:
+    """Queues actions and runs them as one round trip on exit"""
+
+    def __init__(self, db):
+        self._db = db
+        self._actions = []
+
+    def __getattr__(self, table):
+        target = getattr(self._db, table)
+        return SimpleNamespace(**{
+            action: (lambda action: lambda *args, **kwargs: self._actions.append((target, action, args, kwargs)))(action)
+            for action in ("create", "create_many", "update", "update_many", "upsert", "delete_many")
+        })
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type:
+            return
+        queries = self._db.queries
+        for target, action, args, kwargs in self._actions:
+            await getattr(target, action)(*args, **kwargs)
+        self._db.queries = queries + 1
+        self._db.batches += 1
+
+
+class FakePrisma:
+    MODELS = ("candidate", "candidateskill", "tweet", "searchsession", "searchresult", "scoutjob",
+              "feedback", "assessment")
+
+    def __init__(self):
+        self.queries = 0
+        self.batches = 0
+        self.transactions = 0
+        for name in self.MODELS:
+            setattr(self, name, FakeTable(self, name))
+
+    @asynccontextmanager
+    async def tx(self):
+        self.transactions += 1
+        yield self
+
+    def batch_(self):
+        return _Batch(self)
+
+
+class FakeDatabase:
+    """Database stand-in: `client` behind a pool of `pool_size` slots, with the same `leased_client`"""
+
+    def __init__(self, client=None, pool_size: int = 10):
+        self.client = client if client is not None else FakePrisma()
+        self.leased_client = LeasedClient(self)
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.leases = 0
+        self._semaphore = asyncio.Semaphore(pool_size)
+
+    @asynccontextmanager
+    async def lease(self):
+        async with self._semaphore:
+            self.leases += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            try:
+                yield self.client
+            finally:
+                self.in_use -= 1
+
+
+@contextmanager
+def assert_queries(db: FakePrisma, expected: int):
+    """Fail if the block makes a different number of engine round trips (catches N+1 regressions)"""
+    start = db.queries
+    yield
+    made = db.queries - start
+    assert made == expected, f"expected {expected} queries, made {made}"
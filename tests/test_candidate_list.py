@@ -0,0 +1,95 @@
+import pytest
+from backend.models.schemas import GrokScoringResult, ScoutRequest, TwitterUser
+from backend.services.talent_service import TalentService
+from .conftest import make_service
+from .fake_prisma import assert_queries
+
+
+async def save(service, job_title, scores, bios=None):
+    items = [
+        (TwitterUser(id=handle, username=handle, name=handle, description=(bios or {}).get(handle, "Developer")),
+         GrokScoringResult(score=score, reasoning=f"{job_title} fit") if score else GrokScoringResult.unscored("down"),
+         [])
+        for handle, score in scores.items()
+    ]
+    await service._persist_scout_batch(ScoutRequest(job_title=job_title, keywords=["python"]), None, items)
+
+
+@pytest.mark.asyncio
+async def test_best_score_is_kept_on_the_candidate():
+    service = make_service()
+    prisma = service.prisma
+    await save(service, "Backend", {"ana": 70, "bo": 90})
+    await save(service, "Frontend", {"ana": 85, "bo": 60, "cy": None})
+
+    best = {c.handle: (c.bestScore, c.bestJobTitle, c.bestReasoning) for c in prisma.candidate.rows}
+    assert best == {
+        "ana": (85, "Frontend", "Frontend fit"),
+        "bo": (90, "Backend", "Backend fit"),  # a lower later score doesn't overwrite it
+        "cy": (None, None, None),  # unscored: no search result, no best score
+    }
+
+
+@pytest.mark.asyncio
+async def test_candidate_list_is_one_query_ordered_by_best_score():
+    service = make_service()
+    prisma = service.prisma
+    await save(service, "Backend", {"ana": 70, "bo": 90, "cy": None}, bios={"ana": "Rust and Python"})
+    queries = prisma.queries
+
+    candidates, next_cursor = await service.list_candidates()
+
+    assert prisma.queries == queries + 1
+    assert next_cursor is None
+    assert [(c.handle, c.match, c.roles) for c in candidates] == [("@bo", 90, ["Backend"]), ("@ana", 70, ["Backend"])]
+    candidates, _ = await service.list_candidates(skill="Rust")
+    assert [c.handle for c in candidates] == ["@ana"]
+
+
+@pytest.mark.asyncio
+async def test_candidate_pages_follow_the_cursor_across_score_ties():
+    service = make_service()
+    prisma = service.prisma
+    await save(service, "Backend", {"a": 90, "b": 80, "c": 80, "d": 80, "e": 50})
+    await save(service, "Frontend", {"f": 80})
+
+    pages, cursor = [], None
+    while True:
+        page, cursor = await service.list_candidates(limit=2, cursor=cursor)
+        pages.append([c.handle.lstrip("@") for c in page])
+        if not cursor:
+            break
+
+    assert pages == [["a", "b"], ["c", "d"], ["f", "e"]]
+
+
+@pytest.mark.asyncio
+async def test_candidate_filters_run_in_the_query():
+    service = make_service()
+    prisma = service.prisma
+    await save(service, "Backend", {"a": 90, "b": 60, "c": 80})
+    await save(service, "Frontend", {"d": 85})
+
+    async def handles(**filters):
+        page, _ = await service.list_candidates(**filters)
+        return [c.handle.lstrip("@") for c in page]
+
+    assert await handles(min_score=80) == ["a", "d", "c"]
+    assert await handles(job_title="Backend", stage="Qualified") == ["a", "c"]
+    assert await handles(min_score=80, limit=1, cursor=TalentService._encode_cursor(90, 1)) == ["d"]
+    with pytest.raises(ValueError):
+        await service.list_candidates(cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_replacing_skill_tags_is_one_batch():
+    service = make_service()
+    prisma = service.prisma
+    await save(service, "Backend", {"ana": 70}, bios={"ana": "Python and Docker"})
+    candidate_id = prisma.candidate.rows[0].id
+
+    with assert_queries(prisma, 1):
+        tags = await service._store_skill_tags(candidate_id, "Golang and Rust")
+
+    assert tags == ["go", "rust"]
+    assert [(row.skill, row.position) for row in prisma.candidateskill.rows] == [("go", 0), ("rust", 1)]
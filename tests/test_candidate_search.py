@@ -0,0 +1,177 @@
+import sqlite3
+from contextlib import asynccontextmanager
+import pytest
+from backend.services.candidate_search import SETUP_LOCK_KEY, SQL, ensure_search_index, group_hits, match_query
+from .conftest import make_service
+from .fake_prisma import FakePrisma
+
+TABLES = [
+    'CREATE TABLE "Candidate" ("id" INTEGER PRIMARY KEY, "handle" TEXT, "bio" TEXT)',
+    'CREATE TABLE "Tweet" ("id" INTEGER PRIMARY KEY, "candidateId" INTEGER, "content" TEXT NOT NULL)',
+    'CREATE TABLE "SearchResult" ("id" INTEGER PRIMARY KEY, "candidateId" INTEGER, "reasoning" TEXT)',
+]
+
+
+class SqliteRaw:
+    """query_raw/execute_raw over a stdlib sqlite3 connection, shaped like the Prisma client's"""
+
+    def __init__(self):
+        self.conn = sqlite3.connect(":memory:", isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.transactions = 0
+        for statement in TABLES:
+            self.conn.execute(statement)
+
+    async def query_raw(self, query, *args):
+        return [dict(row) for row in self.conn.execute(query, args)]
+
+    async def execute_raw(self, query, *args):
+        return self.conn.execute(query, args).rowcount
+
+    @asynccontextmanager
+    async def tx(self, timeout=None):
+        self.transactions += 1
+        self.conn.execute("BEGIN")
+        try:
+            yield self
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def run(self, query, *args):
+        self.conn.execute(query, args)
+
+    def search(self, text, limit=50):
+        return [dict(row) for row in self.conn.execute(SQL["sqlite"]["search"], (match_query(text, "sqlite"), limit))]
+
+
+@pytest.fixture
+async def db():
+    db = SqliteRaw()
+    db.run('INSERT INTO "Candidate" VALUES (1, \'ana\', \'Rust engineer building distributed databases\')')
+    db.run('INSERT INTO "Candidate" VALUES (2, \'bo\', \'Frontend developer\')')
+    db.run('INSERT INTO "Tweet" VALUES (1, 2, \'Learning Rust on weekends\')')
+    assert await ensure_search_index(db, "sqlite") is True
+    return db
+
+
+@pytest.mark.asyncio
+async def test_index_backfills_once_and_setup_is_idempotent(db):
+    assert {row["candidateId"] for row in db.search("rust")} == {1, 2}
+    assert await ensure_search_index(db, "sqlite") is False
+    assert len(db.search("rust")) == 2  # not backfilled twice
+    assert db.transactions == 2
+
+
+@pytest.mark.asyncio
+async def test_backfill_tolerates_rows_already_indexed(db):
+    # A second worker whose existence check raced ours backfills on top of our rows
+    for statement in SQL["sqlite"]["backfill"]:
+        db.run(statement)
+    assert len(db.search("rust")) == 2
+
+
+@pytest.mark.asyncio
+async def test_index_dropped_by_schema_push_is_rebuilt(db):
+    # `prisma db push` drops tables the schema doesn't declare, but leaves the triggers on Candidate/Tweet
+    db.run('DROP TABLE "CandidateSearch"')
+
+    assert await ensure_search_index(db, "sqlite") is True
+    assert {row["candidateId"] for row in db.search("rust")} == {1, 2}
+    db.run('INSERT INTO "Tweet" VALUES (2, 1, \'Shipping a Zig parser\')')
+    assert [row["source"] for row in db.search("zig")] == ["tweet"]
+
+
+@pytest.mark.asyncio
+async def test_failed_setup_leaves_nothing_behind(monkeypatch):
+    db = SqliteRaw()
+    db.run('INSERT INTO "Candidate" VALUES (1, \'ana\', \'Rust engineer\')')
+    monkeypatch.setitem(SQL["sqlite"], "backfill", [*SQL["sqlite"]["backfill"], 'SELECT * FROM "Missing"'])
+
+    with pytest.raises(sqlite3.OperationalError):
+        await ensure_search_index(db, "sqlite")
+    assert await db.query_raw(SQL["sqlite"]["exists"]) == []
+    monkeypatch.undo()
+    assert await ensure_search_index(db, "sqlite") is True
+    assert len(db.search("rust")) == 1
+
+
+def test_postgres_setup_is_safe_for_concurrent_workers():
+    statements = SQL["postgresql"]
+    assert statements["lock"] == [f"SELECT pg_advisory_xact_lock({SETUP_LOCK_KEY})"]
+    # Triggers are replaced in place, never dropped, so no write slips through unindexed
+    assert not any(statement.startswith("DROP") for statement in statements["setup"])
+    assert all(statement.endswith('ON CONFLICT ("id") DO NOTHING') for statement in statements["backfill"])
+
+
+@pytest.mark.asyncio
+async def test_triggers_keep_index_in_step_with_writes(db):
+    db.run('INSERT INTO "SearchResult" VALUES (1, 2, \'Strong Kubernetes operator experience\')')
+    db.run('UPDATE "Candidate" SET "bio" = \'Kubernetes platform engineer\' WHERE "id" = 1')
+    db.run('DELETE FROM "Tweet" WHERE "id" = 1')
+
+    assert db.search("rust") == []
+    assert sorted((row["candidateId"], row["source"]) for row in db.search("kubernetes")) == [(1, "bio"), (2, "reasoning")]
+
+    # Unchanged bios (every scout re-upserts the profile) leave the index alone
+    db.run('UPDATE "Candidate" SET "handle" = \'ana2\', "bio" = "bio" WHERE "id" = 1')
+    db.run('UPDATE "Candidate" SET "bio" = NULL WHERE "id" = 2')
+    assert [row["source"] for row in db.search("kubernetes")] == ["bio", "reasoning"]
+    assert db.search("frontend") == []
+
+
+@pytest.mark.asyncio
+async def test_search_prefix_matches_stems_and_highlights(db):
+    rows = db.search("distrib database")
+    assert [row["candidateId"] for row in rows] == [1]
+    assert "**distributed**" in rows[0]["snippet"] and "**databases**" in rows[0]["snippet"]
+    assert rows[0]["score"] > 0
+
+
+def test_match_query_neutralises_search_syntax():
+    assert match_query('rust OR "go" body:x*', "sqlite") == '"rust"* "or"* "go"* "body"* "x"*'
+    assert match_query("Rust, Go", "postgresql") == "rust:* & go:*"
+    assert match_query(" -- ", "sqlite") is None
+
+
+def test_group_hits_takes_best_document_per_source():
+    rows = [
+        {"candidateId": 1, "source": "tweet", "snippet": "a", "score": 5.0},
+        {"candidateId": 1, "source": "tweet", "snippet": "b", "score": 4.0},
+        {"candidateId": 1, "source": "tweet", "snippet": "c", "score": 4.0},
+        {"candidateId": 1, "source": "tweet", "snippet": "d", "score": 4.0},
+        {"candidateId": 2, "source": "tweet", "snippet": "e", "score": 3.0},
+        {"candidateId": 2, "source": "bio", "snippet": "f", "score": 3.0},
+    ]
+    hits = group_hits(rows, limit=10)
+    # Many matching tweets don't outrank matching in both bio and tweets
+    assert [(hit["candidate_id"], hit["score"]) for hit in hits] == [(2, 6.0), (1, 5.0)]
+    assert [snippet["text"] for snippet in hits[1]["snippets"]] == ["a", "b", "c"]
+    assert len(group_hits(rows, limit=1)) == 1
+
+
+class SearchablePrisma(FakePrisma):
+    def __init__(self, raw):
+        super().__init__()
+        self.query_raw = raw.query_raw
+
+
+@pytest.mark.asyncio
+async def test_service_returns_stored_candidates_with_snippets(db):
+    db.run('INSERT INTO "SearchResult" VALUES (1, 1, \'Deep Rust systems background\')')
+    prisma = SearchablePrisma(db)
+    prisma.candidate._insert({"id": 1, "handle": "ana", "bio": "Rust engineer building distributed databases", "bestScore": 88})
+    prisma.candidate._insert({"id": 2, "handle": "bo", "bio": "Frontend developer"})
+    prisma.candidateskill._insert({"candidateId": 1, "skill": "rust", "position": 0})
+    service = make_service(prisma=prisma, provider="sqlite")
+
+    results = await service.search_candidates("rust")
+
+    # Matches in bio and reasoning outrank a single tweet
+    assert [result.candidate.handle for result in results] == ["@ana", "@bo"]
+    assert {snippet.source for snippet in results[0].snippets} == {"bio", "reasoning"}
+    assert results[0].candidate.tags == ["rust"] and results[0].candidate.match == 88
+    assert results[1].candidate.scored is False
+    assert results[1].snippets[0].source == "tweet"
+    assert await service.search_candidates("?!") == []
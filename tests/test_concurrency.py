@@ -0,0 +1,116 @@
+import asyncio
+import json
+import httpx
+import pytest
+from backend.config.settings import settings
+from backend.models.schemas import TwitterUser
+from backend.services.concurrency import AdaptiveLimiter
+from backend.services.grok_service import GrokService
+
+
+async def call(limiter, status=200, delay=0.0, units=1):
+    async with limiter.slot(units=units) as outcome:
+        await asyncio.sleep(delay)
+        outcome.record(status)
+
+
+@pytest.mark.asyncio
+async def test_limit_grows_while_calls_are_healthy():
+    limiter = AdaptiveLimiter("test", initial=2, min_limit=1, max_limit=4)
+
+    for _ in range(6):
+        await call(limiter)
+
+    assert limiter.snapshot()["limit"] == 4
+    assert limiter.successes == 6
+
+
+@pytest.mark.asyncio
+async def test_throttling_halves_the_limit_once_per_burst():
+    limiter = AdaptiveLimiter("test", initial=8, min_limit=1, max_limit=8)
+    await call(limiter, delay=0.05)  # establishes a 50ms baseline
+
+    await asyncio.gather(*[call(limiter, status=429) for _ in range(3)])
+
+    assert limiter.snapshot()["limit"] == 4
+    assert (limiter.throttled, limiter.decreases) == (3, 1)
+
+
+@pytest.mark.asyncio
+async def test_latency_spike_backs_off():
+    limiter = AdaptiveLimiter("test", initial=6, min_limit=2, max_limit=8, latency_tolerance=2.0)
+    await call(limiter, delay=0.01)
+
+    await call(limiter, delay=0.1)
+
+    assert limiter.slow_calls == 1
+    assert limiter.snapshot()["limit"] == 3
+
+
+@pytest.mark.asyncio
+async def test_limit_recovers_after_a_lasting_latency_shift():
+    limiter = AdaptiveLimiter("test", initial=6, min_limit=1, max_limit=6, baseline_window=5)
+    for _ in range(5):
+        await call(limiter, delay=0.005)
+
+    # e.g. a slower model: every call is 8x the old baseline from now on
+    for _ in range(6):
+        await call(limiter, delay=0.04)
+    assert limiter.slow_calls >= 1
+    assert limiter.baseline_ms >= 30
+
+    # The baseline has caught up, so the new normal no longer reads as slow and the limit grows back
+    slow_calls = limiter.slow_calls
+    for _ in range(8):
+        await call(limiter, delay=0.04)
+    assert limiter.slow_calls == slow_calls
+    assert limiter.snapshot()["limit"] >= 3
+
+
+@pytest.mark.asyncio
+async def test_latency_is_judged_per_unit_of_work():
+    limiter = AdaptiveLimiter("test", initial=4, min_limit=1, max_limit=8)
+    await call(limiter, delay=0.01)
+
+    await call(limiter, delay=0.05, units=5)  # a pack of five takes five times as long
+
+    assert limiter.slow_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_in_flight_never_exceeds_limit_and_waiters_run_fifo():
+    limiter = AdaptiveLimiter("test", initial=2, min_limit=2, max_limit=2)
+    order = []
+
+    async def job(i):
+        async with limiter.slot() as outcome:
+            order.append(i)
+            await asyncio.sleep(0.01)
+            outcome.record(200)
+
+    await asyncio.gather(*[job(i) for i in range(6)])
+
+    assert order == list(range(6))
+    assert limiter.peak_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_scoring_keeps_input_order_without_fixed_batches(monkeypatch):
+    monkeypatch.setattr(settings, "XAI_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "GROK_PACK_SIZE", 1)
+
+    async def handler(request):
+        prompt = json.loads(request.content)["messages"][0]["content"]
+        n = int(prompt.split("Name: Dev ")[1].split("\n")[0])
+        await asyncio.sleep(0.01 * (6 - n))  # later candidates finish first
+        return httpx.Response(200, json={"choices": [{"message": {"content": json.dumps({"score": 50 + n})}}]})
+
+    limiter = AdaptiveLimiter("grok-scoring", initial=3, min_limit=1, max_limit=3, latency_tolerance=100)
+    grok = GrokService(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)), limiter=limiter)
+    users = [TwitterUser(id=str(n), username=f"dev{n}", name=f"Dev {n}", description="Python engineer")
+             for n in range(6)]
+
+    results = await grok.score_candidates_batch("Backend Engineer", users)
+
+    assert [r.score for r in results] == [50, 51, 52, 53, 54, 55]
+    assert limiter.peak_in_flight == 3
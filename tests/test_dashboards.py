@@ -0,0 +1,52 @@
+from datetime import datetime
+import pytest
+from .conftest import make_service
+from .fake_prisma import FakePrisma, assert_queries
+
+
+async def seed(prisma, n):
+    for i in range(n):
+        candidate = await prisma.candidate.create({
+            "handle": f"dev{i}", "name": f"Dev {i}", "bestScore": 60 + i, "bestJobTitle": "Backend Engineer"
+        })
+        for rating in (3, 5):
+            await prisma.feedback.create({
+                "candidateId": candidate.id, "rating": rating, "recommendation": "yes", "stage": "Round 1"
+            })
+        await prisma.assessment.create({
+            "candidateId": candidate.id, "title": "Take-home", "assessmentType": "coding", "timeLimit": 60,
+            "completedAt": datetime(2024, 1, 1 + i)
+        })
+    # A manually looked-up candidate with no search results
+    await prisma.candidate.create({"handle": "manual"})
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("n", [1, 10])
+async def test_feedback_dashboard_query_count_is_constant(n):
+    prisma = FakePrisma()
+    await seed(prisma, n)
+    service = make_service(prisma=prisma)
+
+    with assert_queries(prisma, 1):
+        candidates = await service.get_candidates_with_feedback()
+
+    assert len(candidates) == n
+    assert candidates[-1]["match"] == 60 + n - 1
+    assert candidates[-1]["role"] == "Backend Engineer"
+    assert candidates[-1]["avg_rating"] == 4.0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("n", [1, 10])
+async def test_assessment_dashboard_query_count_is_constant(n):
+    prisma = FakePrisma()
+    await seed(prisma, n)
+    service = make_service(prisma=prisma)
+
+    with assert_queries(prisma, 1):
+        assessments = await service.get_assessments_awaiting_feedback()
+
+    assert len(assessments) == n
+    assert {a["candidate_role"] for a in assessments} == {"Backend Engineer"}
+    assert assessments[0]["candidate_handle"] == f"dev{n - 1}"  # most recently completed first
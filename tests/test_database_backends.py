@@ -0,0 +1,112 @@
+"""Service queries against a real database (SQLite or PostgreSQL).
+
+Runs only where the Prisma client has been generated for the provider
+DATABASE_URL points at and the schema applied (see the `database` CI job);
+the other suites use the in-memory fake.
+"""
+import os
+from datetime import datetime
+import pytest
+
+if not os.getenv("DATABASE_BACKEND_TESTS"):
+    pytest.skip("set DATABASE_BACKEND_TESTS=1 with a generated client and an empty database", allow_module_level=True)
+
+from prisma import Prisma
+from backend.config.settings import settings
+from backend.models.schemas import GrokScoringResult, ScoutRequest, TwitterUser
+from backend.services.candidate_search import ensure_search_index
+from .conftest import FakeTwitterService, make_service
+
+CLEANUP_ORDER = [
+    "candidateskill", "searchresult", "tweet", "notification", "message", "event", "feedback", "assessment",
+    "searchsession", "candidate"
+]
+
+
+@pytest.fixture
+async def service():
+    prisma = Prisma(datasource={"url": settings.DATABASE_URL})
+    await prisma.connect()
+    for table in CLEANUP_ORDER:
+        await getattr(prisma, table).delete_many()
+    service = make_service(prisma=prisma)
+    await ensure_search_index(prisma, service.provider)
+    yield service
+    await prisma.disconnect()
+
+
+def item(handle, score, tweets=()):
+    user = TwitterUser(id=handle, username=handle, name=handle, description="Python and Rust developer",
+                       pre_rank_score=50.0)
+    result = GrokScoringResult(score=score, reasoning="fit") if score else GrokScoringResult.unscored("down")
+    timeline = [{"id": tweet_id, "content": "hi", "likes": 1, "retweets": 0, "replies": 0,
+                 "created_at": f"2024-01-01T00:00:{int(tweet_id):02d}Z"} for tweet_id in tweets]
+    return user, result, timeline
+
+
+@pytest.mark.asyncio
+async def test_scout_writes_and_candidate_pages(service):
+    backend = ScoutRequest(job_title="Backend", keywords=["python"])
+    await service._persist_scout_batch(backend, None, [item("a", 90, ["1", "2"]), item("b", 80), item("c", None)])
+    await service._persist_scout_batch(
+        ScoutRequest(job_title="Frontend", keywords=["react"]), None, [item("b", 95, []), item("d", 80, ["3"])]
+    )
+
+    pages, cursor = [], None
+    while True:
+        page, cursor = await service.list_candidates(limit=2, cursor=cursor)
+        pages.append([(c.handle, c.match, c.roles[0]) for c in page])
+        if not cursor:
+            break
+    assert pages == [[("@b", 95, "Frontend"), ("@a", 90, "Backend")], [("@d", 80, "Frontend")]]
+
+    page, _ = await service.list_candidates(skill="rust", min_score=85, job_title="Backend")
+    assert [c.handle for c in page] == ["@a"]
+
+    # Re-syncing a timeline updates in place instead of duplicating rows
+    await service._persist_scout_batch(backend, None, [item("a", 70, ["1", "2", "4"])])
+    profile = await service.get_candidate_profile(int(page[0].id))
+    assert [post.id for post in profile.recent_posts] == ["4", "2", "1"]
+    assert profile.match == 90
+
+
+@pytest.mark.asyncio
+async def test_repeat_enrichment_reads_back_the_refresh_time(service):
+    user, result, timeline = item("a", 90, ["1", "2"])
+    user.tweets_refreshed = True
+    await service._persist_scout_batch(ScoutRequest(job_title="Backend", keywords=["python"]), None, [(user, result, timeline)])
+    stored = await service.prisma.candidate.find_unique(where={"handle": "a"})
+    assert stored.tweetsRefreshedAt.utcoffset() is not None
+
+    twitter = FakeTwitterService(tweets=[])
+    service.twitter_service = twitter
+    await service._enrich_candidates([TwitterUser(id="a", username="a", name="a")])
+
+    # Refreshed just now, so only newer tweets are asked for
+    assert twitter.since_ids == {"a": "2"}
+
+
+@pytest.mark.asyncio
+async def test_dashboards(service):
+    await service._persist_scout_batch(ScoutRequest(job_title="Backend", keywords=["python"]), None, [item("a", 88)])
+    candidate = await service.prisma.candidate.find_unique(where={"handle": "a"})
+    await service.prisma.assessment.create({
+        "candidateId": candidate.id, "title": "Take-home", "assessmentType": "coding", "timeLimit": 60,
+        "completedAt": datetime(2024, 1, 1)
+    })
+
+    assessments = await service.get_assessments_awaiting_feedback()
+
+    assert [(a["candidate_handle"], a["candidate_role"]) for a in assessments] == [("a", "Backend")]
+
+
+@pytest.mark.asyncio
+async def test_full_text_search_follows_writes(service):
+    await service._persist_scout_batch(ScoutRequest(job_title="Backend", keywords=["python"]), None, [item("a", 90, ["1"])])
+
+    results = await service.search_candidates("rust develop")
+    assert [(r.candidate.handle, r.snippets[0].source) for r in results] == [("@a", "bio")]
+    assert "**Rust**" in results[0].snippets[0].text
+
+    await service.prisma.candidate.update(where={"handle": "a"}, data={"bio": "Go developer"})
+    assert await service.search_candidates("rust") == []
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from backend.config.settings import settings
+from backend.models.schemas import GrokScoringResult
+from .conftest import FakeTwitterService, make_service, make_users
+from .fake_prisma import FakePrisma
+
+
+@pytest.mark.asyncio
+async def test_enrichment_is_concurrent_and_bounded(monkeypatch):
+    monkeypatch.setattr(settings, "ENRICHMENT_CONCURRENCY", 4)
+    twitter = FakeTwitterService()
+    users = make_users(12)
+
+    tweets = await make_service(twitter=twitter)._enrich_candidates(users)
+
+    assert twitter.calls == 12  # one timeline fetch per user
+    assert twitter.peak == 4
+    assert users[3].recent_tweet == "tweet from 3"
+    assert tweets["3"][0]["id"] == "3-1"
+
+
+@pytest.mark.asyncio
+async def test_enrichment_deadline_drops_slow_timelines(monkeypatch):
+    monkeypatch.setattr(settings, "ENRICHMENT_CALL_TIMEOUT", 0.05)
+    twitter = FakeTwitterService(hang_for="1")
+    users = make_users(3)
+
+    tweets = await make_service(twitter=twitter)._enrich_candidates(users)
+
+    assert tweets["1"] == []
+    assert users[1].recent_tweet == "No recent tweets"
+    assert users[0].recent_tweet == "tweet from 0"
+
+
+@pytest.mark.asyncio
+async def test_enrichment_only_asks_for_tweets_newer_than_stored():
+    prisma = FakePrisma()
+    await prisma.candidate.create({"handle": "user1", "lastTweetId": "1-9", "recentTweet": "stored tweet",
+                                   "tweetsRefreshedAt": datetime.now(timezone.utc)})
+    twitter = FakeTwitterService()
+    users = make_users(2)
+
+    tweets = await make_service(twitter=twitter, prisma=prisma)._enrich_candidates(users)
+
+    assert twitter.since_ids == {"0": None, "1": "1-9"}
+    # Nothing new since the last sync: keep the stored preview for scoring
+    assert tweets["1"] == []
+    assert users[1].recent_tweet == "stored tweet"
+    assert users[0].recent_tweet == "tweet from 0"
+
+
+@pytest.mark.asyncio
+async def test_stale_timelines_are_refetched_in_full_to_refresh_metrics(monkeypatch):
+    monkeypatch.setattr(settings, "TWEET_METRICS_REFRESH_INTERVAL", 3600)
+    monkeypatch.setattr(settings, "TWEETS_RETAINED_PER_CANDIDATE", 20)
+    prisma = FakePrisma()
+    await prisma.candidate.create({"handle": "user0", "lastTweetId": "0-9", "tweetsRefreshedAt": datetime.now(timezone.utc)})
+    await prisma.candidate.create({"handle": "user1", "lastTweetId": "1-9",
+                                   "tweetsRefreshedAt": datetime.now(timezone.utc) - timedelta(hours=2)})
+    twitter = FakeTwitterService()
+    users = make_users(3)
+
+    await make_service(twitter=twitter, prisma=prisma)._enrich_candidates(users)
+
+    assert twitter.since_ids == {"0": "0-9", "1": None, "2": None}
+    assert twitter.max_counts == {"0": settings.MAX_TWEETS_PER_USER, "1": 20, "2": settings.MAX_TWEETS_PER_USER}
+    assert [user.tweets_refreshed for user in users] == [False, True, True]
+
+
+@pytest.mark.asyncio
+async def test_refresh_times_are_compared_and_written_in_utc(monkeypatch):
+    monkeypatch.setattr(settings, "TWEET_METRICS_REFRESH_INTERVAL", 3600)
+    now = datetime.now(timezone.utc)
+    prisma = FakePrisma()
+    # Aware, as Prisma returns them: a "Z" timestamp, and a stale one in another zone
+    recent = datetime.fromisoformat((now - timedelta(minutes=30)).strftime("%Y-%m-%dT%H:%M:%SZ"))
+    stale = (now - timedelta(hours=2)).astimezone(timezone(timedelta(hours=5)))
+    await prisma.candidate.create({"handle": "user0", "lastTweetId": "0-9", "tweetsRefreshedAt": recent})
+    await prisma.candidate.create({"handle": "user1", "lastTweetId": "1-9", "tweetsRefreshedAt": stale})
+    twitter = FakeTwitterService()
+    service = make_service(twitter=twitter, prisma=prisma)
+    users = make_users(2)
+
+    tweets = await service._enrich_candidates(users)
+
+    assert twitter.since_ids == {"0": "0-9", "1": None}
+    data = service._candidate_upsert_data(users[1], GrokScoringResult.unscored("down"), tweets["1"])
+    refreshed_at = data["update"]["tweetsRefreshedAt"]
+    assert refreshed_at.utcoffset() == timedelta(0)
+    assert abs(refreshed_at - datetime.now(timezone.utc)) < timedelta(minutes=1)
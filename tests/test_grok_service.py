@@ -0,0 +1,77 @@
+import json
+import httpx
+import pytest
+from backend.config.settings import settings
+from backend.models.schemas import TwitterUser
+from backend.services.grok_service import GrokService
+
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    monkeypatch.setattr(settings, "XAI_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "RETRY_BASE_DELAY", 0)
+
+
+def users(n):
+    return [TwitterUser(id=str(100 + i), username=f"dev{i}", name=f"Dev {i}", description="Python engineer")
+            for i in range(n)]
+
+
+def completion(content, tokens=300):
+    return httpx.Response(200, json={
+        "choices": [{"message": {"content": content}}],
+        "usage": {"total_tokens": tokens}
+    })
+
+
+def grok_with(handler):
+    requests = []
+
+    def record(request):
+        body = json.loads(request.content)
+        requests.append(body["messages"][0]["content"])
+        return handler(body["messages"][0]["content"])
+
+    return GrokService(client=httpx.AsyncClient(transport=httpx.MockTransport(record))), requests
+
+
+@pytest.mark.asyncio
+async def test_pack_is_scored_in_one_request():
+    def handler(prompt):
+        entries = [{"id": str(100 + i), "score": 60 + i, "reasoning": f"dev {i}"} for i in range(3)]
+        return completion("```json\n" + json.dumps(entries[::-1]) + "\n```")
+
+    grok, requests = grok_with(handler)
+    results = await grok.score_candidates_packed("Backend Engineer", users(3), pack_size=3)
+
+    assert len(requests) == 1
+    assert [r.score for r in results] == [60, 61, 62]
+    assert all(r.tokens_used == 100 for r in results)
+
+
+@pytest.mark.asyncio
+async def test_missing_and_malformed_entries_fall_back_to_single_scoring():
+    def handler(prompt):
+        if "candidates for:" in prompt:
+            return completion(json.dumps([
+                {"id": "100", "score": 75, "reasoning": "ok"},
+                {"id": "101", "score": "n/a"}
+            ]))
+        return completion(json.dumps({"score": 50, "reasoning": "single"}))
+
+    grok, requests = grok_with(handler)
+    results = await grok.score_candidates_packed("Backend Engineer", users(3), pack_size=3)
+
+    # One packed request plus single requests for the malformed (101) and missing (102) entries
+    assert len(requests) == 3
+    assert [r.score for r in results] == [75, 50, 50]
+    assert results[1].reasoning == "single"
+
+
+@pytest.mark.asyncio
+async def test_upstream_failure_is_not_retried_per_candidate():
+    grok, requests = grok_with(lambda prompt: httpx.Response(400))
+    results = await grok.score_candidates_packed("Backend Engineer", users(4), pack_size=2)
+
+    assert len(requests) == 2
+    assert not any(r.scored for r in results)
@@ -0,0 +1,40 @@
+from backend.services.keyword_matcher import INTENT_MATCHER, PROFILE_MATCHER, KeywordMatcher, skill_tags
+
+
+def test_whole_words_only():
+    assert skill_tags("Good at reactive design, going places") == []
+    assert skill_tags("I write Go and TypeScript") == ["typescript", "go"]
+    assert skill_tags("Node.js / AWS / Docker") == ["node", "aws", "docker"]
+
+
+def test_one_scan_reports_every_vocabulary():
+    hits = PROFILE_MATCHER.scan("Senior backend engineers building APIs in Python and Golang")
+
+    assert hits["roles"] == ["engineer", "backend"]
+    assert hits["tech"] == ["python", "golang", "api"]
+    assert hits["skills"] == ["python", "go"]
+
+
+def test_aliases_count_as_their_skill():
+    assert skill_tags("Golang and NodeJS backends, ReactJS on the front") == ["react", "node", "go"]
+    assert skill_tags("node.js, react.js and Vue.js") == ["react", "node", "vue"]
+    # Alias spellings still count for the vocabularies that list them
+    assert PROFILE_MATCHER.scan("golang")["tech"] == ["golang"]
+
+
+def test_stems_match_inflected_intents():
+    assert "scheduling" in INTENT_MATCHER.scan("Your interview is scheduled")
+    assert "scheduling" in INTENT_MATCHER.scan("What is your availability?")
+    assert "technical" in INTENT_MATCHER.scan("Are you experienced with Rust?")
+    assert INTENT_MATCHER.scan("An unscheduled outage") == {}
+
+
+def test_phrases_match_across_whitespace():
+    assert PROFILE_MATCHER.scan("Tech\nLead at a startup")["roles"] == ["tech lead"]
+    assert set(INTENT_MATCHER.scan("What are the next   steps and the salary?")) == {"next_steps", "compensation"}
+
+
+def test_empty_and_missing_text():
+    matcher = KeywordMatcher({"x": ["a"]})
+    assert matcher.scan("") == {}
+    assert matcher.scan(None) == {}
@@ -0,0 +1,56 @@
+"""migrations/postgresql must describe the same tables, columns and indexes as schema.prisma"""
+import re
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from render_schema import render
+
+SCALARS = {"Int", "String", "Float", "Boolean", "DateTime"}
+
+
+def index_column(spec: str) -> str:
+    """Column name from an @@index entry, without options like (sort: Desc)"""
+    return re.sub(r"\(.*?\)", "", spec).strip()
+
+
+def prisma_models():
+    """{table: (columns, index names)} from schema.prisma"""
+    models = {}
+    for body in re.findall(r"model \w+ \{(.*?)\n\}", (ROOT / "schema.prisma").read_text(), re.S):
+        table = re.search(r'@@map\("(\w+)"\)', body).group(1)
+        columns = {
+            field for field, kind in re.findall(r"^\s+(\w+)\s+(\w+)\??", body, re.M) if kind in SCALARS
+        }
+        indexes = {
+            f"{table}_{'_'.join(index_column(c) for c in cols.split(','))}_{'idx' if kind == 'index' else 'key'}"
+            for kind, cols in re.findall(r"@@(index|unique)\(\[([^\]]+)\]\)", body)
+        }
+        indexes |= {f"{table}_{field}_key" for field in re.findall(r"^\s+(\w+)\s+\w+.*@unique", body, re.M)}
+        models[table] = (columns, indexes)
+    return models
+
+
+def test_postgres_migration_matches_schema():
+    sql = (ROOT / "migrations" / "postgresql" / "001_init.sql").read_text()
+    tables = {
+        name: set(re.findall(r'^\s+"(\w+)" ', body, re.M))
+        for name, body in re.findall(r'CREATE TABLE "(\w+)" \((.*?)\n\);', sql, re.S)
+    }
+    indexes = set(re.findall(r'CREATE (?:UNIQUE )?INDEX "(\w+)"', sql))
+
+    models = prisma_models()
+    assert set(tables) == set(models)
+    for table, (columns, model_indexes) in models.items():
+        assert tables[table] == columns, table
+        assert model_indexes <= indexes, table
+
+
+def test_rendered_postgres_schema_reads_url_from_env():
+    rendered = render((ROOT / "schema.prisma").read_text(), "postgresql")
+
+    assert 'provider = "postgresql"' in rendered
+    assert 'url      = env("DATABASE_URL")' in rendered
+    assert rendered.count("model ") == (ROOT / "schema.prisma").read_text().count("model ")
@@ -0,0 +1,41 @@
+from backend.models.schemas import TwitterUser
+from backend.services.pre_ranker import pre_rank, pre_rank_scores, rank_correlation
+
+
+def user(i, bio, followers=100, tweets=()):
+    return TwitterUser(id=str(i), username=f"u{i}", name=f"U{i}", description=bio,
+                       followers_count=followers, matched_tweets=list(tweets))
+
+
+def test_relevant_candidates_rank_first():
+    users = [
+        user(0, "Designer who loves coffee and typography"),
+        user(1, "Backend engineer: Python, FastAPI and Postgres", tweets=["Shipping a FastAPI service today"]),
+        user(2, "Python data analyst"),
+    ]
+
+    ranked = pre_rank("Backend Engineer", ["Python", "FastAPI"], users)
+
+    assert [u.id for u, _ in ranked] == ["1", "2", "0"]
+    assert ranked[0][1] > ranked[1][1] > ranked[2][1]
+
+
+def test_followers_break_lexical_ties():
+    users = [user(0, "Rust engineer", followers=50), user(1, "Rust engineer", followers=50_000)]
+
+    scores = pre_rank_scores("Rust Engineer", [], users)
+
+    assert scores[1] > scores[0]
+    assert scores.max() == 100
+
+
+def test_no_matches_and_empty_batches():
+    assert list(pre_rank_scores("Backend", ["Go"], [])) == []
+    scores = pre_rank_scores("Backend", ["Go"], [user(0, "gardening", followers=0)])
+    assert list(scores) == [0]
+
+
+def test_rank_correlation():
+    assert rank_correlation([1, 2, 3, 4], [10, 20, 30, 40]) == 1.0
+    assert rank_correlation([1, 2, 3, 4], [40, 30, 20, 10]) == -1.0
+    assert rank_correlation([1], [1]) == 0.0
@@ -0,0 +1,161 @@
+"""The hot read paths must be served by the indexes in migrations/sqlite.
+
+Builds a throwaway SQLite database with the tables those queries touch,
+seeds it with 100k+ rows, applies the migration and checks each query's
+EXPLAIN QUERY PLAN.
+"""
+import random
+import re
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+MIGRATION = ROOT / "migrations" / "sqlite" / "001_hot_path_indexes.sql"
+
+CANDIDATES = 5_000
+ROWS = 100_000
+
+TABLES = """
+CREATE TABLE "Candidate" ("id" INTEGER PRIMARY KEY AUTOINCREMENT, "handle" TEXT NOT NULL UNIQUE, "bestScore" INTEGER);
+CREATE TABLE "CandidateSkill" ("id" INTEGER PRIMARY KEY AUTOINCREMENT, "candidateId" INTEGER NOT NULL,
+    "skill" TEXT NOT NULL, "position" INTEGER NOT NULL);
+CREATE TABLE "SearchResult" ("id" INTEGER PRIMARY KEY AUTOINCREMENT, "score" INTEGER NOT NULL, "reasoning" TEXT,
+    "candidateId" INTEGER NOT NULL, "sessionId" INTEGER NOT NULL);
+CREATE TABLE "Tweet" ("id" INTEGER PRIMARY KEY AUTOINCREMENT, "tweetId" TEXT NOT NULL, "content" TEXT NOT NULL,
+    "createdAt" TEXT NOT NULL, "candidateId" INTEGER NOT NULL);
+CREATE UNIQUE INDEX "Tweet_candidateId_tweetId_key" ON "Tweet"("candidateId", "tweetId");
+CREATE TABLE "Message" ("id" INTEGER PRIMARY KEY AUTOINCREMENT, "candidateId" INTEGER NOT NULL,
+    "content" TEXT NOT NULL, "createdAt" DATETIME NOT NULL);
+CREATE TABLE "Notification" ("id" INTEGER PRIMARY KEY AUTOINCREMENT, "candidateId" INTEGER NOT NULL,
+    "message" TEXT NOT NULL, "sentAt" DATETIME NOT NULL);
+CREATE TABLE "Event" ("id" INTEGER PRIMARY KEY AUTOINCREMENT, "candidateId" INTEGER NOT NULL,
+    "status" TEXT NOT NULL, "scheduledAt" DATETIME NOT NULL);
+CREATE TABLE "Feedback" ("id" INTEGER PRIMARY KEY AUTOINCREMENT, "candidateId" INTEGER NOT NULL,
+    "rating" INTEGER NOT NULL, "createdAt" DATETIME NOT NULL);
+CREATE TABLE "Assessment" ("id" INTEGER PRIMARY KEY AUTOINCREMENT, "candidateId" INTEGER NOT NULL,
+    "status" TEXT NOT NULL, "completedAt" DATETIME NOT NULL);
+CREATE TABLE "ScoutJob" ("id" TEXT PRIMARY KEY, "status" TEXT NOT NULL, "createdAt" DATETIME NOT NULL);
+"""
+
+# (name, SQL shaped like Prisma's, params, index that must serve it, whether ORDER BY must come from the index)
+HOT_QUERIES = [
+    # GET /candidates, first page and a cursor page (best score first, id breaks ties)
+    ("candidate list",
+     'SELECT * FROM "Candidate" WHERE "bestScore" IS NOT NULL ORDER BY "bestScore" DESC, "id" ASC LIMIT 51',
+     (), "Candidate_bestScore_id_idx", True),
+    ("candidate list page",
+     'SELECT * FROM "Candidate" WHERE ("bestScore" IS NOT NULL AND "bestScore" <= ?) '
+     'AND ("bestScore" < ? OR ("bestScore" = ? AND "id" > ?)) ORDER BY "bestScore" DESC, "id" ASC LIMIT 51',
+     (70, 70, 70, 1200), "Candidate_bestScore_id_idx", True),
+    ("candidates with skill",
+     'SELECT "candidateId" FROM "CandidateSkill" WHERE "skill" = ?',
+     ("rust",), "CandidateSkill_skill_idx", False),
+    ("best search result",
+     'SELECT * FROM "SearchResult" WHERE "candidateId" = ? ORDER BY "score" DESC LIMIT 1',
+     (42,), "SearchResult_candidateId_score_idx", True),
+    ("session results",
+     'SELECT * FROM "SearchResult" WHERE "sessionId" = ?',
+     (7,), "SearchResult_sessionId_idx", False),
+    ("profile timeline",
+     'SELECT * FROM "Tweet" WHERE "candidateId" IN (?) ORDER BY "createdAt" DESC LIMIT 5',
+     (42,), "Tweet_candidateId_createdAt_idx", True),
+    ("conversation",
+     'SELECT * FROM "Message" WHERE "candidateId" = ? ORDER BY "createdAt" ASC',
+     (42,), "Message_candidateId_createdAt_idx", True),
+    ("notifications",
+     'SELECT * FROM "Notification" WHERE "candidateId" = ? ORDER BY "sentAt" DESC',
+     (42,), "Notification_candidateId_sentAt_idx", True),
+    ("candidate events",
+     'SELECT * FROM "Event" WHERE "candidateId" = ? ORDER BY "scheduledAt" ASC',
+     (42,), "Event_candidateId_scheduledAt_idx", True),
+    ("upcoming events",
+     'SELECT * FROM "Event" WHERE "status" = ? AND "scheduledAt" >= ? ORDER BY "scheduledAt" ASC',
+     ("scheduled", "2024-06-01 00:00:00"), "Event_status_scheduledAt_idx", True),
+    ("candidate feedback",
+     'SELECT * FROM "Feedback" WHERE "candidateId" = ? ORDER BY "createdAt" DESC',
+     (42,), "Feedback_candidateId_createdAt_idx", True),
+    ("candidates with feedback",
+     'SELECT * FROM "Candidate" WHERE "id" IN (SELECT "candidateId" FROM "Feedback")',
+     (), "Feedback_candidateId_createdAt_idx", False),
+    # Two index ranges (one per status) are merged, so SQLite sorts the matches
+    ("assessments awaiting feedback",
+     'SELECT * FROM "Assessment" WHERE "status" IN (?, ?) ORDER BY "completedAt" DESC',
+     ("pending", "forwarded"), "Assessment_status_completedAt_idx", False),
+]
+
+
+@pytest.fixture(scope="module")
+def db():
+    rng = random.Random(0)
+    start = datetime(2024, 1, 1)
+
+    def candidate():
+        return rng.randrange(1, CANDIDATES + 1)
+
+    def when():
+        return (start + timedelta(minutes=rng.randrange(500_000))).strftime("%Y-%m-%d %H:%M:%S")
+
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(TABLES)
+    conn.executemany('INSERT INTO "Candidate" ("handle", "bestScore") VALUES (?, ?)',
+                     ((f"dev{i}", rng.choice([None, *range(1, 101)])) for i in range(CANDIDATES)))
+    conn.executemany('INSERT INTO "CandidateSkill" ("candidateId", "skill", "position") VALUES (?, ?, 0)',
+                     ((candidate(), rng.choice(["python", "rust", "go", "react", "aws"])) for _ in range(CANDIDATES * 3)))
+    conn.executemany('INSERT INTO "SearchResult" ("score", "candidateId", "sessionId") VALUES (?, ?, ?)',
+                     ((rng.randrange(1, 101), candidate(), rng.randrange(1, 2_000)) for _ in range(ROWS)))
+    conn.executemany('INSERT INTO "Tweet" ("tweetId", "content", "createdAt", "candidateId") VALUES (?, ?, ?, ?)',
+                     ((str(i), "tweet", when(), candidate()) for i in range(ROWS)))
+    conn.executemany('INSERT INTO "Message" ("candidateId", "content", "createdAt") VALUES (?, ?, ?)',
+                     ((candidate(), "hi", when()) for _ in range(ROWS)))
+    conn.executemany('INSERT INTO "Notification" ("candidateId", "message", "sentAt") VALUES (?, ?, ?)',
+                     ((candidate(), "moved", when()) for _ in range(ROWS // 5)))
+    conn.executemany('INSERT INTO "Event" ("candidateId", "status", "scheduledAt") VALUES (?, ?, ?)',
+                     ((candidate(), rng.choice(["scheduled", "completed", "completed", "cancelled"]), when())
+                      for _ in range(ROWS // 5)))
+    conn.executemany('INSERT INTO "Feedback" ("candidateId", "rating", "createdAt") VALUES (?, ?, ?)',
+                     ((candidate(), rng.randrange(1, 6), when()) for _ in range(ROWS // 5)))
+    conn.executemany('INSERT INTO "Assessment" ("candidateId", "status", "completedAt") VALUES (?, ?, ?)',
+                     ((candidate(), rng.choice(["pending", "forwarded", "reviewed", "reviewed"]), when())
+                      for _ in range(ROWS // 5)))
+    conn.executescript(MIGRATION.read_text())
+    yield conn
+    conn.close()
+
+
+# Per-column options in an @@index entry, e.g. bestScore(sort: Desc)
+INDEX_OPTIONS = r"\(.*?\)"
+
+
+def query_plan(conn, sql, params):
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def test_seeded_database_is_large(db):
+    tables = ["SearchResult", "Tweet", "Message", "Notification", "Event", "Feedback", "Assessment"]
+    assert sum(db.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] for table in tables) >= 100_000
+
+
+@pytest.mark.parametrize("name,sql,params,index,ordered", HOT_QUERIES, ids=[q[0] for q in HOT_QUERIES])
+def test_hot_query_uses_index(db, name, sql, params, index, ordered):
+    plan = query_plan(db, sql, params)
+
+    assert any(re.search(rf"USING (COVERING )?INDEX {index}\b", step) for step in plan), plan
+    # No full table scans (a scan of an index is fine; SQLite words that "SCAN ... USING INDEX")
+    assert not [step for step in plan if step.startswith("SCAN") and "INDEX" not in step], plan
+    if ordered:
+        assert not [step for step in plan if "TEMP B-TREE" in step], plan
+
+
+def test_migration_creates_every_schema_index():
+    schema = (ROOT / "schema.prisma").read_text()
+    declared = set()
+    for model, body in re.findall(r"model (\w+) \{(.*?)\n\}", schema, re.S):
+        table = re.search(r'@@map\("(\w+)"\)', body).group(1)
+        for columns in re.findall(r"@@index\(\[([^\]]+)\]\)", body):
+            declared.add(f"{table}_{'_'.join(re.sub(INDEX_OPTIONS, '', c).strip() for c in columns.split(','))}_idx")
+
+    created = set(re.findall(r'CREATE INDEX IF NOT EXISTS "(\w+)"', MIGRATION.read_text()))
+    # Equal, not a subset: a database built from the migration must match one built with `prisma db push`
+    assert created == declared
@@ -0,0 +1,67 @@
+import asyncio
+import time
+import pytest
+from backend.services.rate_limiter import BULK, INTERACTIVE, RateLimitExceeded, TwitterRateLimiter
+
+
+def headers(limit, remaining, reset_in):
+    return {
+        "x-rate-limit-limit": str(limit),
+        "x-rate-limit-remaining": str(remaining),
+        "x-rate-limit-reset": str(time.time() + reset_in),
+    }
+
+
+@pytest.mark.asyncio
+async def test_budget_is_learned_from_headers():
+    limiter = TwitterRateLimiter(default_limit=180)
+    await limiter.acquire("/tweets/search/recent")
+    await limiter.update("/tweets/search/recent", 200, headers(450, 449, 900))
+
+    snapshot = limiter.snapshot()["/tweets/search/recent"]
+    assert snapshot["limit"] == 450
+    assert snapshot["remaining"] == 449
+    assert snapshot["learned_from_headers"]
+
+
+@pytest.mark.asyncio
+async def test_exhausted_window_waits_for_reset():
+    limiter = TwitterRateLimiter()
+    await limiter.update("/users", 429, headers(10, 0, 0.3))
+
+    started = time.monotonic()
+    await limiter.acquire("/users", INTERACTIVE, max_wait=5)
+
+    assert time.monotonic() - started >= 0.25
+    assert limiter.snapshot()["/users"]["throttled_responses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_calls_leave_reserve_for_interactive():
+    limiter = TwitterRateLimiter()
+    # 1 of 10 left: inside the 10% interactive reserve
+    await limiter.update("/users/:id/tweets", 200, headers(10, 1, 60))
+
+    with pytest.raises(RateLimitExceeded):
+        await limiter.acquire("/users/:id/tweets", BULK, max_wait=0.1)
+
+    await asyncio.wait_for(limiter.acquire("/users/:id/tweets", INTERACTIVE, max_wait=0.1), timeout=1)
+    assert limiter.snapshot()["/users/:id/tweets"]["remaining"] == 0
+
+
+@pytest.mark.asyncio
+async def test_interactive_waiters_are_served_first():
+    limiter = TwitterRateLimiter()
+    await limiter.update("/users", 200, headers(100, 0, 0.2))
+    order = []
+
+    async def call(name, priority):
+        await limiter.acquire("/users", priority, max_wait=5)
+        order.append(name)
+
+    bulk = asyncio.create_task(call("bulk", BULK))
+    await asyncio.sleep(0.01)
+    interactive = asyncio.create_task(call("interactive", INTERACTIVE))
+    await asyncio.gather(bulk, interactive)
+
+    assert order == ["interactive", "bulk"]
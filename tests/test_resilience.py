@@ -0,0 +1,106 @@
+import asyncio
+import httpx
+import pytest
+from backend.config.settings import settings
+from backend.models.schemas import TwitterUser
+from backend.services.grok_service import GrokService
+from backend.services.resilience import CircuitBreaker, CircuitOpenError, call_with_retries
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "RETRY_BASE_DELAY", 0)
+    monkeypatch.setattr(settings, "XAI_API_KEY", "test-key")
+
+
+def responder(statuses):
+    calls = []
+
+    async def send():
+        calls.append(1)
+        status = statuses[min(len(calls), len(statuses)) - 1]
+        if status == "timeout":
+            raise httpx.ReadTimeout("timed out")
+        return httpx.Response(status)
+
+    return send, calls
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_failures_until_success():
+    send, calls = responder([503, "timeout", 200])
+    breaker = CircuitBreaker("test", failure_threshold=2)
+
+    response = await call_with_retries(breaker, send, max_attempts=3)
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried():
+    send, calls = responder([404])
+
+    response = await call_with_retries(CircuitBreaker("test"), send, max_attempts=3)
+
+    assert response.status_code == 404
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_then_fails_fast_then_recovers():
+    send, calls = responder([500])
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=0)
+
+    for _ in range(2):
+        response = await call_with_retries(breaker, send, max_attempts=2)
+        assert response.status_code == 500
+    assert breaker.state == "open"
+
+    breaker.recovery_timeout = 60
+    with pytest.raises(CircuitOpenError):
+        await call_with_retries(breaker, send)
+    assert len(calls) == 4
+
+    # After the recovery timeout a single trial call is let through
+    breaker.recovery_timeout = 0
+    ok, _ = responder([200])
+    await call_with_retries(breaker, ok)
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("interruption", ["deadline", "error"])
+async def test_interrupted_trial_call_frees_the_half_open_slot(interruption):
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0)
+    send, _ = responder([500])
+    await call_with_retries(breaker, send, max_attempts=1)
+    assert breaker.state == "open"
+
+    async def trial():
+        if interruption == "error":
+            raise RuntimeError("rate limiter gave up")
+        await asyncio.sleep(60)
+
+    with pytest.raises((asyncio.TimeoutError, RuntimeError)):
+        await asyncio.wait_for(call_with_retries(breaker, trial), timeout=0.05)
+
+    # No verdict on the upstream: the next call is the trial, and a healthy one closes the circuit
+    ok, calls = responder([200])
+    for _ in range(3):
+        assert (await call_with_retries(breaker, ok)).status_code == 200
+    assert len(calls) == 3
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_grok_outage_yields_unscored_result_not_fake_score():
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(503)))
+    grok = GrokService(client=client)
+    user = TwitterUser(id="1", username="dev", name="Dev", description="Python engineer")
+
+    result = await grok.score_candidate("Backend Engineer", user)
+
+    assert not result.scored
+    assert result.score is None
@@ -0,0 +1,62 @@
+import pytest
+from backend.models.schemas import GrokScoringResult, TwitterUser
+from backend.services.scoring_cache import ScoringCache
+
+
+def user(i, bio="Python engineer", followers=500, tweet="Shipped a FastAPI service"):
+    return TwitterUser(id=str(i), username=f"dev{i}", name=f"Dev {i}", description=bio,
+                       followers_count=followers, recent_tweet=tweet)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ScoringCache(path=str(tmp_path / "cache.db"), ttl=3600, max_entries=3)
+    yield cache
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_hits_are_keyed_by_normalized_profile(cache):
+    scored = GrokScoringResult(score=82, reasoning="Strong Python background", latency_ms=1200, tokens_used=600)
+    await cache.put_many("Backend Engineer", [user(1)], [scored])
+
+    # Same profile, different casing/whitespace and a similar follower count
+    hit, = await cache.get_many("  backend   engineer ", [user(2, bio="python  engineer", followers=520)])
+    miss, = await cache.get_many("Backend Engineer", [user(3, tweet="Something new")])
+
+    assert hit.score == 82 and hit.reasoning == "Strong Python background"
+    assert miss is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["saved_tokens"] == 600
+    assert stats["saved_latency_seconds"] == 1.2
+
+
+@pytest.mark.asyncio
+async def test_unscored_results_are_not_cached(cache):
+    await cache.put_many("Backend Engineer", [user(1)], [GrokScoringResult.unscored("API error")])
+
+    assert await cache.get_many("Backend Engineer", [user(1)]) == [None]
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_ignored(tmp_path):
+    cache = ScoringCache(path=str(tmp_path / "cache.db"), ttl=0, max_entries=10)
+    await cache.put_many("Backend Engineer", [user(1)], [GrokScoringResult(score=70, reasoning="ok")])
+
+    assert await cache.get_many("Backend Engineer", [user(1)]) == [None]
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entries_are_evicted(cache):
+    titles = ["A", "B", "C"]
+    for title in titles:
+        await cache.put_many(title, [user(1)], [GrokScoringResult(score=70, reasoning=title)])
+
+    await cache.get_many("A", [user(1)])  # A becomes most recently used
+    await cache.put_many("D", [user(1)], [GrokScoringResult(score=70, reasoning="D")])
+
+    assert cache.stats()["entries"] == 3
+    assert (await cache.get_many("B", [user(1)]))[0] is None
+    assert (await cache.get_many("A", [user(1)]))[0].reasoning == "A"
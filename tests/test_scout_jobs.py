@@ -0,0 +1,204 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import pytest
+from backend.config.settings import settings
+from backend.models.schemas import CandidateResponse, ScoutRequest
+from backend.services.scout_jobs import ScoutJobQueue
+from .fake_prisma import FakeDatabase
+
+
+def job_row(database, job_id):
+    return next(row for row in database.client.scoutjob.rows if row.id == job_id)
+
+
+class FakeTalentService:
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+
+    async def iter_scout_events(self, request):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            yield {"type": "search", "found": 1}
+            await asyncio.sleep(self.delay)
+            candidate = CandidateResponse(id="1", name="Dev", handle="@dev", avatar="", bio="", followers="1",
+                                          match=80, tags=[], recent_post="", roles=[request.job_title])
+            yield {"type": "done", "candidates": [candidate]}
+        finally:
+            self.running -= 1
+
+
+def request(title="Backend Engineer"):
+    return ScoutRequest(job_title=title, keywords=["python"])
+
+
+@pytest.mark.asyncio
+async def test_jobs_run_in_background_with_bounded_concurrency():
+    talent = FakeTalentService()
+    queue = ScoutJobQueue(talent, FakeDatabase(), concurrency=2)
+    await queue.start()
+
+    jobs = [await queue.submit(request(f"Role {i}")) for i in range(5)]
+    assert all(job.status == "queued" for job in jobs)
+    await queue.join()
+
+    finished = [await queue.get(job.id) for job in jobs]
+    assert [job.status for job in finished] == ["completed"] * 5
+    assert finished[0].candidates[0].roles == ["Role 0"]
+    assert finished[0].progress == {"stage": "search", "found": 1}
+    assert talent.peak == 2
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_cancel_running_and_queued_jobs():
+    queue = ScoutJobQueue(FakeTalentService(delay=10), FakeDatabase(), concurrency=1)
+    await queue.start()
+    running = await queue.submit(request())
+    queued = await queue.submit(request())
+    await asyncio.sleep(0.01)
+
+    assert (await queue.cancel(queued.id)).status == "cancelled"
+    assert (await queue.cancel(running.id)).status == "cancelled"
+    await asyncio.wait_for(queue.join(), timeout=1)
+    assert (await queue.get(queued.id)).started_at is None
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_unfinished_jobs_resume_after_restart():
+    database = FakeDatabase()
+    first = ScoutJobQueue(FakeTalentService(delay=10), database, concurrency=1)
+    await first.start()
+    job = await first.submit(request())
+    await asyncio.sleep(0.01)
+    assert (await first.get(job.id)).status == "running"
+    await first.stop()  # simulated shutdown mid-scout
+
+    second = ScoutJobQueue(FakeTalentService(), database, concurrency=1)
+    await second.start()
+    await asyncio.wait_for(second.join(), timeout=1)
+
+    assert (await second.get(job.id)).status == "completed"
+    await second.stop()
+
+
+@pytest.mark.asyncio
+async def test_jobs_leased_by_a_live_worker_are_not_taken_over(monkeypatch):
+    monkeypatch.setattr(settings, "SCOUT_JOB_LEASE_SECONDS", 0.15)
+    database = FakeDatabase()
+    first_talent = FakeTalentService(delay=10)
+    first = ScoutJobQueue(first_talent, database, concurrency=1)
+    await first.start()
+    job = await first.submit(request())
+    await asyncio.sleep(0.01)
+
+    # A second worker on the same database starts while the first is still running the job
+    second_talent = FakeTalentService()
+    second = ScoutJobQueue(second_talent, database, concurrency=1)
+    await second.start()
+    await asyncio.sleep(0.3)  # two lease periods: the first worker keeps heartbeating
+
+    row = job_row(database, job.id)
+    assert (row.status, row.workerId) == ("running", first.worker_id)
+    assert second_talent.peak == 0
+    await first.stop()
+    await second.stop()
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_taken_over_once(monkeypatch):
+    monkeypatch.setattr(settings, "SCOUT_JOB_LEASE_SECONDS", 60)
+    database = FakeDatabase()
+    job = await database.client.scoutjob.create({"request": request().model_dump_json()})
+    # Left running by a worker that crashed two minutes ago
+    await database.client.scoutjob.update({"id": job.id}, {
+        "status": "running", "workerId": "dead-host:1", "heartbeatAt": datetime.now(timezone.utc) - timedelta(minutes=2)
+    })
+
+    talents = [FakeTalentService(), FakeTalentService()]
+    queues = [ScoutJobQueue(talent, database, concurrency=1) for talent in talents]
+    await asyncio.gather(*[queue.start() for queue in queues])
+    await asyncio.wait_for(asyncio.gather(*[queue.join() for queue in queues]), timeout=1)
+
+    assert (await queues[0].get(job.id)).status == "completed"
+    assert sum(talent.peak for talent in talents) == 1
+    for queue in queues:
+        await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_cancel_from_another_worker_stops_the_owner(monkeypatch):
+    monkeypatch.setattr(settings, "SCOUT_JOB_LEASE_SECONDS", 0.15)
+    database = FakeDatabase()
+    owner_talent = FakeTalentService(delay=10)
+    owner = ScoutJobQueue(owner_talent, database, concurrency=1)
+    other = ScoutJobQueue(FakeTalentService(), database, concurrency=1)
+    await owner.start()
+    job = await owner.submit(request())
+    await asyncio.sleep(0.01)
+
+    assert (await other.cancel(job.id)).status == "cancelled"
+    await asyncio.wait_for(owner.join(), timeout=1)  # stops at its next heartbeat
+
+    assert owner_talent.running == 0
+    assert (await owner.get(job.id)).status == "cancelled"
+    await owner.stop()
+
+
+def slow_claim(database, delay=0.2, error=None):
+    """Make the queued -> running claim wait (e.g. for a pool slot), then optionally fail"""
+    table = database.client.scoutjob
+    update_many = table.update_many
+    waiting = asyncio.Event()
+
+    async def claim_aware_update_many(where, data):
+        if where.get("status") == "queued" and data.get("status") == "running":
+            waiting.set()
+            await asyncio.sleep(delay)
+            if error:
+                raise error
+        return await update_many(where, data)
+
+    table.update_many = claim_aware_update_many
+    return waiting
+
+
+@pytest.mark.asyncio
+async def test_cancel_before_the_claim_lands_cancels_the_job():
+    database = FakeDatabase()
+    talent = FakeTalentService()
+    queue = ScoutJobQueue(talent, database, concurrency=1)
+    waiting = slow_claim(database)
+    await queue.start()
+    job = await queue.submit(request())
+    await waiting.wait()
+
+    assert (await queue.cancel(job.id)).status == "cancelled"
+    await asyncio.wait_for(queue.join(), timeout=1)
+    assert talent.peak == 0
+    await queue.stop()
+
+    # Not left queued to run again on the next start
+    restarted = ScoutJobQueue(talent, database, concurrency=1)
+    await restarted.start()
+    await asyncio.wait_for(restarted.join(), timeout=1)
+    assert (await restarted.get(job.id)).status == "cancelled"
+    assert talent.peak == 0
+    await restarted.stop()
+
+
+@pytest.mark.asyncio
+async def test_claim_failure_fails_the_job_instead_of_leaving_it_queued():
+    database = FakeDatabase()
+    queue = ScoutJobQueue(FakeTalentService(), database, concurrency=1)
+    slow_claim(database, delay=0, error=RuntimeError("No database connection available"))
+    await queue.start()
+    job = await queue.submit(request())
+    await asyncio.wait_for(queue.join(), timeout=1)
+
+    finished = await queue.get(job.id)
+    assert (finished.status, finished.error) == ("failed", "No database connection available")
+    await queue.stop()
@@ -0,0 +1,119 @@
+import asyncio
+import pytest
+from backend.config.settings import settings
+from backend.models.schemas import GrokScoringResult, ScoutRequest
+from .conftest import FakeTwitterService, make_service, make_users
+from .fake_prisma import FakeDatabase
+
+
+class FakeGrokService:
+    """Scores arrive out of input order, like packs finishing at different times"""
+
+    async def iter_scores(self, job_title, users):
+        for index in reversed(range(len(users))):
+            result = GrokScoringResult(score=60 + index, reasoning="ok") if index else GrokScoringResult.unscored("down")
+            yield index, result
+
+
+def make_tweets(ids, likes=1):
+    return [
+        {"id": str(i), "content": f"tweet {i}", "likes": likes, "retweets": 0, "replies": 0,
+         "created_at": f"2024-01-01T00:00:{i:02d}Z"}
+        for i in sorted(ids, reverse=True)
+    ]
+
+
+def scout_service(n=3, tweets=None, prisma=None):
+    users = make_users(n, description="Python dev")
+    service = make_service(twitter=FakeTwitterService(users, tweets or []), prisma=prisma, grok=FakeGrokService())
+    return service, service.prisma
+
+
+@pytest.mark.asyncio
+async def test_scout_events_stream_candidates_as_they_are_saved(monkeypatch):
+    monkeypatch.setattr(settings, "SCOUT_PERSIST_BATCH_SIZE", 2)
+    service, prisma = scout_service()
+
+    events = [event async for event in service.iter_scout_events(ScoutRequest(job_title="Backend", keywords=["python"]))]
+
+    assert [e["type"] for e in events] == (
+        ["search", "enriched"] + ["scored", "scored", "candidate", "candidate", "scored", "candidate", "done"]
+    )
+    # Candidates are emitted in completion order, each batch right after it is persisted
+    assert [e["candidate"].handle for e in events if e["type"] == "candidate"] == ["@user2", "@user1", "@user0"]
+    assert [e["count"] for e in events if e["type"] == "scored"] == [1, 2, 3]
+    # Final event is ranked, unscored candidates last
+    assert [(c.handle, c.scored) for c in events[-1]["candidates"]] == [("@user2", True), ("@user1", True), ("@user0", False)]
+    # Skill tags are extracted once at ingest and stored alongside the candidate
+    assert events[-1]["candidates"][0].tags == ["python"]
+    assert [row.skill for row in prisma.candidateskill.rows] == ["python"] * 3
+    assert prisma.transactions == 2
+    assert len(prisma.searchsession.rows) == 1
+
+
+@pytest.mark.asyncio
+async def test_scout_persists_everything_in_one_batched_transaction():
+    service, prisma = scout_service(n=20, tweets=make_tweets(range(5)))
+
+    await service.scout_talent(ScoutRequest(job_title="Backend", keywords=["python"]))
+
+    assert prisma.transactions == 1
+    # stored-candidate read for enrichment, then session create + upsert batch
+    # + candidate read (with tweets) + tags/tweets/results batch
+    assert prisma.queries == 5
+    assert len(prisma.candidate.rows) == 20
+    assert len(prisma.tweet.rows) == 100
+    assert len(prisma.searchresult.rows) == 19  # the unscored candidate gets no result
+
+
+@pytest.mark.asyncio
+async def test_repeat_scout_syncs_timelines_incrementally(monkeypatch):
+    monkeypatch.setattr(settings, "TWEETS_RETAINED_PER_CANDIDATE", 6)
+    request = ScoutRequest(job_title="Backend", keywords=["python"])
+    service, prisma = scout_service(n=1, tweets=make_tweets(range(1, 6)))
+    await service.scout_talent(request)
+    assert prisma.candidate.rows[0].lastTweetId == "5"
+    row_ids = {t.tweetId: t.id for t in prisma.tweet.rows}
+
+    # Two new tweets since; the API only returns tweets after since_id
+    service, _ = scout_service(n=1, tweets=make_tweets(range(1, 8)), prisma=prisma)
+    await service.scout_talent(request)
+
+    assert service.twitter_service.since_ids == {"0": "5"}
+    assert prisma.candidate.rows[0].lastTweetId == "7"
+    # Kept the newest 6 without deleting and re-inserting the ones we had
+    assert sorted(int(t.tweetId) for t in prisma.tweet.rows) == [2, 3, 4, 5, 6, 7]
+    assert all(row_ids[t.tweetId] == t.id for t in prisma.tweet.rows if t.tweetId in row_ids)
+
+
+@pytest.mark.asyncio
+async def test_overlapping_tweets_update_metrics_in_place():
+    request = ScoutRequest(job_title="Backend", keywords=["python"])
+    service, prisma = scout_service(n=1, tweets=make_tweets(range(1, 4)))
+    await service.scout_talent(request)
+    # A candidate synced before lastTweetId existed gets a full timeline back
+    prisma.candidate.rows[0].lastTweetId = None
+
+    service, _ = scout_service(n=1, tweets=make_tweets(range(1, 4), likes=9), prisma=prisma)
+    await service.scout_talent(request)
+
+    assert [(t.id, t.likes) for t in prisma.tweet.rows] == [(1, 9), (2, 9), (3, 9)]
+
+
+@pytest.mark.asyncio
+async def test_scout_holds_a_pool_slot_only_while_querying():
+    database = FakeDatabase(pool_size=1)
+    twitter = FakeTwitterService(make_users(3, description="Python dev"), tweets=[], delay=0.3)
+    service = make_service(twitter=twitter, prisma=database.leased_client, grok=FakeGrokService())
+    scout = asyncio.create_task(service.scout_talent(ScoutRequest(job_title="Backend", keywords=["python"])))
+    await asyncio.sleep(0.1)
+
+    # While the scout waits on timelines a read gets the only slot straight away
+    assert twitter.in_flight == 3 and database.in_use == 0
+    candidates, _ = await asyncio.wait_for(service.list_candidates(), timeout=0.1)
+    assert candidates == []
+
+    assert len(await scout) == 3
+    assert database.in_use == 0
+    # The stored-candidate read, the list read and one save transaction
+    assert database.leases == 3
@@ -0,0 +1,43 @@
+import sqlite3
+import pytest
+from backend.config.settings import database_provider, settings
+from backend.services.sqlite_profile import MAINTENANCE_PRAGMAS, parse_checkpoint, sqlite_profile_pragmas
+
+
+def test_profile_turns_on_wal_and_tuned_pragmas(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SQLITE_BUSY_TIMEOUT", 2.5)
+    conn = sqlite3.connect(tmp_path / "dev.db")
+    for pragma in sqlite_profile_pragmas():
+        conn.execute(pragma)
+
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 2500
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -settings.SQLITE_CACHE_SIZE_KB
+
+    # journal_mode is persistent: a fresh connection is already in WAL
+    assert sqlite3.connect(tmp_path / "dev.db").execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_maintenance_checkpoints_the_wal(tmp_path):
+    conn = sqlite3.connect(tmp_path / "dev.db", isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE t (x)")
+    conn.executemany("INSERT INTO t VALUES (?)", [(i,) for i in range(100)])
+
+    cursor = conn.execute(MAINTENANCE_PRAGMAS[0])
+    columns = [column[0] for column in cursor.description]
+    checkpoint = parse_checkpoint([dict(zip(columns, row)) for row in cursor.fetchall()])
+    for pragma in MAINTENANCE_PRAGMAS[1:]:
+        conn.execute(pragma)
+
+    assert checkpoint["busy"] is False
+    assert checkpoint["wal_frames"] == checkpoint["checkpointed_frames"] > 0
+
+
+def test_provider_follows_the_database_url():
+    assert database_provider("file:dev.db") == "sqlite"
+    assert database_provider("postgresql://talent@localhost:5432/talent") == "postgresql"
+    assert database_provider("postgres://talent@db/talent") == "postgresql"
+    with pytest.raises(ValueError):
+        database_provider("mysql://localhost/talent")
@@ -0,0 +1,109 @@
+import time
+import httpx
+import pytest
+from backend.config.settings import settings
+from backend.models.schemas import TwitterUser
+from .conftest import make_twitter_service
+
+
+@pytest.fixture(autouse=True)
+def bearer_token(monkeypatch):
+    monkeypatch.setattr(settings, "TWITTER_BEARER_TOKEN", "test-token")
+
+
+@pytest.mark.asyncio
+async def test_hydrate_users_batches_multi_id_lookups():
+    requests = []
+
+    def handler(request: httpx.Request):
+        requests.append(request)
+        ids = request.url.params["ids"].split(",")
+        return httpx.Response(200, json={"data": [
+            {"id": i, "profile_banner_url": f"https://banner/{i}",
+             "public_metrics": {"followers_count": 1000, "following_count": 10}}
+            for i in ids if i != "7"
+        ]})
+
+    users = [TwitterUser(id=str(i), username=f"user{i}", name=f"User {i}", followers_count=5) for i in range(150)]
+    await make_twitter_service(handler).hydrate_users(users)
+
+    assert len(requests) == 2
+    assert all(r.url.path == "/2/users" for r in requests)
+    assert users[149].profile_banner_url == "https://banner/149"
+    assert users[0].followers_count == 1000
+    # Users missing from the response keep what search returned
+    assert users[7].profile_banner_url == ""
+    assert users[7].followers_count == 5
+
+
+def search_page(user_ids, next_token=None):
+    users = [{
+        "id": str(i), "username": f"dev{i}", "name": f"Dev {i}",
+        "description": "Senior software engineer building Python APIs",
+        "public_metrics": {"followers_count": 500, "following_count": 50}
+    } for i in user_ids]
+    page = {"data": [{"id": f"t{i}", "author_id": str(i)} for i in user_ids], "includes": {"users": users}, "meta": {}}
+    if next_token:
+        page["meta"]["next_token"] = next_token
+    return page
+
+
+def paginated_handler(pages, calls):
+    def handler(request: httpx.Request):
+        if request.url.path == "/2/users":
+            return httpx.Response(200, json={"data": []})
+        calls.append(request.url.params.get("next_token"))
+        return httpx.Response(200, json=pages[request.url.params.get("next_token")])
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_search_follows_next_token_and_dedupes_authors():
+    calls = []
+    pages = {
+        None: search_page([1, 2, 3], next_token="p2"),
+        "p2": search_page([3, 4], next_token="p3"),
+        "p3": search_page([5]),
+    }
+    service = make_twitter_service(paginated_handler(pages, calls))
+
+    users = await service.search_users(["python"], max_pages=5)
+
+    assert calls == [None, "p2", "p3"]
+    assert [u.id for u in users] == ["1", "2", "3", "4", "5"]
+
+
+@pytest.mark.asyncio
+async def test_search_stops_once_target_reached():
+    calls = []
+    pages = {
+        None: search_page([1, 2, 3], next_token="p2"),
+        "p2": search_page([4, 5, 6], next_token="p3"),
+    }
+    service = make_twitter_service(paginated_handler(pages, calls))
+
+    users = [u async for u in service.iter_search_users(["python"], target=4, max_pages=5)]
+
+    assert calls == [None, "p2"]
+    assert [u.id for u in users] == ["1", "2", "3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_search_fails_fast_without_retrying(monkeypatch):
+    monkeypatch.setattr(settings, "RETRY_BASE_DELAY", 0)
+    calls = []
+
+    def handler(request: httpx.Request):
+        calls.append(request)
+        return httpx.Response(429, headers={"x-rate-limit-remaining": "0", "x-rate-limit-reset": str(int(time.time()) + 900)})
+
+    service = make_twitter_service(handler)
+    started = time.monotonic()
+
+    users = await service.search_users(["python"], max_pages=3)
+
+    assert users == []
+    assert len(calls) == 1
+    assert time.monotonic() - started < 1
+    assert service.breaker.state == "closed"
+    assert service.rate_limiter.snapshot()["/tweets/search/recent"]["throttled_responses"] == 1